@@ -0,0 +1,32 @@
+"""users_lower_login_indexes
+
+Revision ID: 5c1e8a7d2b40
+Revises: 33a01f19e38b
+Create Date: 2026-10-19 09:12:41.508112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8a7d2b40'
+down_revision: Union[str, Sequence[str], None] = '33a01f19e38b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Functional indexes backing the case-insensitive login lookup
+    # (UserRepository.get_credentials)
+    op.create_index('ix_users_lower_email', 'users', [sa.text('lower(email)')], unique=False)
+    op.create_index('ix_users_lower_username', 'users', [sa.text('lower(username)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_lower_username', table_name='users')
+    op.drop_index('ix_users_lower_email', table_name='users')
@@ -0,0 +1,28 @@
+"""users_token_version
+
+Revision ID: 8d3f0b6e91a2
+Revises: 5c1e8a7d2b40
+Create Date: 2026-10-19 10:02:17.364905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f0b6e91a2'
+down_revision: Union[str, Sequence[str], None] = '5c1e8a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False, comment='Incrémenté à chaque révocation des tokens (désactivation, mot de passe, rôles)'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,35 @@
+"""refresh_tokens_rotation
+
+Revision ID: b7a4c2e95d13
+Revises: 8d3f0b6e91a2
+Create Date: 2026-10-19 10:48:55.127043
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7a4c2e95d13'
+down_revision: Union[str, Sequence[str], None] = '8d3f0b6e91a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nothing was ever written to refresh_tokens: no backfill needed
+    op.add_column('refresh_tokens', sa.Column('family_id', sa.Uuid(), nullable=False, comment='Lignée de rotation (une par connexion)'))
+    op.alter_column('refresh_tokens', 'token', existing_type=sa.String(length=255), comment='SHA-256 du refresh token', existing_nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_family_id'), 'refresh_tokens', ['family_id'], unique=False)
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_family_id'), table_name='refresh_tokens')
+    op.alter_column('refresh_tokens', 'token', existing_type=sa.String(length=255), comment=None, existing_comment='SHA-256 du refresh token', existing_nullable=False)
+    op.drop_column('refresh_tokens', 'family_id')
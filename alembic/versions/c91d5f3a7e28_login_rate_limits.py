@@ -0,0 +1,36 @@
+"""login_rate_limits
+
+Revision ID: c91d5f3a7e28
+Revises: b7a4c2e95d13
+Create Date: 2026-10-19 11:21:09.846512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c91d5f3a7e28'
+down_revision: Union[str, Sequence[str], None] = 'b7a4c2e95d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('login_rate_limits',
+    sa.Column('key', sa.String(length=320), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('allowed', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('key', name=op.f('pk_login_rate_limits'))
+    )
+    op.create_index(op.f('ix_login_rate_limits_updated_at'), 'login_rate_limits', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_login_rate_limits_updated_at'), table_name='login_rate_limits')
+    op.drop_table('login_rate_limits')
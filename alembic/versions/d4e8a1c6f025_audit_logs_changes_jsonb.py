@@ -0,0 +1,37 @@
+"""audit_logs changes jsonb
+
+Revision ID: d4e8a1c6f025
+Revises: c91d5f3a7e28
+Create Date: 2026-10-19 12:31:47.205318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e8a1c6f025'
+down_revision: Union[str, Sequence[str], None] = 'c91d5f3a7e28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('audit_logs', 'changes',
+               existing_type=sa.JSON(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='changes::jsonb')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('audit_logs', 'changes',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.JSON(),
+               existing_nullable=True,
+               postgresql_using='changes::json')
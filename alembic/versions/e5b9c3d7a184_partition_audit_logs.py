@@ -0,0 +1,142 @@
+"""partition audit_logs by month
+
+Revision ID: e5b9c3d7a184
+Revises: d4e8a1c6f025
+Create Date: 2026-10-19 12:44:03.517290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9c3d7a184'
+down_revision: Union[str, Sequence[str], None] = 'd4e8a1c6f025'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The existing table is renamed, copied into the partitioned one, then dropped
+    op.rename_table('audit_logs', 'audit_logs_legacy')
+    op.execute('ALTER TABLE audit_logs_legacy RENAME CONSTRAINT pk_audit_logs TO pk_audit_logs_legacy')
+    op.drop_index('ix_audit_logs_action', table_name='audit_logs_legacy')
+    op.drop_index('ix_audit_logs_id', table_name='audit_logs_legacy')
+    op.drop_index('ix_audit_logs_resource_type', table_name='audit_logs_legacy')
+    op.drop_index('ix_audit_logs_user_id', table_name='audit_logs_legacy')
+    op.drop_index('ix_audit_logs_uuid', table_name='audit_logs_legacy')
+
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            uuid UUID NOT NULL,
+            user_id INTEGER,
+            ip_address VARCHAR(45),
+            action VARCHAR(50) NOT NULL,
+            resource_type VARCHAR(50) NOT NULL,
+            resource_id VARCHAR(50),
+            changes JSONB,
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            CONSTRAINT pk_audit_logs PRIMARY KEY (id, created_at),
+            CONSTRAINT fk_audit_logs_user_id_users FOREIGN KEY (user_id)
+                REFERENCES users (id) ON DELETE SET NULL
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("COMMENT ON COLUMN audit_logs.uuid IS 'Identifiant public unique (UUID)'")
+    op.execute("COMMENT ON COLUMN audit_logs.created_at IS 'Date de création'")
+    op.execute("COMMENT ON COLUMN audit_logs.updated_at IS 'Date de dernière modification'")
+    op.execute('ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id')
+
+    # One partition per month from the oldest row to two months ahead;
+    # anything outside lands in the default partition
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month_start date := date_trunc(
+                'month', COALESCE((SELECT min(created_at) FROM audit_logs_legacy), now())
+            )::date;
+            last_month date := (date_trunc('month', now()) + interval '2 months')::date;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute('CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT')
+
+    op.execute(
+        """
+        INSERT INTO audit_logs (id, uuid, user_id, ip_address, action, resource_type,
+                                resource_id, changes, created_at, updated_at)
+        SELECT id, uuid, user_id, ip_address, action, resource_type,
+               resource_id, changes, created_at, updated_at
+        FROM audit_logs_legacy
+        """
+    )
+    op.drop_table('audit_logs_legacy')
+
+    # Indexes on the parent are created on every partition
+    op.create_index('ix_audit_logs_uuid', 'audit_logs', ['uuid'], unique=False)
+    op.create_index('ix_audit_logs_action', 'audit_logs', ['action'], unique=False)
+    op.create_index('ix_audit_logs_resource_created_at', 'audit_logs', ['resource_type', 'resource_id', 'created_at'], unique=False)
+    op.create_index('ix_audit_logs_user_id_created_at', 'audit_logs', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_audit_logs_changes', 'audit_logs', ['changes'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('audit_logs', 'audit_logs_partitioned')
+    op.execute('ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT pk_audit_logs TO pk_audit_logs_partitioned')
+    op.drop_index('ix_audit_logs_changes', table_name='audit_logs_partitioned')
+    op.drop_index('ix_audit_logs_user_id_created_at', table_name='audit_logs_partitioned')
+    op.drop_index('ix_audit_logs_resource_created_at', table_name='audit_logs_partitioned')
+    op.drop_index('ix_audit_logs_action', table_name='audit_logs_partitioned')
+    op.drop_index('ix_audit_logs_uuid', table_name='audit_logs_partitioned')
+
+    op.create_table('audit_logs',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('audit_logs_id_seq')"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('resource_type', sa.String(length=50), nullable=False),
+    sa.Column('resource_id', sa.String(length=50), nullable=True),
+    sa.Column('changes', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False, comment='Date de création'),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False, comment='Date de dernière modification'),
+    sa.Column('uuid', sa.Uuid(), nullable=False, comment='Identifiant public unique (UUID)'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_audit_logs_user_id_users'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_audit_logs'))
+    )
+    op.execute('ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id')
+    op.execute(
+        """
+        INSERT INTO audit_logs (id, uuid, user_id, ip_address, action, resource_type,
+                                resource_id, changes, created_at, updated_at)
+        SELECT id, uuid, user_id, ip_address, action, resource_type,
+               resource_id, changes, created_at, updated_at
+        FROM audit_logs_partitioned
+        """
+    )
+    # Drops every attached partition as well
+    op.drop_table('audit_logs_partitioned')
+
+    op.create_index(op.f('ix_audit_logs_action'), 'audit_logs', ['action'], unique=False)
+    op.create_index(op.f('ix_audit_logs_id'), 'audit_logs', ['id'], unique=False)
+    op.create_index(op.f('ix_audit_logs_resource_type'), 'audit_logs', ['resource_type'], unique=False)
+    op.create_index(op.f('ix_audit_logs_user_id'), 'audit_logs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_audit_logs_uuid'), 'audit_logs', ['uuid'], unique=True)
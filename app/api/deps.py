@@ -1,34 +1,81 @@
-from typing import Annotated
-from importlib import import_module
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, Any, AsyncGenerator, Callable, Coroutine, Dict, List, Optional
+from fastapi import Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import ValidationError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.authentication import access_token_user_id, token_verifier
 from app.core.config import settings
+from app.core.exceptions import PermissionDeniedException
+from app.core.permissions import permission_registry
+from app.core.principal import Principal, principal_cache
+from app.core.token_revocation import token_versions
 from app.db.database import get_db
-from app.db.models.user import User
+from app.db.replica import READ_YOUR_WRITES_COOKIE, read_router
+from app.db.models.user import TYPE_ADMIN
+from app.repositories.filters import ListParams, TotalCount
 from app.schemas.token import TokenPayload
 from app.services.user import user_service
 
-jose = import_module("jose")
-jwt = import_module("jose.jwt")
-JWTError = jose.JWTError
-
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
+def read_session_factory(request: Request) -> async_sessionmaker:
+    """
+    Session factory for read-only work: the read replica when one is
+    configured, healthy and the client did not write in the last
+    READ_YOUR_WRITES_SECONDS (see app/db/replica.py); the primary otherwise.
+    """
+    user_id = access_token_user_id(getattr(request.state, "token_claims", None))
+    return read_router.session_factory(user_id, request.cookies.get(READ_YOUR_WRITES_COOKIE))
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints, see read_session_factory."""
+    async with read_session_factory(request)() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+def list_params(
+    filter: List[str] = Query(
+        [],
+        description="Filtre `champ:opérateur:valeur`, répétable (opérateurs : eq, lt, lte, gt, gte, in, isnull ; "
+                    "valeurs de `in` séparées par des virgules). Ex : `statut:eq:PAYE`.",
+    ),
+    sort: Optional[str] = Query(None, description="Clés de tri séparées par des virgules, `-` pour l'ordre décroissant. Ex : `-date_acte`."),
+    count: bool = Query(False, description="Renvoie le nombre total de résultats dans l'en-tête `X-Total-Count`."),
+) -> ListParams:
+    """Filtres, tri et comptage des endpoints de liste (champs autorisés : voir chaque repository)."""
+    return ListParams(filters=tuple(filter), sort=sort, count=count)
+
+def set_total_count(response: Response, total: TotalCount) -> None:
+    response.headers["X-Total-Count"] = str(total.value)
+    if total.estimated:
+        response.headers["X-Total-Count-Estimated"] = "true"
+
+def get_token_claims(request: Request, token: str) -> Optional[Dict[str, Any]]:
+    """
+    Claims verified by AuthenticationMiddleware for this request, falling back
+    to the shared verifier when the middleware did not run (e.g. in tests).
+    """
+    claims = getattr(request.state, "token_claims", None)
+    if claims is None:
+        claims = token_verifier.verify(token)
+    return claims
+
 async def get_current_user(
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
     token: Annotated[str, Depends(reusable_oauth2)]
-) -> User:
+) -> Principal:
+    # An unverifiable token yields no claims, hence no `sub` below
+    claims = get_token_claims(request, token) or {}
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (JWTError, ValidationError):
+        token_data = TokenPayload(**claims)
+    except ValidationError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
@@ -40,24 +87,75 @@ async def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = await user_service.get(db, id=int(sub))
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+    user_id = int(sub)
+    token_version = claims.get("ver")
+    # A refresh token is not accepted as a bearer token; an access token
+    # without a version cannot be checked against revocations
+    if claims.get("type") != "access" or not isinstance(token_version, int):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+
+    # Stateless mode: trust the embedded claims unless the token was revoked.
+    # Tokens issued without them (before the mode was enabled) take the cache path
+    if settings.STATELESS_ACCESS_TOKENS and token_versions.ready and "perms" in claims:
+        if not token_versions.is_current(user_id, token_version):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        return Principal.from_claims(user_id, claims)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        generation = principal_cache.generation
+        user = await user_service.get(db, id=user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal = Principal.from_user(user)
+        principal_cache.set(principal, generation)
+
+    if token_version < principal.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+    return principal
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_user)]
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 async def get_current_active_superuser(
-    current_user: Annotated[User, Depends(get_current_active_user)]
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_active_user)]
+) -> Principal:
     # Basic check for admin type
-    if current_user.type != "administrateur":
+    if current_user.type != TYPE_ADMIN:
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+def require(
+    slug: str,
+) -> Callable[[Principal], Coroutine[Any, Any, Principal]]:
+    """
+    Dependency factory checking a permission slug, e.g.
+    `current_user: Principal = Depends(deps.require("acte.create"))`.
+    The slug's bit is resolved once here; each check is a bitwise AND on the
+    cached principal, with no query. Administrators have full access.
+    """
+    bit = permission_registry.register(slug)
+
+    async def check_permission(
+        current_user: Annotated[Principal, Depends(get_current_active_user)]
+    ) -> Principal:
+        if current_user.type != TYPE_ADMIN and not current_user.has_permission(bit):
+            raise PermissionDeniedException()
+        return current_user
+
+    return check_permission
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, refs, actes, reports
+from app.api.v1.endpoints import auth, users, refs, actes, reports, audit_logs, monitoring
 
 api_router = APIRouter()
 
@@ -8,3 +8,5 @@ api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(refs.router, prefix="/refs", tags=["References"])
 api_router.include_router(actes.router, prefix="/actes", tags=["Medical Acts"])
 api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+api_router.include_router(audit_logs.router, prefix="/audit-logs", tags=["Audit Logs"])
+api_router.include_router(monitoring.router, prefix="/monitoring", tags=["Monitoring"])
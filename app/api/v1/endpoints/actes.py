@@ -1,13 +1,16 @@
 from typing import Annotated, List, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+from app.repositories.filters import ListParams
 from app.schemas.acte_medical import ActeMedicalCreate, ActeMedicalUpdate, ActeMedicalResponse
 from app.schemas.tarif import TarifResponse
 from app.services.acte_medical import acte_medical_service
 from app.services.tarif import tarif_service
-from app.db.models.user import User
+from app.core.principal import Principal
 
 router = APIRouter()
 
@@ -18,11 +21,15 @@ router = APIRouter()
     description="Récupère une liste paginée des actes médicaux. Permet de filtrer par nom de patient."
 )
 async def read_actes(
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    response: Response,
+    params: Annotated[ListParams, Depends(deps.list_params)],
     skip: int = 0,
     limit: int = 100,
     nom_patient: Optional[str] = None,
-    current_user: User = Depends(deps.get_current_active_user),
+    fields: Optional[str] = Query(None, description="Champs à retourner, séparés par des virgules"),
+    embed: Optional[str] = Query(None, description="Relations à inclure : acte_type, type_prise_charge"),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Récupère les actes médicaux.
@@ -32,10 +39,37 @@ async def read_actes(
     - **nom_patient**: Filtre optionnel pour rechercher par nom de patient.
     
     Retourne la liste des actes médicaux trouvés.
+    
+    **Filtres et tri** (`filter`, `sort`, `count`) :
+    - Champs filtrables : `id`, `date_acte` (comparaisons), `statut`, `acte_id`, `medecin_id`, `created_by_id`, `numero_bc`, `nom_patient`, `prenom_patient`.
+    - Clés de tri : `date_acte`, `nom_patient` (`id` par défaut).
+
+    **Réponse allégée** (`fields`, `embed`) :
+    - `fields=nom_patient,date_acte,montant` : seuls ces champs sont lus et retournés.
+    - `embed=acte_type` : relations incluses (`acte_type`, `type_prise_charge`). Par défaut,
+      toutes sans `fields`, aucune avec `fields` ; `embed=` vide n'en inclut aucune.
+    - Les tables des relations non demandées ne sont pas jointes.
     """
+    sparse = fields is not None or embed is not None
     if nom_patient:
+        if sparse:
+            raise BadRequestException(
+                "fields et embed ne s'appliquent pas à la recherche par nom_patient : "
+                "utilisez filter=nom_patient:eq:<nom>."
+            )
         return await acte_medical_service.get_by_patient(db, nom=nom_patient, prenom="")
-    return await acte_medical_service.get_multi(db, skip=skip, limit=limit)
+    if settings.FAST_READ_PATH_ENABLED or sparse:
+        # Already serialized: same bytes as the response_model output (or its subset)
+        content = await acte_medical_service.get_multi_json(
+            db, skip=skip, limit=limit, params=params, fields=fields, embed=embed
+        )
+        response = Response(content=content, media_type="application/json")
+        items: Any = response
+    else:
+        items = await acte_medical_service.get_multi(db, skip=skip, limit=limit, params=params)
+    if params.count:
+        deps.set_total_count(response, await acte_medical_service.count(db, params=params))
+    return items
 
 
 @router.post(
@@ -48,7 +82,7 @@ async def create_acte(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     acte_in: ActeMedicalCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Crée un nouvel acte médical.
@@ -70,15 +104,23 @@ async def read_acte(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     acte_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    fields: Optional[str] = Query(None, description="Champs à retourner, séparés par des virgules"),
+    embed: Optional[str] = Query(None, description="Relations à inclure : acte_type, type_prise_charge"),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Récupère un acte médical par son ID.
 
     - **acte_id**: L'identifiant unique de l'acte médical.
+    - **fields**, **embed**: Réponse allégée, comme pour la liste des actes.
     
     Retourne l'acte médical si trouvé, sinon lève une erreur 404.
     """
+    if fields is not None or embed is not None:
+        content = await acte_medical_service.get_json(db, id=acte_id, fields=fields, embed=embed)
+        if content is None:
+            raise HTTPException(status_code=404, detail="Acte médical non trouvé")
+        return Response(content=content, media_type="application/json")
     acte = await acte_medical_service.get(db, id=acte_id)
     if not acte:
         raise HTTPException(status_code=404, detail="Acte médical non trouvé")
@@ -96,7 +138,7 @@ async def update_acte(
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     acte_id: int,
     acte_in: ActeMedicalUpdate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Met à jour un acte médical.
@@ -122,7 +164,7 @@ async def delete_acte(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     acte_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Supprime un acte médical.
@@ -147,7 +189,7 @@ async def get_active_tarif(
     acte_id: int,
     type_prise_charge_id: int,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Récupère le tarif actif pour une simulation de prix.
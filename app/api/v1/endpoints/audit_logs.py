@@ -0,0 +1,84 @@
+from typing import Annotated, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.principal import Principal
+from app.db.base import naive_utc
+from app.schemas.audit_log import AuditLogPage
+from app.services.audit_log import audit_log_service
+
+router = APIRouter()
+
+EXPORT_BATCH_SIZE = 1000
+
+
+class AuditLogFilters:
+    """Filtres communs à la recherche et à l'export."""
+    def __init__(
+        self,
+        user_id: Optional[int] = Query(None, description="Auteur de l'action"),
+        resource_type: Optional[str] = Query(None, description="Type de ressource (ex: actes)"),
+        resource_id: Optional[str] = Query(None, description="Identifiant de la ressource"),
+        action: Optional[str] = Query(None, description="CREATE, UPDATE, DELETE..."),
+        start: Optional[datetime] = Query(None, description="Début de période (inclus, UTC)"),
+        end: Optional[datetime] = Query(None, description="Fin de période (exclue, UTC)"),
+    ):
+        self.values = {
+            "user_id": user_id,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "action": action,
+            # created_at is naive UTC: "…Z" or "+01:00" inputs are converted
+            "start": naive_utc(start) if start is not None else None,
+            "end": naive_utc(end) if end is not None else None,
+        }
+
+
+@router.get("/", response_model=AuditLogPage, summary="Rechercher dans le journal d'audit", description="Liste paginée (par curseur) des entrées du journal d'audit, des plus récentes aux plus anciennes.")
+async def read_audit_logs(
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    filters: Annotated[AuditLogFilters, Depends()],
+    cursor: Optional[str] = Query(None, description="Valeur `next_cursor` de la page précédente"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Principal = Depends(deps.require("audit.read")),
+) -> AuditLogPage:
+    """
+    **Description détaillée :**
+    Recherche dans le journal d'audit avec filtres côté serveur.
+    
+    **Permissions :**
+    - Permission `audit.read` (ou administrateur).
+    
+    **Pagination :**
+    - Passer la valeur `next_cursor` reçue dans le paramètre `cursor` pour obtenir la page suivante.
+    - `next_cursor` est absent sur la dernière page.
+    """
+    return await audit_log_service.search(db, limit=limit, cursor=cursor, **filters.values)
+
+
+@router.get("/export", summary="Exporter le journal d'audit (NDJSON)", description="Exporte en flux toutes les entrées correspondant aux filtres, une entrée JSON par ligne.")
+async def export_audit_logs(
+    request: Request,
+    filters: Annotated[AuditLogFilters, Depends()],
+    current_user: Principal = Depends(deps.require("audit.read")),
+) -> StreamingResponse:
+    """
+    **Description détaillée :**
+    Exporte les entrées du journal d'audit au format NDJSON (`application/x-ndjson`).
+    Le flux est produit au fur et à mesure : adapté aux audits couvrant plusieurs mois.
+    
+    **Permissions :**
+    - Permission `audit.read` (ou administrateur).
+    """
+    return StreamingResponse(
+        audit_log_service.export_ndjson(
+            batch_size=EXPORT_BATCH_SIZE,
+            session_factory=deps.read_session_factory(request),
+            **filters.values,
+        ),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="audit_logs.ndjson"'},
+    )
@@ -1,28 +1,23 @@
 from typing import Annotated
-from importlib import import_module
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import ValidationError
-from datetime import timedelta
 
 from app.api import deps
-from app.schemas.token import Token, TokenPayload
+from app.schemas.token import Token
 from app.schemas.user import UserResponse
 from app.services.auth import auth_service
 from app.services.user import user_service
 from app.db.models.user import User
-from app.core.config import settings
-from app.core.security import create_access_token
-
-jose = import_module("jose")
-jwt = import_module("jose.jwt")
-JWTError = jose.JWTError
+from app.core.principal import Principal
+from app.core.exceptions import TooManyRequestsException
+from app.core.rate_limit import login_rate_limiter
 
 router = APIRouter()
 
 @router.post("/login", response_model=Token, summary="Connexion utilisateur", description="Authentifie un utilisateur via OAuth2 (username/password) et retourne un token d'accès JWT ainsi qu'un refresh token.")
 async def login_access_token(
+    request: Request,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> Token:
@@ -38,7 +33,17 @@ async def login_access_token(
     - `access_token` : Jeton JWT pour l'authentification des requêtes futures.
     - `token_type` : Type de jeton (généralement "bearer").
     - `refresh_token` : Jeton permettant d'obtenir un nouveau token d'accès sans se reconnecter.
+    
+    **Limitation :**
+    - Les tentatives sont limitées par adresse IP et par identifiant : au-delà, `429` avec l'en-tête `Retry-After`.
     """
+    # Rejected before any bcrypt work so that credential stuffing cannot starve the workers
+    retry_after = await login_rate_limiter.check(
+        ip_address=request.client.host if request.client else None,
+        identifier=form_data.username,
+    )
+    if retry_after:
+        raise TooManyRequestsException(headers={"Retry-After": str(retry_after)})
     return await auth_service.login(
         db, username_or_email=form_data.username, password=form_data.password
     )
@@ -56,46 +61,15 @@ async def refresh_token(
     - `refresh_token` : Le token de rafraîchissement actuel.
     
     **Réponse :**
-    - Un nouvel `access_token` et le `refresh_token` (qui peut être le même ou un nouveau selon la politique de rotation).
+    - Un nouvel `access_token` et un nouveau `refresh_token` : chaque refresh token n'est utilisable qu'une fois (rotation).
+    - La réutilisation d'un refresh token déjà échangé révoque toute la session (détection de vol).
     """
-    try:
-        payload = jwt.decode(
-            refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (JWTError, ValidationError):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        )
-        
-    sub = token_data.sub
-    if sub is None:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        )
-    user = await user_service.get(db, id=int(sub))
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-        
-    if not user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
-        
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
-    )
-    
-    return Token(
-        access_token=access_token, 
-        token_type="bearer", 
-        refresh_token=refresh_token # Return same refresh token (rotation logic can be added later)
-    )
+    return await auth_service.refresh(db, refresh_token=refresh_token)
 
 @router.get("/me", response_model=UserResponse, summary="Profil utilisateur courant", description="Récupère les informations détaillées de l'utilisateur actuellement connecté.")
 async def read_users_me(
-    current_user: Annotated[User, Depends(deps.get_current_active_user)]
+    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    current_user: Annotated[Principal, Depends(deps.get_current_active_user)]
 ) -> User:
     """
     **Description détaillée :**
@@ -108,4 +82,8 @@ async def read_users_me(
     **Réponse :**
     - Informations de l'utilisateur (id, email, nom, rôles, etc.).
     """
-    return current_user
+    # The principal only carries authorization fields: load the full profile here
+    user = await user_service.get(db, id=current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
@@ -0,0 +1,27 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+
+from app.api import deps
+from app.core.principal import Principal
+from app.core.slow_queries import slow_query_log
+from app.schemas.monitoring import SlowQueryStat
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryStat], summary="Requêtes SQL les plus lentes", description="Empreintes des requêtes ayant dépassé le seuil SLOW_QUERY_THRESHOLD_MS, triées par temps cumulé.")
+async def read_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> List[SlowQueryStat]:
+    """
+    **Description détaillée :**
+    Liste les requêtes lentes regroupées par empreinte (requête normalisée, littéraux remplacés par `?`),
+    avec le nombre d'occurrences, le temps cumulé et les percentiles p50/p95/p99.
+    Les statistiques sont propres au processus (worker) qui répond et repartent de zéro au redémarrage ;
+    le détail de chaque occurrence (et les plans EXPLAIN échantillonnés) est dans SLOW_QUERY_LOG_PATH.
+    
+    **Permissions :**
+    - Administrateur uniquement.
+    """
+    return slow_query_log.slowest(limit)
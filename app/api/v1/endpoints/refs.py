@@ -1,8 +1,9 @@
 from typing import Annotated, List, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.repositories.filters import ListParams
 from app.schemas.role import RoleCreate, RoleUpdate, RoleResponse
 from app.schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse
 from app.schemas.acte_type import ActeTypeCreate, ActeTypeUpdate, ActeTypeResponse
@@ -13,30 +14,39 @@ from app.services.service import service_service
 from app.services.acte_type import acte_type_service
 from app.services.type_prise_charge import type_prise_charge_service
 from app.services.tarif import tarif_service
-from app.db.models.user import User
+from app.core.principal import Principal
 
 router = APIRouter()
 
 # --- Roles ---
 @router.get("/roles", response_model=List[RoleResponse], summary="Lister les rôles", description="Récupère la liste de tous les rôles fonctionnels disponibles.")
 async def read_roles(
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    response: Response,
+    params: Annotated[ListParams, Depends(deps.list_params)],
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     **Description détaillée :**
     Retourne la liste des rôles (ex: Admin, Médecin, Secrétaire) définis dans le système.
-    """
-    return await role_service.get_multi(db, skip=skip, limit=limit)
+    
+    **Filtres et tri** (`filter`, `sort`, `count`) :
+    - Champs filtrables : `id`, `name`.
+    - Clés de tri : `name` (`id` par défaut).
+    """
+    items = await role_service.get_multi(db, skip=skip, limit=limit, params=params)
+    if params.count:
+        deps.set_total_count(response, await role_service.count(db, params=params))
+    return items
 
 @router.post("/roles", response_model=RoleResponse, summary="Créer un rôle", description="Ajoute un nouveau rôle fonctionnel.")
 async def create_role(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     role_in: RoleCreate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -53,7 +63,7 @@ async def update_role(
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     role_id: int,
     role_in: RoleUpdate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -72,7 +82,7 @@ async def delete_role(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     role_id: int,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -89,23 +99,32 @@ async def delete_role(
 # --- Services ---
 @router.get("/services", response_model=List[ServiceResponse], summary="Lister les services", description="Récupère la liste des services médicaux.")
 async def read_services(
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    response: Response,
+    params: Annotated[ListParams, Depends(deps.list_params)],
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     **Description détaillée :**
     Retourne la liste des services (ex: Cardiologie, Pédiatrie).
-    """
-    return await service_service.get_multi(db, skip=skip, limit=limit)
+    
+    **Filtres et tri** (`filter`, `sort`, `count`) :
+    - Champs filtrables : `id`, `code`.
+    - Clés de tri : `code` (`id` par défaut).
+    """
+    items = await service_service.get_multi(db, skip=skip, limit=limit, params=params)
+    if params.count:
+        deps.set_total_count(response, await service_service.count(db, params=params))
+    return items
 
 @router.post("/services", response_model=ServiceResponse, summary="Créer un service", description="Ajoute un nouveau service médical.")
 async def create_service(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     service_in: ServiceCreate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -122,7 +141,7 @@ async def update_service(
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     service_id: int,
     service_in: ServiceUpdate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -141,7 +160,7 @@ async def delete_service(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     service_id: int,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -158,23 +177,32 @@ async def delete_service(
 # --- Acte Types ---
 @router.get("/actes-types", response_model=List[ActeTypeResponse], summary="Lister les types d'actes", description="Récupère la liste des types d'actes médicaux.")
 async def read_actes_types(
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    response: Response,
+    params: Annotated[ListParams, Depends(deps.list_params)],
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     **Description détaillée :**
     Retourne la liste des types d'actes (ex: Consultation, Chirurgie, Analyse).
-    """
-    return await acte_type_service.get_multi(db, skip=skip, limit=limit)
+    
+    **Filtres et tri** (`filter`, `sort`, `count`) :
+    - Champs filtrables : `id`, `code`.
+    - Clés de tri : `code` (`id` par défaut).
+    """
+    items = await acte_type_service.get_multi(db, skip=skip, limit=limit, params=params)
+    if params.count:
+        deps.set_total_count(response, await acte_type_service.count(db, params=params))
+    return items
 
 @router.post("/actes-types", response_model=ActeTypeResponse, summary="Créer un type d'acte", description="Définit un nouveau type d'acte médical.")
 async def create_acte_type(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     acte_type_in: ActeTypeCreate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -191,7 +219,7 @@ async def update_acte_type(
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     acte_type_id: int,
     acte_type_in: ActeTypeUpdate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -210,7 +238,7 @@ async def delete_acte_type(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     acte_type_id: int,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -228,16 +256,25 @@ async def delete_acte_type(
 # --- Types de Prise en Charge ---
 @router.get("/types-prise-charge", response_model=List[TypePriseChargeResponse], summary="Lister les types de prise en charge", description="Récupère la liste des types de couverture (ex: Assurance, Espèces).")
 async def read_types_prise_charge(
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    response: Response,
+    params: Annotated[ListParams, Depends(deps.list_params)],
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     **Description détaillée :**
     Retourne la liste des types de prise en charge disponibles avec leur taux de couverture.
-    """
-    return await type_prise_charge_service.get_multi(db, skip=skip, limit=limit)
+    
+    **Filtres et tri** (`filter`, `sort`, `count`) :
+    - Champs filtrables : `id`, `code`.
+    - Clés de tri : `code` (`id` par défaut).
+    """
+    items = await type_prise_charge_service.get_multi(db, skip=skip, limit=limit, params=params)
+    if params.count:
+        deps.set_total_count(response, await type_prise_charge_service.count(db, params=params))
+    return items
 
 
 @router.post("/types-prise-charge", response_model=TypePriseChargeResponse, summary="Créer un type de prise en charge", description="Ajoute un nouveau type de couverture.")
@@ -245,7 +282,7 @@ async def create_type_prise_charge(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     tpc_in: TypePriseChargeCreate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -263,7 +300,7 @@ async def update_type_prise_charge(
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     tpc_id: int,
     tpc_in: TypePriseChargeUpdate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -283,7 +320,7 @@ async def delete_type_prise_charge(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     tpc_id: int,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -300,24 +337,33 @@ async def delete_type_prise_charge(
 # --- Tarifs ---
 @router.get("/tarifs", response_model=List[TarifResponse], summary="Lister les tarifs", description="Récupère la liste des tarifs (prix).")
 async def read_tarifs(
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    response: Response,
+    params: Annotated[ListParams, Depends(deps.list_params)],
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     **Description détaillée :**
     Retourne la liste complète des tarifs configurés.
-    """
-    return await tarif_service.get_multi(db, skip=skip, limit=limit)
+    
+    **Filtres et tri** (`filter`, `sort`, `count`) :
+    - Champs filtrables : `id`, `service_id`, `acte_id`, `type_prise_charge_id`, `date_debut` (comparaisons).
+    - Clés de tri : `date_debut` (`id` par défaut).
+    """
+    items = await tarif_service.get_multi(db, skip=skip, limit=limit, params=params)
+    if params.count:
+        deps.set_total_count(response, await tarif_service.count(db, params=params))
+    return items
 
 @router.get("/tarifs/search", response_model=Optional[TarifResponse], summary="Rechercher un tarif", description="Récupère le tarif applicable pour une combinaison donnée.")
 async def search_tarif(
     service_id: int,
     acte_id: int,
     type_prise_charge_id: int,
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
-    current_user: User = Depends(deps.get_current_active_user),
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     **Description détaillée :**
@@ -337,7 +383,7 @@ async def create_tarif(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     tarif_in: TarifCreate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -354,7 +400,7 @@ async def update_tarif(
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     tarif_id: int,
     tarif_in: TarifUpdate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -373,7 +419,7 @@ async def delete_tarif(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     tarif_id: int,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -1,13 +1,15 @@
 from typing import Annotated, Any
 from datetime import date
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.core.compression import payload_cache
+from app.db.database import AsyncSessionLocal
 from app.services.report import report_service
 from app.services.export import export_service
-from app.db.models.user import User
+from app.core.principal import Principal
 from app.schemas.report import FinancialSummaryResponse
 
 router = APIRouter()
@@ -19,10 +21,11 @@ router = APIRouter()
     description="Récupère un résumé financier complet pour une période donnée. Inclut :\n- Total des recettes et nombre d'actes\n- Recettes par Service\n- Recettes par Type d'Acte\n- Recettes par Médecin"
 )
 async def get_financial_summary(
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    request: Request,
     start_date: date = Query(..., description="Date de début (YYYY-MM-DD)"),
     end_date: date = Query(..., description="Date de fin (YYYY-MM-DD)"),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> FinancialSummaryResponse:
     """
     Récupère le résumé financier pour la période spécifiée.
@@ -36,7 +39,19 @@ async def get_financial_summary(
     - `by_service`: Liste des recettes par service
     - `by_type`: Liste des recettes par type d'acte
     - `by_medecin`: Liste des recettes par médecin
+
+    Le résumé d'une période close (`end_date` passée) est mis en cache,
+    déjà compressé (gzip, br), jusqu'à la prochaine modification d'un acte
+    (sur tous les workers) ou au plus `PAYLOAD_CACHE_TTL_SECONDS` secondes.
     """
+    if end_date < date.today():
+        async def build() -> bytes:
+            # On the primary: a lagging replica would get its figures cached
+            async with AsyncSessionLocal() as primary:
+                return await report_service.get_financial_summary_json(primary, start_date, end_date)
+
+        payload = await payload_cache.get_or_build(f"financial-summary:{start_date}:{end_date}", build)
+        return payload.response(request.headers.get("accept-encoding", ""))
     return await report_service.get_financial_summary(db, start_date, end_date)
 
 @router.get(
@@ -45,10 +60,10 @@ async def get_financial_summary(
     description="Génère et télécharge un fichier Excel contenant les actes médicaux pour une période donnée."
 )
 async def export_excel(
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
     start_date: date = Query(..., description="Date de début (YYYY-MM-DD)"),
     end_date: date = Query(..., description="Date de fin (YYYY-MM-DD)"),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ):
     """
     Exporte les actes médicaux en Excel.
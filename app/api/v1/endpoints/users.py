@@ -1,20 +1,24 @@
 from typing import Annotated, List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.repositories.filters import ListParams
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
 from app.services.user import user_service
-from app.db.models.user import User
+from app.core.principal import Principal
+from app.db.models.user import TYPE_ADMIN
 
 router = APIRouter()
 
 @router.get("/", response_model=List[UserResponse], summary="Lister les utilisateurs", description="Récupère la liste paginée de tous les utilisateurs enregistrés.")
 async def read_users(
-    db: Annotated[AsyncSession, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_read_db)],
+    response: Response,
+    params: Annotated[ListParams, Depends(deps.list_params)],
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -26,15 +30,22 @@ async def read_users(
     **Paramètres :**
     - `skip` : Nombre d'éléments à sauter (pagination).
     - `limit` : Nombre maximum d'éléments à retourner.
+    
+    **Filtres et tri** (`filter`, `sort`, `count`) :
+    - Champs filtrables : `id`, `type`, `is_active`, `username`, `email`.
+    - Clés de tri : `username`, `email` (`id` par défaut).
     """
-    return await user_service.get_multi(db, skip=skip, limit=limit)
+    items = await user_service.get_multi(db, skip=skip, limit=limit, params=params)
+    if params.count:
+        deps.set_total_count(response, await user_service.count(db, params=params))
+    return items
 
 @router.post("/", response_model=UserResponse, summary="Créer un utilisateur", description="Crée un nouvel utilisateur dans le système.")
 async def create_user(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     user_in: UserCreate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -60,7 +71,7 @@ async def create_user(
 async def read_user_by_id(
     user_id: int,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     **Description détaillée :**
@@ -75,7 +86,7 @@ async def read_user_by_id(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Simple permission check: user can read own profile or admin can read any
-    if user.id != current_user.id and current_user.type != "administrateur":
+    if user.id != current_user.id and current_user.type != TYPE_ADMIN:
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
@@ -87,7 +98,7 @@ async def update_user(
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     user_id: int,
     user_in: UserUpdate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -108,7 +119,7 @@ async def delete_user(
     *,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     user_id: int,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     **Description détaillée :**
@@ -0,0 +1,184 @@
+import json
+from contextvars import ContextVar
+from itertools import chain
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.authentication import access_token_user_id
+from app.core.config import settings
+from app.db.models.audit_log import AuditLog
+from app.db.replica import read_router
+from app.services.audit_log import audit_log_service
+
+AUDITED_METHODS = {
+    "POST": "CREATE",
+    "PUT": "UPDATE",
+    "PATCH": "UPDATE",
+    "DELETE": "DELETE",
+}
+
+
+# Column info flag of values never copied into audit diffs (the change
+# itself is still recorded), e.g. mapped_column(..., info={"audit_redacted": True})
+REDACTED_INFO_KEY = "audit_redacted"
+
+# Diffs committed during the current audited request:
+# {"ActeMedical:12": {"montant": [before, after], ...}, ...}
+_request_changes: ContextVar[Optional[Dict[str, Dict[str, list]]]] = ContextVar(
+    "audit_request_changes", default=None
+)
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _merge(target: Dict[str, Dict[str, list]], changes: Dict[str, Dict[str, list]]) -> None:
+    # A field changed by several flushes keeps its first "before" and last "after"
+    for entity, fields in changes.items():
+        merged = target.setdefault(entity, {})
+        for field, (before, after) in fields.items():
+            if field in merged:
+                merged[field][1] = after
+            else:
+                merged[field] = [before, after]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context: Any) -> None:
+    """
+    Builds before/after diffs of the flushed rows from the attribute history
+    SQLAlchemy already keeps in memory (no query is issued). Diffs stay on the
+    session until commit, so rolled back changes are never audited.
+    """
+    if _request_changes.get() is None:
+        return
+    changes: Dict[str, Dict[str, list]] = {}
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, AuditLog):
+            continue
+        state = inspect(obj)
+        deleted = obj in session.deleted
+        fields = {}
+        for attr in state.mapper.column_attrs:
+            if deleted:
+                if attr.key not in state.dict:
+                    continue
+                before, after = state.dict[attr.key], None
+            else:
+                history = state.attrs[attr.key].history
+                if not history.added:
+                    continue
+                before = history.deleted[0] if history.deleted else None
+                after = history.added[0]
+            if attr.columns[0].info.get(REDACTED_INFO_KEY):
+                fields[attr.key] = ["***", "***"]
+            else:
+                fields[attr.key] = [_jsonable(before), _jsonable(after)]
+        if fields:
+            identity = ",".join(str(v) for v in state.mapper.primary_key_from_instance(obj))
+            _merge(changes, {f"{state.mapper.class_.__name__}:{identity}": fields})
+    if changes:
+        _merge(session.info.setdefault("audit_changes", {}), changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    pending = session.info.pop("audit_changes", None)
+    collector = _request_changes.get()
+    if pending and collector is not None:
+        _merge(collector, pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop("audit_changes", None)
+
+
+def cap_changes(changes: Dict[str, Dict[str, list]], max_bytes: int) -> Dict[str, Any]:
+    """
+    Keeps an audit entry under max_bytes once serialized: values are dropped
+    first (only the changed field names are kept), then the entities.
+    """
+    if len(json.dumps(changes, default=str)) <= max_bytes:
+        return changes
+    names: Dict[str, Any] = {entity: sorted(fields) for entity, fields in changes.items()}
+    names["_truncated"] = True
+    if len(json.dumps(names)) <= max_bytes:
+        return names
+    return {"_truncated": True, "entities": len(changes)}
+
+
+def parse_resource(path: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    (resource_type, resource_id) of an API path, e.g. '/api/v1/actes/12'
+    gives ('actes', '12'). None for paths outside the API.
+    """
+    if not path.startswith(settings.API_V1_STR):
+        return None
+    segments = [segment for segment in path[len(settings.API_V1_STR):].split("/") if segment]
+    if not segments:
+        return None
+    return segments[0], segments[1] if len(segments) > 1 else None
+
+
+class AuditMiddleware:
+    """
+    Pure ASGI middleware recording successful write requests in the audit log.
+    Only the method, the path and the status of `http.response.start` are
+    inspected: bodies are passed through untouched (streaming responses
+    included). The event is queued once the response has been sent, with
+    the column diffs committed while handling the request.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in AUDITED_METHODS:
+            await self.app(scope, receive, send)
+            return
+        resource = parse_resource(scope["path"])
+        if resource is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        # Token already verified by AuthenticationMiddleware
+        user_id = access_token_user_id(scope.get("state", {}).get("token_claims"))
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Read-your-writes: marked before the client can issue its
+                # next read; the cookie sends it to the primary on any worker
+                cookie = read_router.mark_write(user_id) if status_code < 400 else None
+                if cookie is not None:
+                    MutableHeaders(scope=message).append("set-cookie", cookie)
+            await send(message)
+
+        changes: Dict[str, Dict[str, list]] = {}
+        reset_token = _request_changes.set(changes)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_changes.reset(reset_token)
+
+        if status_code >= 400:
+            return
+        client = scope.get("client")
+        resource_type, resource_id = resource
+        await audit_log_service.enqueue_action(
+            action=AUDITED_METHODS[scope["method"]],
+            resource_type=resource_type,
+            user_id=user_id,
+            ip_address=client[0] if client else None,
+            resource_id=resource_id,
+            changes=cap_changes(changes, settings.AUDIT_CHANGES_MAX_BYTES) if changes else None,
+        )
@@ -0,0 +1,197 @@
+import asyncio
+import gzip
+import json
+import os
+import time
+import uuid as uuid_pkg
+import zlib
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Iterator, List, Optional, Protocol
+
+from loguru import logger
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.database import engine
+from app.db.models.audit_log import AuditLog
+
+try:
+    import zstandard
+except ImportError:  # Optional: only needed for AUDIT_SEGMENT_COMPRESSION=zstd
+    zstandard = None
+
+# Segments being written carry this suffix; it is dropped once they are complete
+PARTIAL_SUFFIX = ".part"
+_EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst", "none": ".jsonl"}
+
+
+def dump_row(row: Dict[str, Any]) -> str:
+    return json.dumps(row, default=str)
+
+
+def load_row(line: str) -> Dict[str, Any]:
+    row = json.loads(line)
+    row["uuid"] = uuid_pkg.UUID(row["uuid"])
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    row["updated_at"] = datetime.fromisoformat(row["updated_at"])
+    return row
+
+
+class AuditSink(Protocol):
+    """Destination of the batches flushed by AuditLogWriter."""
+
+    async def write(self, batch: List[Dict[str, Any]]) -> None:
+        """Persists a batch or raises (SQLAlchemyError / OSError)."""
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class DatabaseAuditSink:
+    """Writes each batch into audit_logs with one multi-row INSERT."""
+
+    async def write(self, batch: List[Dict[str, Any]]) -> None:
+        async with engine.begin() as connection:
+            await connection.execute(insert(AuditLog.__table__).values(batch))
+
+    async def close(self) -> None:
+        return None
+
+
+class SegmentFileAuditSink:
+    """
+    Appends batches as JSON lines to compressed segment files, keeping audit
+    writes off the database. A segment is rotated once `max_bytes` of JSON
+    were written or it is `max_age` seconds old; completed segments lose their
+    `.part` suffix and can be bulk-loaded with app/utils/audit_segment_indexer.py.
+    The file is fsynced at most every `fsync_interval` seconds (and on rotation).
+    """
+    def __init__(
+        self,
+        directory: str,
+        *,
+        compression: str,
+        max_bytes: int,
+        max_age: float,
+        fsync_interval: float,
+    ):
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"Unknown audit segment compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("AUDIT_SEGMENT_COMPRESSION=zstd requires the 'zstandard' package")
+        self.directory = directory
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.fsync_interval = fsync_interval
+        self._raw: Optional[IO[bytes]] = None
+        self._stream: Optional[IO[bytes]] = None
+        self._path = ""
+        self._written = 0
+        self._opened_at = 0.0
+        self._synced_at = 0.0
+
+    async def write(self, batch: List[Dict[str, Any]]) -> None:
+        # File I/O and compression run off the event loop; the writer task
+        # never calls write concurrently
+        await asyncio.to_thread(self._write, batch)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close_segment)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        now = time.monotonic()
+        if self._stream is not None and (
+            self._written >= self.max_bytes or now - self._opened_at >= self.max_age
+        ):
+            self._close_segment()
+        if self._stream is None:
+            self._open_segment(now)
+
+        data = "".join(dump_row(row) + "\n" for row in batch).encode()
+        self._stream.write(data)
+        self._written += len(data)
+        if now - self._synced_at >= self.fsync_interval:
+            self._sync()
+
+    def _open_segment(self, now: float) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        name = f"audit-{stamp}-{os.getpid()}{_EXTENSIONS[self.compression]}"
+        self._path = os.path.join(self.directory, name)
+        self._raw = open(self._path + PARTIAL_SUFFIX, "wb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+        self._written = 0
+        self._opened_at = self._synced_at = now
+
+    def _sync(self) -> None:
+        # Push the compressor's pending block to the file, then to the disk
+        if self.compression == "gzip":
+            self._stream.flush()
+        elif self.compression == "zstd":
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._synced_at = time.monotonic()
+
+    def _close_segment(self) -> None:
+        if self._stream is None:
+            return
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+        os.replace(self._path + PARTIAL_SUFFIX, self._path)
+        self._stream = self._raw = None
+
+
+def _decompressed_chunks(raw: IO[bytes], name: str) -> Iterator[bytes]:
+    # Incremental decompressors return everything readable from a truncated
+    # stream instead of failing at the end like GzipFile.read would
+    if name.endswith(".gz"):
+        decompressor: Any = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Reading .zst segments requires the 'zstandard' package")
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        decompressor = None
+    while chunk := raw.read(1 << 20):
+        yield decompressor.decompress(chunk) if decompressor else chunk
+
+
+def read_segment(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Rows of a segment file, decompressed according to its extension.
+    A segment left by a crashed process yields the rows synced before the crash.
+    """
+    name = path[:-len(PARTIAL_SUFFIX)] if path.endswith(PARTIAL_SUFFIX) else path
+    buffer = b""
+    with open(path, "rb") as raw:
+        for chunk in _decompressed_chunks(raw, name):
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield load_row(line.decode())
+    if buffer.strip():
+        logger.warning(f"Ignored the incomplete last line of audit segment {path}")
+
+
+def create_audit_sink() -> AuditSink:
+    if settings.AUDIT_SINK == "segments":
+        return SegmentFileAuditSink(
+            settings.AUDIT_SEGMENT_DIR,
+            compression=settings.AUDIT_SEGMENT_COMPRESSION,
+            max_bytes=settings.AUDIT_SEGMENT_MAX_BYTES,
+            max_age=settings.AUDIT_SEGMENT_MAX_AGE_SECONDS,
+            fsync_interval=settings.AUDIT_SEGMENT_FSYNC_INTERVAL_SECONDS,
+        )
+    return DatabaseAuditSink()
@@ -0,0 +1,263 @@
+import asyncio
+import os
+import time
+import uuid as uuid_pkg
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.audit_sinks import AuditSink, create_audit_sink, dump_row, load_row
+from app.core.config import settings
+from app.core import metrics
+
+# Marks the end of the queue when the writer is stopped
+_STOP = object()
+
+
+class AuditLogWriter:
+    """
+    Writes audit events in the background, in batches handed to a sink
+    (multi-row INSERT or compressed segment files, see app/core/audit_sinks.py).
+
+    Events are put on a bounded queue and flushed by a single task once
+    `batch_size` events are pending or `flush_interval` seconds passed since
+    the first one. When the queue is full, events are appended to a JSON-lines
+    spill file if `spill_path` is set (and replayed once the database keeps
+    up again); otherwise the caller waits for room (back-pressure).
+
+    The task survives any failure: a batch that cannot be written is spilled
+    or counted as dropped, and spill lines that cannot be parsed are moved to
+    `<spill_path>.rejected`.
+    """
+    def __init__(
+        self,
+        sink: AuditSink,
+        *,
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        spill_path: Optional[str] = None,
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @staticmethod
+    def build_row(
+        *,
+        action: str,
+        resource_type: str,
+        user_id: Optional[int] = None,
+        ip_address: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        changes: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        # Timestamps are taken when the event happens, not when it is flushed
+        # (audit_logs uses naive DateTime columns, stored in UTC)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return {
+            "uuid": uuid_pkg.uuid4(),
+            "user_id": user_id,
+            "ip_address": ip_address,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "changes": changes,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    async def submit(self, row: Dict[str, Any]) -> None:
+        """Queues an audit row (see build_row). Never touches the database."""
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            if self.spill_path:
+                await self._spill([row])
+                return
+            metrics.AUDIT_QUEUE_BLOCKED.inc()
+            await self._queue.put(row)
+        metrics.AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+            self._task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        if self._stopping:
+            return
+        # Submitters would wait forever on a full queue: make it loud
+        if task.cancelled():
+            logger.error("Audit writer task was cancelled: audit events are no longer written")
+        else:
+            logger.opt(exception=task.exception()).error(
+                "Audit writer task exited: audit events are no longer written"
+            )
+
+    async def stop(self, timeout: float) -> None:
+        """Drains the queue (flushing every pending event), then stops."""
+        if self._task is None:
+            return
+        self._stopping = True
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put_nowait(_STOP)
+            stop_queued = True
+        except asyncio.QueueFull:
+            # The sink is not keeping up: spill what waits rather than block shutdown
+            stop_queued = bool(self.spill_path)
+            if stop_queued:
+                await self._spill(self._take_pending())
+                self._queue.put_nowait(_STOP)
+        try:
+            if not stop_queued:
+                await asyncio.wait_for(self._queue.put(_STOP), timeout)
+            await asyncio.wait_for(self._task, max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            pending = self._take_pending()
+            if pending and self.spill_path:
+                await self._spill(pending)
+            elif pending:
+                logger.error(f"Audit writer stopped with {len(pending)} unwritten events")
+                metrics.AUDIT_EVENTS.labels(result="dropped").inc(len(pending))
+        self._task = None
+        await self.sink.close()
+
+    async def _run(self) -> None:
+        await self._try_replay_spill()
+        while True:
+            batch: List[Dict[str, Any]] = []
+            item = await self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            metrics.AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+            if batch:
+                try:
+                    written = await self._flush(batch)
+                    if not written and self.spill_path:
+                        await self._spill(batch)
+                    elif written and self._queue.qsize() < self._queue.maxsize // 2:
+                        await self._try_replay_spill()
+                except Exception:
+                    # Not a database outage (e.g. an event the sink cannot
+                    # encode): a replay would fail the same way
+                    logger.exception(f"Audit batch of {len(batch)} events dropped")
+                    metrics.AUDIT_EVENTS.labels(result="dropped").inc(len(batch))
+            if item is _STOP:
+                return
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> bool:
+        started_at = time.perf_counter()
+        try:
+            await self.sink.write(batch)
+        except (SQLAlchemyError, OSError) as exc:
+            logger.warning(f"Audit flush of {len(batch)} events failed: {exc}")
+            if not self.spill_path:
+                metrics.AUDIT_EVENTS.labels(result="dropped").inc(len(batch))
+            return False
+        metrics.AUDIT_FLUSH_SECONDS.observe(time.perf_counter() - started_at)
+        metrics.AUDIT_EVENTS.labels(result="written").inc(len(batch))
+        return True
+
+    def _take_pending(self) -> List[Dict[str, Any]]:
+        pending = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                pending.append(item)
+        return pending
+
+    async def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        lines = [dump_row(row) + "\n" for row in rows]
+        await asyncio.to_thread(_append_lines, self.spill_path, lines)
+        metrics.AUDIT_EVENTS.labels(result="spilled").inc(len(rows))
+
+    async def _try_replay_spill(self) -> None:
+        try:
+            await self._replay_spill()
+        except Exception:
+            logger.exception("Replay of spilled audit events failed")
+
+    async def _replay_spill(self) -> None:
+        """
+        Re-inserts spilled events. The file is renamed first so that events
+        spilled meanwhile go to a fresh file; a failed replay keeps the
+        renamed file for the next attempt.
+        """
+        if not self.spill_path:
+            return
+        replay_path = f"{self.spill_path}.replay"
+        lines = await asyncio.to_thread(_take_spill_lines, self.spill_path, replay_path)
+        if lines is None:
+            return
+
+        rows: List[Dict[str, Any]] = []
+        rejected: List[str] = []
+        for line in lines:
+            try:
+                rows.append(load_row(line))
+            except (ValueError, KeyError, TypeError):
+                # e.g. the last line, truncated by a crash during a spill
+                rejected.append(line if line.endswith("\n") else line + "\n")
+        if rejected:
+            await asyncio.to_thread(_append_lines, f"{self.spill_path}.rejected", rejected)
+            logger.error(
+                f"{len(rejected)} unreadable spilled audit events moved to {self.spill_path}.rejected"
+            )
+            metrics.AUDIT_EVENTS.labels(result="dropped").inc(len(rejected))
+        for start in range(0, len(rows), self.batch_size):
+            if not await self._flush(rows[start:start + self.batch_size]):
+                # Keep what was not written yet
+                remaining = [dump_row(row) + "\n" for row in rows[start:]]
+                await asyncio.to_thread(_write_lines, replay_path, remaining)
+                return
+        await asyncio.to_thread(os.remove, replay_path)
+        logger.info(f"Replayed {len(rows)} spilled audit events")
+
+
+def _append_lines(path: str, lines: List[str]) -> None:
+    with open(path, "a", encoding="utf-8") as spill_file:
+        spill_file.writelines(lines)
+
+
+def _write_lines(path: str, lines: List[str]) -> None:
+    with open(path, "w", encoding="utf-8") as spill_file:
+        spill_file.writelines(lines)
+
+
+def _take_spill_lines(spill_path: str, replay_path: str) -> Optional[List[str]]:
+    """Lines to replay: those of a previous failed replay, else of the spill file (renamed)."""
+    if not os.path.exists(replay_path):
+        if not os.path.exists(spill_path):
+            return None
+        os.replace(spill_path, replay_path)
+    with open(replay_path, encoding="utf-8") as replay_file:
+        return [line for line in replay_file if line.strip()]
+
+
+audit_log_writer = AuditLogWriter(
+    create_audit_sink(),
+    max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    spill_path=settings.AUDIT_SPILL_PATH,
+)
@@ -0,0 +1,94 @@
+import time
+from collections import OrderedDict
+from importlib import import_module
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core import metrics
+
+jose = import_module("jose")
+jwt = import_module("jose.jwt")
+JWTError = jose.JWTError
+
+
+class TokenVerifier:
+    """
+    Verifies bearer tokens and remembers the verified ones until their `exp`.
+    Bounded LRU: the least recently used token is dropped once max_size is reached.
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._verified: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the claims of a valid token, or None if it cannot be verified.
+        """
+        entry = self._verified.get(token)
+        if entry is not None:
+            expires_at, claims = entry
+            if expires_at > time.time():
+                self._verified.move_to_end(token)
+                metrics.TOKEN_VERIFICATIONS.labels(result="cached").inc()
+                return claims
+            del self._verified[token]
+
+        try:
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            metrics.TOKEN_VERIFICATIONS.labels(result="invalid").inc()
+            return None
+        metrics.TOKEN_VERIFICATIONS.labels(result="decoded").inc()
+
+        exp = claims.get("exp")
+        if self.max_size > 0 and isinstance(exp, (int, float)):
+            self._verified[token] = (float(exp), claims)
+            self._verified.move_to_end(token)
+            while len(self._verified) > self.max_size:
+                self._verified.popitem(last=False)
+        return claims
+
+    def clear(self) -> None:
+        self._verified.clear()
+
+
+token_verifier = TokenVerifier(max_size=settings.TOKEN_CACHE_MAX_SIZE)
+
+
+def access_token_user_id(claims: Optional[Dict[str, Any]]) -> Optional[int]:
+    """
+    User id of verified claims, None unless they are those of an access
+    token: a refresh token carries a `sub` too, but must not authenticate.
+    """
+    if not claims or claims.get("type") != "access" or claims.get("sub") is None:
+        return None
+    try:
+        return int(claims["sub"])
+    except (ValueError, TypeError):
+        return None
+
+
+class AuthenticationMiddleware:
+    """
+    Pure ASGI middleware verifying the bearer token once per request.
+    The claims (or None) are stored in `request.state.token_claims` for the
+    audit middleware (app/core/audit.py) and the auth dependencies (app/api/deps.py).
+    It never rejects a request: endpoints decide through their dependencies.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            claims = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    scheme, _, token = value.decode("latin-1").partition(" ")
+                    if scheme.lower() == "bearer" and token.strip():
+                        claims = token_verifier.verify(token.strip())
+                    break
+            scope.setdefault("state", {})["token_claims"] = claims
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,339 @@
+import asyncio
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import asyncpg
+from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # Optional: without it, only gzip is offered
+    brotli = None
+
+# Preferred first when the client weighs them equally
+ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Already compressed formats (xlsx, pdf, images) are left alone
+_COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+    "application/openmetrics-text",
+})
+
+# Postgres channel on which payload cache invalidations are published.
+# Payload: key prefix
+PAYLOAD_CACHE_CHANNEL = "payload_cache"
+
+# Levels of payloads compressed once and served many times
+_PRECOMPRESSED_LEVELS = {"gzip": 9, "br": 11}
+
+
+@lru_cache(maxsize=512)
+def negotiate(accept_encoding: str, available: Tuple[str, ...] = ENCODINGS) -> Optional[str]:
+    """
+    Encoding of `available` the Accept-Encoding header weighs highest, None
+    for identity. Ties go to the first of `available`; q=0 refuses.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+    best: Optional[str] = None
+    best_quality = 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(media_type: str) -> bool:
+    media_type = media_type.partition(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith("+json")
+        or media_type in _COMPRESSIBLE_TYPES
+    )
+
+
+class _Compressor:
+    """Incremental gzip or brotli stream."""
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            # wbits=31: gzip container
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        """Everything compressed so far, decodable by the client right away."""
+        if self.encoding == "br":
+            return self._brotli.flush()
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    compressor = _Compressor(encoding, level)
+    return compressor.compress(data) + compressor.finish()
+
+
+def _level(encoding: str) -> int:
+    return settings.COMPRESSION_BROTLI_QUALITY if encoding == "br" else settings.COMPRESSION_GZIP_LEVEL
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing text and JSON responses with the
+    encoding negotiated from Accept-Encoding (br, then gzip).
+
+    A response sent in one body message is compressed whole if it is at
+    least COMPRESSION_MIN_SIZE bytes. A streaming response (more_body) is
+    compressed chunk by chunk, each chunk flushed so the client can decode
+    it on arrival (NDJSON exports). Responses that already carry a
+    Content-Encoding, such as precompressed payloads, pass through.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        minimum_size = settings.COMPRESSION_MIN_SIZE
+        # Start message held until the first body chunk tells its size
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                if self._should_compress(message, minimum_size):
+                    start = message
+                    return
+            elif message["type"] == "http.response.body" and (start is not None or compressor is not None):
+                await send_body(message)
+                return
+            await send(message)
+
+        async def send_body(message: Message) -> None:
+            nonlocal start, compressor
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                assert start is not None
+                if not more_body and len(body) < minimum_size:
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, _level(encoding))
+                headers = MutableHeaders(scope=start)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # Same entity, different bytes
+                    headers["ETag"] = f"W/{etag}"
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    data = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(data))
+                    metrics.HTTP_COMPRESSED_RESPONSES.labels(encoding=encoding, mode="buffered").inc()
+                    self._count(len(body), len(data))
+                    await send(start)
+                    start = None
+                    await send({"type": "http.response.body", "body": data, "more_body": False})
+                    return
+                metrics.HTTP_COMPRESSED_RESPONSES.labels(encoding=encoding, mode="streaming").inc()
+                await send(start)
+                start = None
+            data = compressor.compress(body) + (compressor.flush() if more_body else compressor.finish())
+            self._count(len(body), len(data))
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _should_compress(message: Message, minimum_size: int) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers or not is_compressible(headers.get("content-type", "")):
+            return False
+        length = headers.get("content-length")
+        return length is None or int(length) >= minimum_size
+
+    @staticmethod
+    def _count(identity: int, encoded: int) -> None:
+        metrics.HTTP_COMPRESSION_BYTES.labels(stage="identity").inc(identity)
+        metrics.HTTP_COMPRESSION_BYTES.labels(stage="encoded").inc(encoded)
+
+
+@dataclass(frozen=True)
+class CompressedPayload:
+    """
+    Response body kept in every encoding, compressed once at the highest
+    levels: serving it costs no compression CPU.
+    """
+    media_type: str
+    variants: Dict[str, bytes]  # Encoding ("identity", "gzip", "br") -> body
+
+    @classmethod
+    def build(cls, body: bytes, media_type: str = "application/json") -> "CompressedPayload":
+        variants = {"identity": body}
+        if len(body) >= settings.COMPRESSION_MIN_SIZE:
+            for encoding in ENCODINGS:
+                variants[encoding] = compress(body, encoding, _PRECOMPRESSED_LEVELS[encoding])
+        return cls(media_type, variants)
+
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        return tuple(encoding for encoding in ENCODINGS if encoding in self.variants)
+
+    def response(self, accept_encoding: str) -> Response:
+        encoding = negotiate(accept_encoding, self.encodings) if settings.COMPRESSION_ENABLED else None
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(
+            content=self.variants[encoding or "identity"], media_type=self.media_type, headers=headers
+        )
+
+
+class PayloadCache:
+    """
+    Bounded, TTL-based cache of CompressedPayloads by key, for responses
+    that are expensive to build and rarely change. Least recently used
+    entries are evicted once max_size is reached. Each worker holds its own
+    cache, invalidated on every worker through PAYLOAD_CACHE_CHANNEL: it is
+    only used while `ready`, i.e. while the listener is connected.
+    """
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ready = False
+        self._entries: "OrderedDict[str, Tuple[float, CompressedPayload]]" = OrderedDict()
+        # Bumped by invalidations: a build they overlap is not stored
+        self._generation = 0
+
+    def get(self, key: str) -> Optional[CompressedPayload]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def set(self, key: str, payload: CompressedPayload) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_build(
+        self, key: str, build: Callable[[], Awaitable[bytes]], media_type: str = "application/json"
+    ) -> CompressedPayload:
+        if not self.ready:
+            return CompressedPayload(media_type, {"identity": await build()})
+        payload = self.get(key)
+        if payload is not None:
+            metrics.PAYLOAD_CACHE_HITS.inc()
+            return payload
+        metrics.PAYLOAD_CACHE_MISSES.inc()
+        generation = self._generation
+        body = await build()
+        # Maximum levels take a while on large bodies: off the event loop
+        payload = await asyncio.to_thread(CompressedPayload.build, body, media_type)
+        if generation == self._generation:
+            self.set(key, payload)
+        return payload
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        self._generation += 1
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+
+payload_cache = PayloadCache(
+    max_size=settings.PAYLOAD_CACHE_MAX_SIZE,
+    ttl=settings.PAYLOAD_CACHE_TTL_SECONDS,
+)
+
+
+async def listen_payload_invalidations(retry_delay: float = 5.0) -> None:
+    """
+    Background task: applies the key prefixes published on
+    PAYLOAD_CACHE_CHANNEL to this worker's payload cache. Reconnects (and
+    clears the cache, since notifications may have been missed) when the
+    connection drops.
+    """
+    dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+    def on_notification(connection, pid, channel, payload) -> None:
+        payload_cache.invalidate_prefix(payload)
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(PAYLOAD_CACHE_CHANNEL, on_notification)
+            payload_cache.clear()
+            payload_cache.ready = True
+            await closed.wait()
+        except (OSError, asyncpg.PostgresError) as exc:
+            logger.warning(f"Payload cache listener disconnected: {exc}")
+        finally:
+            payload_cache.ready = False
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(retry_delay)
@@ -1,4 +1,4 @@
-from typing import List, TYPE_CHECKING
+from typing import List, Literal, Optional, TYPE_CHECKING
 from pydantic import AnyHttpUrl, PostgresDsn, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -37,11 +37,125 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         ))
 
+    # Read Replica (optional): list, search, report and export endpoints
+    READ_REPLICA_HOST: Optional[str] = None
+    READ_REPLICA_PORT: Optional[int] = None  # Defaults to POSTGRES_PORT
+    READ_REPLICA_USER: Optional[str] = None  # Defaults to POSTGRES_USER
+    READ_REPLICA_PASSWORD: Optional[str] = None  # Defaults to POSTGRES_PASSWORD
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # A client's reads stay on the primary after a write
+    READ_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    READ_REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 2.0
+
+    @computed_field(return_type=Optional[str])
+    def READ_REPLICA_DATABASE_URL(self) -> Optional[str]:
+        if not self.READ_REPLICA_HOST:
+            return None
+        return str(PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            username=self.READ_REPLICA_USER or self.POSTGRES_USER,
+            password=self.READ_REPLICA_PASSWORD or self.POSTGRES_PASSWORD,
+            host=self.READ_REPLICA_HOST,
+            port=self.READ_REPLICA_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        ))
+
+    # Database Connection Pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20  # Connections allowed beyond DB_POOL_SIZE under load
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # -1 never recycles
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30.0
+    DB_STATEMENT_CACHE_SIZE: int = 100  # Prepared statements per connection (0 behind PgBouncer)
+
+    # SQL Instrumentation (per request)
+    SERVER_TIMING_ENABLED: bool = True  # Server-Timing response header with DB time and query count
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10  # Repeats of one statement shape that log a warning (0 disables)
+
+    # List Endpoints
+    LIST_COUNT_EXACT_MAX: int = 10000  # Larger totals are reported as estimates (X-Total-Count)
+    FAST_READ_PATH_ENABLED: bool = True  # GET /actes serialized from plain rows (same JSON as the ORM path)
+
+    # Slow Query Log
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0  # 0 disables
+    SLOW_QUERY_LOG_PATH: str = "logs/slow_queries.jsonl"
+    SLOW_QUERY_LOG_ROTATION: str = "100 MB"
+    SLOW_QUERY_LOG_RETENTION: int = 10  # Rotated files kept
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0  # Share of slow read-only statements re-run with EXPLAIN ANALYZE
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 5000
+    SLOW_QUERY_MAX_FINGERPRINTS: int = 500  # Statement fingerprints kept in memory per worker
+
+    # Response Compression (gzip; br needs the 'brotli' package)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Smaller bodies are sent as is
+    COMPRESSION_GZIP_LEVEL: int = 6  # On the fly; precompressed payloads use 9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # On the fly; precompressed payloads use 11
+
+    # Precompressed Payload Cache (closed-period reports)
+    PAYLOAD_CACHE_MAX_SIZE: int = 256  # 0 disables
+    PAYLOAD_CACHE_TTL_SECONDS: float = 60.0  # Bound on staleness if an invalidation is missed
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_CACHE_MAX_SIZE: int = 10_000  # Verified tokens kept until their exp
+    # Stateless mode: access tokens embed type, active flag and permissions,
+    # checked against token_version instead of loading the user
+    STATELESS_ACCESS_TOKENS: bool = False
+
+    # Refresh Tokens (stored hashed, rotated on every use)
+    REVOKED_TOKEN_CACHE_MAX_SIZE: int = 10_000
+    REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS: float = 3600.0
+    REFRESH_TOKEN_CLEANUP_BATCH_SIZE: int = 1000
+
+    # Login Rate Limiting (token buckets, checked before any bcrypt work)
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"  # per worker, or shared by all
+    LOGIN_RATE_LIMIT_IP_CAPACITY: int = 20
+    LOGIN_RATE_LIMIT_IP_REFILL_PER_MINUTE: float = 10.0
+    LOGIN_RATE_LIMIT_IDENTIFIER_CAPACITY: int = 5
+    LOGIN_RATE_LIMIT_IDENTIFIER_REFILL_PER_MINUTE: float = 1.0
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    # Audit Log Writer (batched background INSERTs)
+    AUDIT_QUEUE_MAX_SIZE: int = 10_000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_DRAIN_TIMEOUT_SECONDS: float = 10.0
+    AUDIT_SPILL_PATH: Optional[str] = None  # None: back-pressure when the queue is full
+    AUDIT_CHANGES_MAX_BYTES: int = 16_384  # Serialized size cap of the diffs of one entry
+    AUDIT_SINK: Literal["database", "segments"] = "database"  # segments: compressed JSON-lines files
+    AUDIT_SEGMENT_DIR: str = "audit_segments"
+    AUDIT_SEGMENT_COMPRESSION: Literal["gzip", "zstd", "none"] = "gzip"  # zstd requires zstandard
+    AUDIT_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024  # Uncompressed bytes per segment
+    AUDIT_SEGMENT_MAX_AGE_SECONDS: float = 3600.0
+    AUDIT_SEGMENT_FSYNC_INTERVAL_SECONDS: float = 1.0
+
+    # Audit Log Partitions (monthly) and Retention
+    AUDIT_RETENTION_MONTHS: int = 24  # 0 keeps every partition
+    AUDIT_ARCHIVE_SCHEMA: Optional[str] = "audit_archive"  # None drops retired partitions
+    AUDIT_PARTITIONS_AHEAD: int = 2
+    AUDIT_MAINTENANCE_INTERVAL_SECONDS: float = 86400.0
+
+    # Principal Cache (authorization snapshot of the current user)
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
+    # Metrics (/metrics, Prometheus)
+    METRICS_ALLOWED_NETWORKS: List[str] = ["127.0.0.1/32", "::1/128"]  # Scraper addresses (CIDR)
+
+    # Password Hashing Pool (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 8
+
+    # bcrypt Cost (calibrated at startup unless PASSWORD_HASH_ROUNDS is set)
+    PASSWORD_HASH_ROUNDS: Optional[int] = None
+    PASSWORD_HASH_TARGET_MS: float = 250.0
+    PASSWORD_HASH_MIN_ROUNDS: int = 10
+    PASSWORD_HASH_MAX_ROUNDS: int = 16
 
     # CORS
     CORS_ORIGINS: List[AnyHttpUrl] = []
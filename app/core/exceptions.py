@@ -29,3 +29,7 @@ class BadRequestException(BaseAPIException):
 class ConflictException(BaseAPIException):
     status_code = status.HTTP_409_CONFLICT
     detail = "Conflit de données."
+
+class TooManyRequestsException(BaseAPIException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    detail = "Trop de tentatives. Veuillez réessayer plus tard."
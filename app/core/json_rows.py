@@ -0,0 +1,87 @@
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import Column, Table
+
+
+def _default(value: Any) -> Any:
+    # Numeric columns: the response schemas declare them as float
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class JsonRowTemplate:
+    """
+    Serializes plain result rows to JSON bytes exactly as FastAPI would
+    serialize them through `schema` (same keys, same order, same value
+    formats), without ORM objects or Pydantic validation.
+
+    Scalar fields are read from the columns of `table` with the same names;
+    `nested` maps the schema's relationship fields to the templates of the
+    joined tables, whose columns follow in the row. A nested object whose
+    primary key is NULL (no row joined) is serialized as null.
+    `fields` restricts the scalar fields (sparse fieldsets); the schema's
+    order is kept whatever the order of `fields`.
+    """
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        table: Table,
+        *,
+        nested: Optional[Dict[str, "JsonRowTemplate"]] = None,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        nested = nested or {}
+        selected = set(fields) if fields is not None else None
+        names = [
+            name for name in schema.model_fields
+            if name in nested or selected is None or name in selected
+        ]
+        self.nested = {name: nested[name] for name in names if name in nested}
+        self.keys = tuple(name for name in names if name not in self.nested)
+        if names[len(self.keys):] != list(self.nested):
+            # Keys are inserted scalars first: nested fields must come last
+            raise ValueError(f"{schema.__name__}: nested fields must be declared after the scalar fields")
+        self.table_columns: List[Column] = [table.c[name] for name in self.keys]
+        primary_key = list(table.primary_key.columns)[0].name
+        # Needed to serialize an unmatched outer join as null
+        self._primary_key = self.keys.index(primary_key) if primary_key in self.keys else None
+
+    @property
+    def columns(self) -> List[Column]:
+        """Columns to select, in row order."""
+        columns = list(self.table_columns)
+        for template in self.nested.values():
+            columns.extend(template.columns)
+        return columns
+
+    @property
+    def width(self) -> int:
+        return len(self.keys) + sum(template.width for template in self.nested.values())
+
+    def build(self, row: Sequence[Any], start: int = 0) -> Optional[Dict[str, Any]]:
+        if self._primary_key is not None and row[start + self._primary_key] is None:
+            return None
+        end = start + len(self.keys)
+        obj = dict(zip(self.keys, row[start:end]))
+        for name, template in self.nested.items():
+            obj[name] = template.build(row, end)
+            end += template.width
+        return obj
+
+    def dumps(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        """JSON array of the rows, byte-identical to the JSONResponse of the schema."""
+        if self.nested:
+            objects = [self.build(row) for row in rows]
+        else:
+            keys = self.keys
+            objects = [dict(zip(keys, row)) for row in rows]
+        # OPT_UTC_Z: Pydantic writes the UTC offset as "Z"
+        return orjson.dumps(objects, default=_default, option=orjson.OPT_UTC_Z)
+
+    def dumps_row(self, row: Sequence[Any]) -> bytes:
+        """JSON object of a single row."""
+        return orjson.dumps(self.build(row), default=_default, option=orjson.OPT_UTC_Z)
@@ -12,6 +12,7 @@ def setup_logging():
     logger.add(
         sys.stdout,
         level="DEBUG" if settings.DEBUG else "INFO",
+        filter=lambda record: "slow_query" not in record["extra"],
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
     )
     
@@ -21,7 +22,19 @@ def setup_logging():
         rotation="500 MB",
         retention="10 days",
         level="INFO",
+        filter=lambda record: "slow_query" not in record["extra"],
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
     )
 
+    # Slow query log: one JSON object per line (see app/core/slow_queries.py)
+    logger.add(
+        settings.SLOW_QUERY_LOG_PATH,
+        rotation=settings.SLOW_QUERY_LOG_ROTATION,
+        retention=settings.SLOW_QUERY_LOG_RETENTION,
+        level="INFO",
+        filter=lambda record: "slow_query" in record["extra"],
+        format="{message}",
+        enqueue=True,
+    )
+
     logger.info("Logging initialized")
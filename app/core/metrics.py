@@ -0,0 +1,202 @@
+"""
+Prometheus metrics shared across the application.
+Exposed on the /metrics endpoint (see main.py and make_metrics_app).
+"""
+import ipaddress
+
+from prometheus_client import Counter, Gauge, Histogram, make_asgi_app
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Principal cache (app/core/principal.py)
+PRINCIPAL_CACHE_HITS = Counter(
+    "visiomed_principal_cache_hits_total",
+    "Authenticated requests served from the principal cache.",
+)
+PRINCIPAL_CACHE_MISSES = Counter(
+    "visiomed_principal_cache_misses_total",
+    "Authenticated requests that had to load the user from the database.",
+)
+PRINCIPAL_CACHE_EVICTIONS = Counter(
+    "visiomed_principal_cache_evictions_total",
+    "Entries removed from the principal cache.",
+    ["reason"],
+)
+PRINCIPAL_CACHE_SIZE = Gauge(
+    "visiomed_principal_cache_size",
+    "Number of entries currently held in the principal cache.",
+)
+
+# Bearer token verification (app/core/authentication.py)
+TOKEN_VERIFICATIONS = Counter(
+    "visiomed_token_verifications_total",
+    "Bearer token verifications by result (cached, decoded, invalid).",
+    ["result"],
+)
+
+# Password hashing pool (app/core/security.py)
+PASSWORD_HASH_QUEUE_SECONDS = Histogram(
+    "visiomed_password_hash_queue_seconds",
+    "Time a password hash/verify call waited before a worker picked it up.",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "visiomed_password_hash_seconds",
+    "Time spent computing a password hash/verify call on the pool.",
+    ["operation"],
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+PASSWORD_HASH_WAITING = Gauge(
+    "visiomed_password_hash_waiting",
+    "Password hash/verify calls waiting for a concurrency slot.",
+)
+
+# Login rate limiter (app/core/rate_limit.py)
+LOGIN_RATE_LIMITED = Counter(
+    "visiomed_login_rate_limited_total",
+    "Login attempts rejected with 429 before any password hashing.",
+    ["scope"],
+)
+
+# Audit log writer (app/core/audit_writer.py)
+AUDIT_QUEUE_DEPTH = Gauge(
+    "visiomed_audit_queue_depth",
+    "Audit events waiting to be written.",
+)
+AUDIT_QUEUE_BLOCKED = Counter(
+    "visiomed_audit_queue_blocked_total",
+    "Audit submissions that had to wait because the queue was full.",
+)
+AUDIT_FLUSH_SECONDS = Histogram(
+    "visiomed_audit_flush_seconds",
+    "Time spent writing one batch of audit events.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+AUDIT_EVENTS = Counter(
+    "visiomed_audit_events_total",
+    "Audit events by outcome (written, spilled, dropped).",
+    ["result"],
+)
+
+# Database connection pools (app/db/database.py)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "visiomed_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled connection (including new connections).",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_IN_USE = Gauge(
+    "visiomed_db_pool_in_use",
+    "Connections currently checked out of the pool.",
+    ["pool"],
+)
+DB_POOL_OVERFLOW = Gauge(
+    "visiomed_db_pool_overflow",
+    "Connections open beyond the pool size.",
+    ["pool"],
+)
+DB_POOL_SIZE = Gauge(
+    "visiomed_db_pool_size",
+    "Configured pool size.",
+    ["pool"],
+)
+
+# Read replica routing (app/db/replica.py)
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "visiomed_db_replica_lag_seconds",
+    "Last measured replay lag of the read replica (NaN when unreachable).",
+)
+DB_READ_ROUTING = Counter(
+    "visiomed_db_read_routing_total",
+    "Read-only sessions by target (replica, primary) and reason.",
+    ["target", "reason"],
+)
+
+# Per-request SQL statistics (app/core/query_stats.py)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "visiomed_db_queries_per_request",
+    "SQL statements executed per request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "visiomed_db_time_per_request_seconds",
+    "Time spent executing SQL statements per request.",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_FAILED_QUERIES = Counter(
+    "visiomed_db_failed_queries_total",
+    "SQL statements that raised (timed and counted per request too).",
+    ["route"],
+)
+DB_N_PLUS_ONE = Counter(
+    "visiomed_db_n_plus_one_total",
+    "Requests in which one statement shape repeated past SQL_N_PLUS_ONE_THRESHOLD.",
+    ["route"],
+)
+
+# Slow query log (app/core/slow_queries.py)
+DB_SLOW_QUERIES = Counter(
+    "visiomed_db_slow_queries_total",
+    "Statements slower than SLOW_QUERY_THRESHOLD_MS.",
+    ["route"],
+)
+DB_SLOW_QUERY_EXPLAINS = Counter(
+    "visiomed_db_slow_query_explains_total",
+    "Sampled EXPLAIN (ANALYZE, BUFFERS) runs of slow statements.",
+    ["result"],
+)
+
+# Units of work (app/services/base.py)
+DB_UNITS_OF_WORK = Counter(
+    "visiomed_db_units_of_work_total",
+    "Outermost units of work ended, by outcome (commit or rollback).",
+    ["outcome"],
+)
+
+# Response compression (app/core/compression.py)
+HTTP_COMPRESSED_RESPONSES = Counter(
+    "visiomed_http_compressed_responses_total",
+    "Responses compressed on the fly, by encoding and mode (buffered or streaming).",
+    ["encoding", "mode"],
+)
+HTTP_COMPRESSION_BYTES = Counter(
+    "visiomed_http_compression_bytes_total",
+    "Body bytes before (identity) and after (encoded) on-the-fly compression.",
+    ["stage"],
+)
+PAYLOAD_CACHE_HITS = Counter(
+    "visiomed_payload_cache_hits_total",
+    "Precompressed payloads served from the cache.",
+)
+PAYLOAD_CACHE_MISSES = Counter(
+    "visiomed_payload_cache_misses_total",
+    "Precompressed payload lookups that had to build the payload.",
+)
+
+
+def make_metrics_app() -> ASGIApp:
+    """
+    Prometheus exposition app, answering only clients of
+    METRICS_ALLOWED_NETWORKS (the scrapers): the counters reveal the
+    internal activity of the application.
+    """
+    networks = [ipaddress.ip_network(network) for network in settings.METRICS_ALLOWED_NETWORKS]
+    exposition = make_asgi_app()
+
+    async def metrics_app(scope: Scope, receive: Receive, send: Send) -> None:
+        client = scope.get("client")
+        try:
+            address = ipaddress.ip_address(client[0]) if client else None
+        except ValueError:
+            address = None
+        if address is None or not any(address in network for network in networks):
+            await PlainTextResponse("Forbidden", status_code=403)(scope, receive, send)
+            return
+        await exposition(scope, receive, send)
+
+    return metrics_app
@@ -0,0 +1,41 @@
+from typing import Dict, Iterable
+
+
+class PermissionRegistry:
+    """
+    Maps permission slugs (e.g. 'acte.create') to bit positions so that a
+    user's permissions can be held as a single integer bitset.
+    Slugs are registered at startup (from the permissions table and from
+    `require(...)` declarations); bits are never reassigned within a process.
+    """
+    def __init__(self) -> None:
+        self._bits: Dict[str, int] = {}
+
+    def register(self, slug: str) -> int:
+        """Returns the bit mask of a slug, assigning the next free bit if it is new."""
+        bit = self._bits.get(slug)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[slug] = bit
+        return bit
+
+    def bit(self, slug: str) -> int:
+        """Bit mask of a known slug, 0 if the slug was never registered."""
+        return self._bits.get(slug, 0)
+
+    def mask(self, slugs: Iterable[str]) -> int:
+        """Bitset of the given slugs (new slugs are registered on the fly)."""
+        bits = 0
+        for slug in slugs:
+            bits |= self.register(slug)
+        return bits
+
+    def slugs(self, bits: int) -> list[str]:
+        """Slugs contained in a bitset (for debugging and introspection)."""
+        return [slug for slug, bit in self._bits.items() if bits & bit]
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+
+permission_registry = PermissionRegistry()
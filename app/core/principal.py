@@ -0,0 +1,207 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+import asyncpg
+from loguru import logger
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core import metrics
+from app.core.permissions import permission_registry
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.db.models.user import User
+
+# Postgres channel on which principal cache invalidations are published.
+# Payload: "user:<id>", "role:<id>" or "all"
+PRINCIPAL_CACHE_CHANNEL = "principal_cache"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Immutable snapshot of the fields needed to authorize a request.
+    Built from a fully loaded User and cached per user id.
+    """
+    id: int
+    type: str
+    is_active: bool
+    role_ids: FrozenSet[int]
+    permission_bits: int  # Bitset over permission_registry
+    token_version: int = 0
+
+    def has_permission(self, bit: int) -> bool:
+        return bool(self.permission_bits & bit)
+
+    @classmethod
+    def from_user(cls, user: "User") -> "Principal":
+        return cls(
+            id=user.id,
+            type=user.type,
+            is_active=user.is_active,
+            role_ids=frozenset(role.id for role in user.roles),
+            permission_bits=permission_registry.mask(
+                permission.slug for role in user.roles for permission in role.permissions
+            ),
+            token_version=user.token_version,
+        )
+
+    @classmethod
+    def from_claims(cls, user_id: int, claims: Dict[str, Any]) -> "Principal":
+        """Builds a principal from a stateless access token (see token_claims)."""
+        return cls(
+            id=user_id,
+            type=claims["utype"],
+            is_active=claims["act"],
+            role_ids=frozenset(),
+            permission_bits=permission_registry.mask(claims.get("perms", [])),
+            token_version=claims["ver"],
+        )
+
+
+def token_claims(user: "User") -> Dict[str, Any]:
+    """
+    Authorization claims embedded in stateless access tokens.
+    Permission slugs are embedded rather than bits: bit positions are
+    assigned per process and differ between workers.
+    """
+    perms: List[str] = sorted({
+        permission.slug for role in user.roles for permission in role.permissions
+    })
+    return {
+        "utype": user.type,
+        "act": user.is_active,
+        "perms": perms,
+        "ver": user.token_version,
+    }
+
+
+class PrincipalCache:
+    """
+    Bounded, TTL-based cache of Principals keyed by user id.
+    Least recently used entries are evicted once max_size is reached.
+    Each worker holds its own cache, invalidated on every worker through
+    PRINCIPAL_CACHE_CHANNEL: it is only used while `ready`, i.e. while the
+    listener is connected.
+    """
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ready = False
+        self._entries: "OrderedDict[int, Tuple[float, Principal]]" = OrderedDict()
+        # Bumped by invalidations: a snapshot loaded before one is not stored
+        self.generation = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        if not self.ready:
+            return None
+        entry = self._entries.get(user_id)
+        if entry is None:
+            metrics.PRINCIPAL_CACHE_MISSES.inc()
+            return None
+
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            self._remove(user_id, reason="expired")
+            metrics.PRINCIPAL_CACHE_MISSES.inc()
+            return None
+
+        self._entries.move_to_end(user_id)
+        metrics.PRINCIPAL_CACHE_HITS.inc()
+        return principal
+
+    def set(self, principal: Principal, generation: int) -> None:
+        """Stores a snapshot loaded when `generation` was current."""
+        if self.max_size <= 0 or not self.ready or generation != self.generation:
+            return
+        self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_size:
+            user_id = next(iter(self._entries))
+            self._remove(user_id, reason="capacity")
+        metrics.PRINCIPAL_CACHE_SIZE.set(len(self._entries))
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the snapshot of a single user (user updated or removed)."""
+        self.generation += 1
+        self._remove(user_id, reason="invalidated")
+
+    def invalidate_role(self, role_id: int) -> None:
+        """Drop the snapshots of every user holding the given role."""
+        self.generation += 1
+        for user_id in [uid for uid, (_, p) in self._entries.items() if role_id in p.role_ids]:
+            self._remove(user_id, reason="invalidated")
+
+    def clear(self) -> None:
+        """Drop every snapshot (e.g. a permission was renamed or removed)."""
+        self.generation += 1
+        if self._entries:
+            metrics.PRINCIPAL_CACHE_EVICTIONS.labels(reason="invalidated").inc(len(self._entries))
+        self._entries.clear()
+        metrics.PRINCIPAL_CACHE_SIZE.set(0)
+
+    def _remove(self, user_id: int, *, reason: str) -> None:
+        if self._entries.pop(user_id, None) is not None:
+            metrics.PRINCIPAL_CACHE_EVICTIONS.labels(reason=reason).inc()
+            metrics.PRINCIPAL_CACHE_SIZE.set(len(self._entries))
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE if settings.PRINCIPAL_CACHE_ENABLED else 0,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def apply_invalidation(payload: str) -> None:
+    """Applies a PRINCIPAL_CACHE_CHANNEL payload to this worker's cache."""
+    kind, _, target = payload.partition(":")
+    if kind == "user":
+        principal_cache.invalidate(int(target))
+    elif kind == "role":
+        principal_cache.invalidate_role(int(target))
+    else:
+        principal_cache.clear()
+
+
+async def publish_invalidation(db: "AsyncSession", payload: str) -> None:
+    """
+    Publishes a cache invalidation ("user:<id>", "role:<id>" or "all") to
+    every worker. Transactional: delivered when the caller commits.
+    """
+    await db.execute(select(func.pg_notify(PRINCIPAL_CACHE_CHANNEL, payload)))
+
+
+async def listen_principal_invalidations(retry_delay: float = 5.0) -> None:
+    """
+    Background task: applies the invalidations published on
+    PRINCIPAL_CACHE_CHANNEL to this worker's principal cache. Reconnects
+    (and clears the cache, since notifications may have been missed) when
+    the connection drops.
+    """
+    dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+    def on_notification(connection, pid, channel, payload) -> None:
+        apply_invalidation(payload)
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(PRINCIPAL_CACHE_CHANNEL, on_notification)
+            principal_cache.clear()
+            principal_cache.ready = True
+            await closed.wait()
+        except (OSError, asyncpg.PostgresError) as exc:
+            logger.warning(f"Principal cache listener disconnected: {exc}")
+        finally:
+            principal_cache.ready = False
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(retry_delay)
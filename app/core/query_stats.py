@@ -0,0 +1,146 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core import metrics
+from app.core.slow_queries import EXPLAIN_OPTION, slow_query_log
+
+
+class RequestQueryStats:
+    """SQL statements executed while handling one request."""
+    __slots__ = ("scope", "count", "failed", "seconds", "shapes")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.count = 0
+        self.failed = 0  # Statements that raised, included in count
+        self.seconds = 0.0
+        # Parameterized SQL text -> executions: the text is the statement shape
+        self.shapes: "Counter[str]" = Counter()
+
+    @property
+    def route(self) -> str:
+        # Set on the scope by the router once the request is matched
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _request_stats.get()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Times every statement of `engine`, adds it to the current request's stats
+    and hands statements slower than SLOW_QUERY_THRESHOLD_MS to the slow query log.
+    """
+    sync_engine = engine.sync_engine
+
+    # The start time lives on the execution context, which is discarded with
+    # the statement whether it succeeds or raises
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(exception_context) -> None:
+        context = exception_context.execution_context
+        started_at = getattr(context, "_query_started_at", None)
+        # None: failed before reaching the cursor (e.g. connection refused)
+        if started_at is None or exception_context.connection.get_execution_options().get(EXPLAIN_OPTION):
+            return
+        stats = _record(exception_context.statement, time.perf_counter() - started_at)
+        if stats is not None:
+            stats.failed += 1
+        metrics.DB_FAILED_QUERIES.labels(route=stats.route if stats is not None else "none").inc()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - context._query_started_at
+        if conn.get_execution_options().get(EXPLAIN_OPTION):
+            return
+        stats = _record(statement, elapsed)
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold > 0 and elapsed * 1000 >= threshold:
+            slow_query_log.record(
+                statement,
+                parameters,
+                elapsed,
+                route=stats.route if stats is not None else None,
+                engine=engine,
+            )
+
+
+def _record(statement: str, elapsed: float) -> Optional[RequestQueryStats]:
+    """Adds a statement to the current request's stats, returned (None outside a request)."""
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.shapes[statement] += 1
+    return stats
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware collecting per-request SQL statistics.
+    Adds a `Server-Timing: db;dur=<ms>;desc="<n> queries"` header (statements
+    run before the response starts), records metrics per route, and logs a
+    warning when one statement shape repeats SQL_N_PLUS_ONE_THRESHOLD times.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.SERVER_TIMING_ENABLED:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+                )
+            await send(message)
+
+        reset_token = _request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(reset_token)
+            self._report(stats)
+
+    @staticmethod
+    def _report(stats: RequestQueryStats) -> None:
+        route = stats.route
+        metrics.DB_QUERIES_PER_REQUEST.labels(route=route).observe(stats.count)
+        metrics.DB_TIME_PER_REQUEST.labels(route=route).observe(stats.seconds)
+        threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+        if threshold <= 0 or not stats.shapes:
+            return
+        statement, repeats = stats.shapes.most_common(1)[0]
+        if repeats >= threshold:
+            metrics.DB_N_PLUS_ONE.labels(route=route).inc()
+            logger.warning(
+                f"Possible N+1 on {stats.scope['method']} {route}: statement executed "
+                f"{repeats} times ({stats.count} queries in total): {shape_of(statement)[:300]}"
+            )
+
+
+def shape_of(statement: Any) -> str:
+    """Single-line form of a SQL statement, for logs."""
+    return " ".join(str(statement).split())
@@ -0,0 +1,160 @@
+import math
+import random
+import time
+from collections import OrderedDict
+from typing import Literal, Optional, Tuple
+
+from sqlalchemy import Float, String, bindparam, text
+
+from app.core.config import settings
+from app.core import metrics
+from app.db.database import engine
+
+
+class TokenBucketLimiter:
+    """
+    In-memory token buckets keyed by an arbitrary string.
+    Each key may spend up to `capacity` tokens, refilled at `refill_per_second`.
+    Memory is bounded: buckets live in an LRU of at most max_keys entries,
+    and buckets that are full again (idle long enough) are dropped lazily,
+    since a missing bucket is equivalent to a full one.
+    """
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, key: str) -> float:
+        """
+        Takes one token for `key`. Returns 0 when allowed, otherwise the
+        number of seconds until a token becomes available (nothing is taken).
+        Async only to share PostgresTokenBucketLimiter's signature.
+        """
+        return self.take(key)
+
+    def take(self, key: str, now: Optional[float] = None) -> float:
+        """Synchronous core of acquire, with an optional clock for simulations."""
+        now = time.monotonic() if now is None else now
+        entry = self._buckets.pop(key, None)
+        if entry is None:
+            tokens = self.capacity
+        else:
+            tokens = min(self.capacity, entry[0] + (now - entry[1]) * self.refill_per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.refill_per_second
+        self._buckets[key] = (tokens, now)
+
+        self._expire(now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def _expire(self, now: float, limit: int = 2) -> None:
+        # Amortized lazy expiry of the least recently used buckets
+        for _ in range(limit):
+            if not self._buckets:
+                return
+            key, (tokens, updated_at) = next(iter(self._buckets.items()))
+            if tokens + (now - updated_at) * self.refill_per_second < self.capacity:
+                return
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class PostgresTokenBucketLimiter:
+    """
+    Token buckets stored in the login_rate_limits table so that every worker
+    shares the same state. Refill and consumption happen in one atomic upsert.
+    """
+    _ACQUIRE = text(
+        """
+        INSERT INTO login_rate_limits (key, tokens, allowed, updated_at)
+        VALUES (:key, :capacity - 1, true, now())
+        ON CONFLICT (key) DO UPDATE SET
+            allowed = LEAST(:capacity, login_rate_limits.tokens
+                + EXTRACT(EPOCH FROM now() - login_rate_limits.updated_at) * :rate) >= 1,
+            tokens = LEAST(:capacity, login_rate_limits.tokens
+                + EXTRACT(EPOCH FROM now() - login_rate_limits.updated_at) * :rate)
+                - CASE WHEN LEAST(:capacity, login_rate_limits.tokens
+                    + EXTRACT(EPOCH FROM now() - login_rate_limits.updated_at) * :rate) >= 1
+                  THEN 1 ELSE 0 END,
+            updated_at = now()
+        RETURNING allowed, tokens
+        """
+    ).bindparams(
+        bindparam("key", type_=String),
+        bindparam("capacity", type_=Float),
+        bindparam("rate", type_=Float),
+    )
+    _EXPIRE = text(
+        "DELETE FROM login_rate_limits WHERE updated_at < now() - make_interval(secs => :idle)"
+    ).bindparams(bindparam("idle", type_=Float))
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+
+    async def acquire(self, key: str) -> float:
+        params = {"key": key, "capacity": self.capacity, "rate": self.refill_per_second}
+        async with engine.begin() as connection:
+            row = (await connection.execute(self._ACQUIRE, params)).one()
+            # Lazy expiry: now and then, drop buckets that are full again
+            if random.random() < 0.001:
+                await connection.execute(
+                    self._EXPIRE, {"idle": self.capacity / self.refill_per_second}
+                )
+        if row.allowed:
+            return 0.0
+        return (1 - row.tokens) / self.refill_per_second
+
+
+class LoginRateLimiter:
+    """
+    Per-IP and per-identifier limits checked before any password hashing,
+    so that credential stuffing cannot exhaust the bcrypt workers.
+    """
+    def __init__(self, backend: Literal["memory", "postgres"]):
+        ip_rate = settings.LOGIN_RATE_LIMIT_IP_REFILL_PER_MINUTE / 60
+        identifier_rate = settings.LOGIN_RATE_LIMIT_IDENTIFIER_REFILL_PER_MINUTE / 60
+        if backend == "postgres":
+            self.by_ip = PostgresTokenBucketLimiter(settings.LOGIN_RATE_LIMIT_IP_CAPACITY, ip_rate)
+            self.by_identifier = PostgresTokenBucketLimiter(
+                settings.LOGIN_RATE_LIMIT_IDENTIFIER_CAPACITY, identifier_rate
+            )
+        else:
+            self.by_ip = TokenBucketLimiter(
+                settings.LOGIN_RATE_LIMIT_IP_CAPACITY, ip_rate, settings.LOGIN_RATE_LIMIT_MAX_KEYS
+            )
+            self.by_identifier = TokenBucketLimiter(
+                settings.LOGIN_RATE_LIMIT_IDENTIFIER_CAPACITY,
+                identifier_rate,
+                settings.LOGIN_RATE_LIMIT_MAX_KEYS,
+            )
+
+    async def check(self, *, ip_address: Optional[str], identifier: str) -> int:
+        """
+        Returns 0 when the attempt may proceed, otherwise the Retry-After
+        delay in seconds. The identifier bucket is only charged once the IP
+        bucket allowed the attempt.
+        """
+        if not settings.LOGIN_RATE_LIMIT_ENABLED:
+            return 0
+        for scope, limiter, key in (
+            ("ip", self.by_ip, f"ip:{ip_address or 'unknown'}"),
+            ("identifier", self.by_identifier, f"id:{identifier.lower()[:255]}"),
+        ):
+            retry_after = await limiter.acquire(key)
+            if retry_after:
+                metrics.LOGIN_RATE_LIMITED.labels(scope=scope).inc()
+                return max(1, math.ceil(retry_after))
+        return 0
+
+
+login_rate_limiter = LoginRateLimiter(settings.LOGIN_RATE_LIMIT_BACKEND)
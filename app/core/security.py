@@ -1,7 +1,13 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union, Any
+from typing import Callable, Dict, Optional, Tuple, TypeVar, Union, Any
 from importlib import import_module
+from loguru import logger
 from app.core.config import settings
+from app.core import metrics
 
 jwt = import_module("jose.jwt")
 CryptContext = import_module("passlib.context").CryptContext
@@ -9,6 +15,16 @@ CryptContext = import_module("passlib.context").CryptContext
 # Password Hashing Configuration
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is CPU-bound and would block the event loop: hashing runs on a
+# dedicated executor, and the semaphore bounds how many calls may be queued
+# or running at once so a login burst cannot pile up unbounded work.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_password_semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_CONCURRENCY)
+
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -24,31 +40,162 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, when the stored hash was produced with other
+    parameters than the current ones (see pwd_context.needs_update), returns
+    a new hash to persist. Returns (is_valid, new_hash_or_None).
+    """
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False, None
+    if pwd_context.needs_update(hashed_password):
+        return True, pwd_context.hash(plain_password)
+    return True, None
+
+
+def measure_bcrypt_hash_seconds(rounds: int, samples: int = 1) -> float:
+    """
+    Returns the average time (in seconds) of one bcrypt hash at the given cost.
+    """
+    handler = pwd_context.handler("bcrypt").using(rounds=rounds)
+    started_at = time.perf_counter()
+    for _ in range(samples):
+        handler.hash("calibration-password")
+    return (time.perf_counter() - started_at) / samples
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """
+    Picks the highest bcrypt cost whose hash time stays within target_ms on
+    the current machine. Each extra round doubles the cost.
+    """
+    rounds = min_rounds
+    while rounds < max_rounds:
+        if measure_bcrypt_hash_seconds(rounds + 1) * 1000 > target_ms:
+            break
+        rounds += 1
+    return rounds
+
+
+def configure_password_hashing(rounds: int) -> None:
+    """
+    Makes `rounds` the only accepted bcrypt cost: new hashes use it and
+    pwd_context.needs_update flags any hash stored with another cost.
+    """
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+async def setup_password_hashing() -> int:
+    """
+    Startup hook: uses PASSWORD_HASH_ROUNDS when set, otherwise calibrates the
+    bcrypt cost against PASSWORD_HASH_TARGET_MS on the password hashing pool.
+    """
+    rounds = settings.PASSWORD_HASH_ROUNDS
+    if rounds is None:
+        rounds = await asyncio.get_running_loop().run_in_executor(
+            _password_executor,
+            calibrate_bcrypt_rounds,
+            settings.PASSWORD_HASH_TARGET_MS,
+            settings.PASSWORD_HASH_MIN_ROUNDS,
+            settings.PASSWORD_HASH_MAX_ROUNDS,
+        )
+        logger.info(
+            f"bcrypt cost calibrated to {rounds} rounds "
+            f"(target {settings.PASSWORD_HASH_TARGET_MS:.0f} ms)"
+        )
+    configure_password_hashing(rounds)
+    return rounds
+
+
+async def _run_in_password_pool(operation: str, func: Callable[..., T], *args: Any) -> T:
+    submitted_at = time.perf_counter()
+
+    def run() -> T:
+        started_at = time.perf_counter()
+        metrics.PASSWORD_HASH_QUEUE_SECONDS.labels(operation=operation).observe(
+            started_at - submitted_at
+        )
+        try:
+            return func(*args)
+        finally:
+            metrics.PASSWORD_HASH_SECONDS.labels(operation=operation).observe(
+                time.perf_counter() - started_at
+            )
+
+    with metrics.PASSWORD_HASH_WAITING.track_inprogress():
+        await _password_semaphore.acquire()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, run)
+    finally:
+        _password_semaphore.release()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a password on the password hashing pool without blocking the event loop.
+    """
+    return await _run_in_password_pool("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hashes a password on the password hashing pool without blocking the event loop.
+    """
+    return await _run_in_password_pool("hash", get_password_hash, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Async counterpart of verify_and_update_password, run on the password hashing pool.
+    """
+    return await _run_in_password_pool(
+        "verify", verify_and_update_password, plain_password, hashed_password
+    )
+
+
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None,
+) -> str:
     """
     Creates a JWT access token.
     
     Args:
         subject: The subject of the token (usually user ID or email).
         expires_delta: Optional expiration time delta.
+        claims: Optional extra claims embedded in the token (stateless mode).
     """
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject), "type": "access"}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
-def create_refresh_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+def create_refresh_token(
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    token_id: Optional[str] = None,
+) -> str:
     """
     Creates a JWT refresh token.
     
     Args:
         subject: The subject of the token.
         expires_delta: Optional expiration time delta.
+        token_id: Optional unique id (`jti` claim) used for storage and revocation.
     """
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -56,5 +203,15 @@ def create_refresh_token(subject: Union[str, Any], expires_delta: Optional[timed
         expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    if token_id:
+        to_encode["jti"] = token_id
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+
+def hash_token(token: str) -> str:
+    """
+    SHA-256 of a token, as stored in the database (a leaked table does not
+    leak usable tokens).
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+from collections import deque
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core import metrics
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Execution option marking the connections used for EXPLAIN, so that their
+# own statements are neither timed nor explained again
+EXPLAIN_OPTION = "slow_query_explain"
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+_PARAM = r"(?:\$\d+|\?)(?:::\w+(?:\[\])?)?"  # Placeholder with an optional cast
+_PARAM_LISTS = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})+\s*\)")
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+# Statements whose re-execution has effects a rollback does not undo (session
+# advisory locks, set_config, pg_notify, backend signals) or that write
+_SIDE_EFFECTS = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|INTO|LOCK|FOR\s+(?:KEY\s+)?SHARE|NEXTVAL|SETVAL|SET_CONFIG"
+    r"|PG_NOTIFY|PG_(?:TRY_)?ADVISORY_\w+|PG_(?:CANCEL|TERMINATE)_BACKEND|PG_RELOAD_CONF"
+    r"|PG_LOGICAL_EMIT_MESSAGE|LO_\w+|DBLINK\w*)\b",
+    re.IGNORECASE,
+)
+
+
+def normalize(statement: str) -> str:
+    """Statement with literals and parameter lists collapsed, on one line."""
+    statement = _LITERALS.sub("?", statement)
+    statement = _PARAM_LISTS.sub("(...)", statement)
+    return " ".join(statement.split())
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize(statement).encode()).hexdigest()[:16]
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Types of the bound parameters, never their values (they may hold patient data)."""
+    if isinstance(parameters, dict):
+        return {key: parameter_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if len(parameters) > 20:
+            return f"{type(parameters).__name__}[{len(parameters)}]"
+        return [parameter_shape(value) for value in parameters]
+    return type(parameters).__name__
+
+
+def is_read_only(statement: str) -> bool:
+    """Safe to re-run with EXPLAIN ANALYZE: a plain read calling no side-effecting function."""
+    return bool(_READ_ONLY.match(statement)) and not _SIDE_EFFECTS.search(statement)
+
+
+class FingerprintStats:
+    __slots__ = ("statement", "count", "total", "max", "durations", "last_route")
+
+    def __init__(self, statement: str, sample_size: int):
+        self.statement = statement
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.durations: Deque[float] = deque(maxlen=sample_size)  # Most recent durations
+        self.last_route: Optional[str] = None
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.durations)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class SlowQueryLog:
+    """
+    Records statements slower than SLOW_QUERY_THRESHOLD_MS: a JSON line in
+    the slow-query log (see app/core/logging.py) with the parameter shapes
+    and the route, and per-fingerprint statistics kept in memory (per worker,
+    at most SLOW_QUERY_MAX_FINGERPRINTS, least frequent evicted first).
+
+    A sample of read-only statements is re-run with EXPLAIN (ANALYZE, BUFFERS)
+    on another pooled connection of the same engine, one at a time.
+    """
+    def __init__(self, *, max_fingerprints: int, sample_size: int = 1000):
+        self.max_fingerprints = max_fingerprints
+        self.sample_size = sample_size
+        self._stats: Dict[str, FingerprintStats] = {}
+        self._explaining = False
+        self._explain_task: Optional[asyncio.Task] = None  # Keeps the running EXPLAIN referenced
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        seconds: float,
+        *,
+        route: Optional[str],
+        engine: "AsyncEngine",
+    ) -> None:
+        key = fingerprint(statement)
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= self.max_fingerprints:
+                del self._stats[min(self._stats, key=lambda k: self._stats[k].count)]
+            stats = self._stats[key] = FingerprintStats(normalize(statement), self.sample_size)
+        stats.count += 1
+        stats.total += seconds
+        stats.max = max(stats.max, seconds)
+        stats.durations.append(seconds)
+        stats.last_route = route
+        metrics.DB_SLOW_QUERIES.labels(route=route or "none").inc()
+
+        entry = {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "fingerprint": key,
+            "duration_ms": round(seconds * 1000, 2),
+            "route": route,
+            "statement": stats.statement,
+            "parameters": parameter_shape(parameters),
+        }
+        logger.warning(f"Slow query ({entry['duration_ms']} ms) on {route}: {stats.statement[:200]}")
+
+        if (
+            not self._explaining
+            and is_read_only(statement)
+            and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        ):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:  # Not run from the event loop (sync scripts)
+                loop = None
+            if loop is not None:
+                self._explaining = True
+                self._explain_task = loop.create_task(self._explain(engine, statement, parameters, entry))
+                return
+        logger.bind(slow_query=True).info(json.dumps(entry, default=str))
+
+    async def _explain(self, engine: "AsyncEngine", statement: str, parameters: Any, entry: Dict[str, Any]) -> None:
+        try:
+            async with engine.connect() as connection:
+                await connection.execution_options(**{EXPLAIN_OPTION: True})
+                # Second guard after is_read_only: writes and nextval() fail
+                await connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+                await connection.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}"
+                )
+                result = await connection.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+                )
+                plan = result.scalar_one()
+                # asyncpg returns json values as text
+                entry["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+                # Never commit: the transaction of an EXPLAIN ANALYZE is rolled back
+                await connection.rollback()
+            metrics.DB_SLOW_QUERY_EXPLAINS.labels(result="ok").inc()
+        except (SQLAlchemyError, OSError) as exc:
+            entry["plan_error"] = str(exc)
+            metrics.DB_SLOW_QUERY_EXPLAINS.labels(result="error").inc()
+        finally:
+            self._explaining = False
+            logger.bind(slow_query=True).info(json.dumps(entry, default=str))
+
+    def slowest(self, limit: int) -> List[Dict[str, Any]]:
+        """Fingerprints with the highest total time first."""
+        ranked = sorted(self._stats.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+        return [
+            {
+                "fingerprint": key,
+                "statement": stats.statement,
+                "count": stats.count,
+                "total_ms": round(stats.total * 1000, 2),
+                "p50_ms": round(stats.percentile(0.50) * 1000, 2),
+                "p95_ms": round(stats.percentile(0.95) * 1000, 2),
+                "p99_ms": round(stats.percentile(0.99) * 1000, 2),
+                "max_ms": round(stats.max * 1000, 2),
+                "last_route": stats.last_route,
+            }
+            for key, stats in ranked
+        ]
+
+
+slow_query_log = SlowQueryLog(max_fingerprints=settings.SLOW_QUERY_MAX_FINGERPRINTS)
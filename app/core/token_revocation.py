@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+
+import asyncpg
+from loguru import logger
+
+from app.core.config import settings
+
+# Postgres channel on which token_version bumps are published
+# (see UserRepository.bump_token_versions). Payload: "user_id:version,..."
+TOKEN_VERSION_CHANNEL = "token_version"
+
+
+class TokenVersionMap:
+    """
+    In-memory map of users whose token_version was bumped (user id -> version).
+    Used in stateless mode to reject access tokens issued before a revocation
+    without querying the database. Only trusted while `ready` is True, i.e.
+    while the notification listener is connected and the snapshot is loaded.
+    """
+    def __init__(self) -> None:
+        self._versions: Dict[int, int] = {}
+        self.ready = False
+
+    def is_current(self, user_id: int, version: int) -> bool:
+        return version >= self._versions.get(user_id, 0)
+
+    def update(self, entries: Iterable[Tuple[int, int]]) -> None:
+        for user_id, version in entries:
+            if version > self._versions.get(user_id, 0):
+                self._versions[user_id] = version
+
+    def replace(self, entries: Iterable[Tuple[int, int]]) -> None:
+        self._versions = dict(entries)
+
+
+token_versions = TokenVersionMap()
+
+
+class RevokedTokenCache:
+    """
+    Negative cache of revoked refresh token ids (jti -> expiry timestamp).
+    Lets a worker reject a token it already saw revoked without a lookup;
+    the refresh_tokens table remains the source of truth. Bounded LRU,
+    entries are dropped lazily once the token would have expired anyway.
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._revoked: "OrderedDict[str, float]" = OrderedDict()
+
+    def add(self, token_id: str, expires_at: float) -> None:
+        if self.max_size <= 0:
+            return
+        self._revoked[token_id] = expires_at
+        self._revoked.move_to_end(token_id)
+        while len(self._revoked) > self.max_size:
+            self._revoked.popitem(last=False)
+
+    def __contains__(self, token_id: str) -> bool:
+        expires_at = self._revoked.get(token_id)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._revoked[token_id]
+            return False
+        return True
+
+
+revoked_refresh_tokens = RevokedTokenCache(max_size=settings.REVOKED_TOKEN_CACHE_MAX_SIZE)
+
+
+def parse_payload(payload: str) -> list[Tuple[int, int]]:
+    entries = []
+    for item in payload.split(","):
+        user_id, _, version = item.partition(":")
+        if user_id and version:
+            entries.append((int(user_id), int(version)))
+    return entries
+
+
+async def listen_token_versions(retry_delay: float = 5.0) -> None:
+    """
+    Background task: loads the current token versions, then keeps the map up
+    to date through LISTEN/NOTIFY. Reconnects (and reloads the snapshot,
+    since notifications may have been missed) when the connection drops.
+    """
+    dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+    def on_notification(connection, pid, channel, payload) -> None:
+        token_versions.update(parse_payload(payload))
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(TOKEN_VERSION_CHANNEL, on_notification)
+            rows = await connection.fetch(
+                "SELECT id, token_version FROM users WHERE token_version > 0"
+            )
+            token_versions.replace((row["id"], row["token_version"]) for row in rows)
+            token_versions.ready = True
+            await closed.wait()
+        except (OSError, asyncpg.PostgresError) as exc:
+            logger.warning(f"Token version listener disconnected: {exc}")
+        finally:
+            token_versions.ready = False
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(retry_delay)
@@ -1,7 +1,7 @@
 import uuid as uuid_pkg
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
-from sqlalchemy import MetaData, Uuid
+from sqlalchemy import MetaData, Uuid, inspect
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -21,7 +21,19 @@ class Base(DeclarativeBase):
 
     def dict(self) -> dict[str, Any]:
         """Dictionary representation of the model"""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        # Mapper attributes (not __table__) so that joined-inheritance
+        # subclasses also expose the columns of their parent table
+        return {attr.key: getattr(self, attr.key) for attr in inspect(self).mapper.column_attrs}
+
+
+def naive_utc(value: datetime) -> datetime:
+    """
+    Value for a naive DateTime column (the schema stores UTC without offset):
+    aware datetimes are converted to UTC, naive ones are taken as UTC already.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 class TimestampMixin:
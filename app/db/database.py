@@ -1,18 +1,85 @@
+import time
 from typing import AsyncGenerator, cast
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core import metrics
+from app.core.query_stats import instrument_engine
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool reporting how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.DB_POOL_CHECKOUT_SECONDS.labels(pool=self._metrics_name).observe(
+                time.perf_counter() - started_at
+            )
+
+
+def create_engine(url: str, *, name: str) -> AsyncEngine:
+    """
+    Builds an engine with the pool settings from Settings and registers its
+    pool metrics under `name`.
+
+    DB_POOL_PRE_PING: "always" pings on every checkout (SQLAlchemy's
+    pool_pre_ping), "never" does not ping, "idle" only pings connections idle
+    for more than DB_POOL_PRE_PING_IDLE_SECONDS.
+    """
+    pool_class = type(f"InstrumentedQueuePool_{name}", (InstrumentedQueuePool,), {"_metrics_name": name})
+    statement_cache_size = settings.DB_STATEMENT_CACHE_SIZE
+    async_engine = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        future=True,
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING == "always",
+        connect_args={
+            # SQLAlchemy's prepared statement LRU, and asyncpg's own cache
+            # (0 disables both, e.g. behind PgBouncer in transaction mode)
+            "prepared_statement_cache_size": statement_cache_size,
+            "statement_cache_size": statement_cache_size,
+        },
+    )
+    instrument_engine(async_engine)
+    sync_engine = async_engine.sync_engine
+
+    if settings.DB_POOL_PRE_PING == "idle":
+        @event.listens_for(sync_engine, "checkin")
+        def _record_checkin(dbapi_connection, connection_record) -> None:
+            connection_record.info["checked_in_at"] = time.monotonic()
+
+        @event.listens_for(sync_engine, "checkout")
+        def _ping_if_idle(dbapi_connection, connection_record, connection_proxy) -> None:
+            checked_in_at = connection_record.info.get("checked_in_at")
+            if checked_in_at is None or time.monotonic() - checked_in_at < settings.DB_POOL_PRE_PING_IDLE_SECONDS:
+                return
+            try:
+                sync_engine.dialect.do_ping(dbapi_connection)
+            except Exception as exc:
+                # The pool discards this connection and retries with a new one
+                raise DisconnectionError() from exc
+
+    pool = cast(AsyncAdaptedQueuePool, sync_engine.pool)
+    metrics.DB_POOL_IN_USE.labels(pool=name).set_function(pool.checkedout)
+    metrics.DB_POOL_OVERFLOW.labels(pool=name).set_function(lambda: max(pool.overflow(), 0))
+    metrics.DB_POOL_SIZE.labels(pool=name).set_function(pool.size)
+    return async_engine
+
 
 # Create Async Engine
 # echo=True allows seeing generated SQL queries in logs (useful for debugging)
-engine = create_async_engine(
-    cast(str, settings.DATABASE_URL),
-    echo=settings.DEBUG,
-    future=True,
-    pool_pre_ping=True,  # Check connection validity before using it
-    pool_size=10,        # Maximum number of connections in the pool
-    max_overflow=20      # Maximum number of connections to create beyond pool_size
-)
+engine = create_engine(cast(str, settings.DATABASE_URL), name="primary")
 
 # Create Session Factory
 AsyncSessionLocal = async_sessionmaker(
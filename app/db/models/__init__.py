@@ -7,6 +7,7 @@ from app.db.models.acte_medical import ActeMedical
 from app.db.models.audit_log import AuditLog
 from app.db.models.refresh_token import RefreshToken
 from app.db.models.role import Role, Permission, user_roles, role_permissions
+from app.db.models.login_rate_limit import login_rate_limits
 
 __all__ = [
     "User",
@@ -26,4 +27,5 @@ __all__ = [
     "Permission",
     "user_roles",
     "role_permissions",
+    "login_rate_limits",
 ]
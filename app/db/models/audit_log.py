@@ -1,5 +1,7 @@
+import uuid as uuid_pkg
 from typing import Optional, Any, TYPE_CHECKING
-from sqlalchemy import String, ForeignKey, JSON
+from sqlalchemy import String, ForeignKey, Index, PrimaryKeyConstraint, Uuid
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDMixin
@@ -13,23 +15,44 @@ class AuditLog(Base, TimestampMixin, UUIDMixin):
     Tracks all critical actions in the system for security and traceability.
     """
     __tablename__ = "audit_logs"
+    # Partitioned by month on created_at (see app/repositories/audit_log.py).
+    # Unique constraints must include the partition key, hence the composite
+    # primary key; ids still come from a single sequence and identify a row.
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at"),
+        Index("ix_audit_logs_resource_created_at", "resource_type", "resource_id", "created_at"),
+        Index("ix_audit_logs_user_id_created_at", "user_id", "created_at"),
+        Index("ix_audit_logs_changes", "changes", postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(autoincrement=True)
+    # Not unique on its own: a unique index would have to include created_at
+    uuid: Mapped[uuid_pkg.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        default=uuid_pkg.uuid4,
+        index=True,
+        nullable=False,
+        comment="Identifiant public unique (UUID)"
+    )
     
     # Actor
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     ip_address: Mapped[Optional[str]] = mapped_column(String(45), nullable=True) # IPv6 ready
     
     # Action
     action: Mapped[str] = mapped_column(String(50), nullable=False, index=True) # CREATE, UPDATE, DELETE, LOGIN, etc.
-    resource_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True) # ActeMedical, User, etc.
+    resource_type: Mapped[str] = mapped_column(String(50), nullable=False) # ActeMedical, User, etc.
     resource_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True) # ID of the affected resource
     
-    # Data Changes (using JSONB in Postgres for efficiency)
-    changes: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    # Data Changes: {"Model:id": {"column": [before, after]}} (see app/core/audit.py)
+    changes: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
     
     # Relationships
     user: Mapped["User"] = relationship("User")
 
+    # The ORM identity stays the id alone, so db.get(AuditLog, id) keeps working
+    __mapper_args__ = {"primary_key": [id]}
+
     def __repr__(self):
         return f"<AuditLog {self.action} on {self.resource_type} by {self.user_id}>"
@@ -0,0 +1,15 @@
+from sqlalchemy import Boolean, Column, DateTime, Float, String, Table
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+# Shared token buckets of the login rate limiter (LOGIN_RATE_LIMIT_BACKEND=postgres).
+# Written with raw upserts by app/core/rate_limit.py, never through the ORM.
+login_rate_limits = Table(
+    "login_rate_limits",
+    Base.metadata,
+    Column("key", String(320), primary_key=True),
+    Column("tokens", Float, nullable=False),
+    Column("allowed", Boolean, nullable=False),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False, index=True),
+)
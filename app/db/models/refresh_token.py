@@ -1,6 +1,7 @@
+import uuid as uuid_pkg
 from datetime import datetime
-from typing import TYPE_CHECKING
-from sqlalchemy import String, ForeignKey, DateTime
+from typing import Optional, TYPE_CHECKING
+from sqlalchemy import String, ForeignKey, DateTime, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDMixin
@@ -12,13 +13,20 @@ class RefreshToken(Base, TimestampMixin, UUIDMixin):
     """
     Refresh Token.
     Used to obtain new access tokens without re-login.
+    Only the SHA-256 of the token is stored; `uuid` is the token's `jti` claim.
+    Tokens are rotated on every use: all tokens descending from one login
+    share a `family_id`, which is revoked as a whole when a rotated token is reused.
     """
     __tablename__ = "refresh_tokens"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    token: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    revoked_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    token: Mapped[str] = mapped_column(
+        String(255), unique=True, index=True, nullable=False, comment="SHA-256 du refresh token",
+        info={"audit_redacted": True},
+    )
+    family_id: Mapped[uuid_pkg.UUID] = mapped_column(Uuid(as_uuid=True), nullable=False, index=True, comment="Lignée de rotation (une par connexion)")
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     
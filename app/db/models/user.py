@@ -1,5 +1,5 @@
 from typing import Optional, List, TYPE_CHECKING
-from sqlalchemy import String, Boolean, ForeignKey
+from sqlalchemy import String, Boolean, ForeignKey, Index, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDMixin
@@ -24,10 +24,14 @@ class User(Base, TimestampMixin, UUIDMixin):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     username: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
-    password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
+    password_hash: Mapped[str] = mapped_column(String(255), nullable=False, info={"audit_redacted": True})
     nom: Mapped[str] = mapped_column(String(100), nullable=False)
     prenom: Mapped[str] = mapped_column(String(100), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default="true", index=True)
+    token_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False,
+        comment="Incrémenté à chaque révocation des tokens (désactivation, mot de passe, rôles)"
+    )
     
     # Discriminator column for polymorphism
     type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
@@ -44,6 +48,11 @@ class User(Base, TimestampMixin, UUIDMixin):
         return f"<User {self.email} ({self.type})>"
 
 
+# Case-insensitive login lookup (see UserRepository.get_credentials)
+Index("ix_users_lower_email", func.lower(User.email))
+Index("ix_users_lower_username", func.lower(User.username))
+
+
 class Administrateur(User):
     """
     Administrator model.
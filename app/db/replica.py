@@ -0,0 +1,141 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core import metrics
+from app.db.database import AsyncSessionLocal, create_engine
+
+# Optional read replica (READ_REPLICA_HOST); None when not configured
+read_engine = (
+    create_engine(settings.READ_REPLICA_DATABASE_URL, name="replica")
+    if settings.READ_REPLICA_DATABASE_URL
+    else None
+)
+
+ReadSessionLocal = (
+    async_sessionmaker(
+        bind=read_engine,
+        class_=AsyncSession,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    if read_engine is not None
+    else None
+)
+
+# Replay delay of a standby; 0 when it replayed everything it received,
+# and on a primary (e.g. the same instance used under a second role)
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+             OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+# Cookie carrying the time (epoch seconds) until which the client's reads
+# stay on the primary: set on its writes, it reaches every worker
+READ_YOUR_WRITES_COOKIE = "visiomed_primary_until"
+
+
+class ReadReplicaRouter:
+    """
+    Chooses the session factory of read-only endpoints. Reads go to the
+    replica unless:
+    - the client wrote less than `sticky_seconds` ago (read-your-writes),
+    - the last lag check failed or measured more than `max_lag` seconds.
+    A write is marked before its response is sent, in a cookie the client
+    sends back to any worker. Clients that do not keep cookies fall back on
+    the recent writers of this worker, a bounded LRU by user.
+    """
+    def __init__(self, *, sticky_seconds: float, max_lag: float, max_users: int = 10_000):
+        self.sticky_seconds = sticky_seconds
+        self.max_lag = max_lag
+        self.max_users = max_users
+        self.lag: Optional[float] = None  # Unknown until the first check
+        self._recent_writers: "OrderedDict[int, float]" = OrderedDict()
+
+    def mark_write(self, user_id: Optional[int] = None) -> Optional[str]:
+        """
+        Records a write; returns the Set-Cookie value keeping the client on
+        the primary, None without a replica.
+        """
+        if ReadSessionLocal is None:
+            return None
+        until = time.time() + self.sticky_seconds
+        if user_id is not None:
+            self._recent_writers[user_id] = until
+            self._recent_writers.move_to_end(user_id)
+            while len(self._recent_writers) > self.max_users:
+                self._recent_writers.popitem(last=False)
+        return (
+            f"{READ_YOUR_WRITES_COOKIE}={until:.3f}; Max-Age={math.ceil(self.sticky_seconds)}; "
+            "Path=/; HttpOnly; SameSite=lax"
+        )
+
+    def _is_sticky(self, user_id: Optional[int], primary_until: Optional[str]) -> bool:
+        now = time.time()
+        if primary_until is not None:
+            try:
+                # Not signed: a client can only keep its own reads on the primary
+                if now < float(primary_until):
+                    return True
+            except ValueError:
+                pass
+        if user_id is None:
+            return False
+        until = self._recent_writers.get(user_id)
+        if until is None:
+            return False
+        if until <= now:
+            del self._recent_writers[user_id]
+            return False
+        return True
+
+    def session_factory(
+        self, user_id: Optional[int] = None, primary_until: Optional[str] = None
+    ) -> async_sessionmaker:
+        """`primary_until`: value of the READ_YOUR_WRITES_COOKIE sent by the client."""
+        if ReadSessionLocal is None:
+            return AsyncSessionLocal
+        if self._is_sticky(user_id, primary_until):
+            reason = "sticky"
+        elif self.lag is None or self.lag > self.max_lag:
+            reason = "lag"
+        else:
+            metrics.DB_READ_ROUTING.labels(target="replica", reason="ok").inc()
+            return ReadSessionLocal
+        metrics.DB_READ_ROUTING.labels(target="primary", reason=reason).inc()
+        return AsyncSessionLocal
+
+    async def run_lag_monitor(self) -> None:
+        """Background task started in the application lifespan (replica configured)."""
+        while True:
+            try:
+                async with read_engine.connect() as connection:
+                    self.lag = float((await connection.execute(_LAG_QUERY)).scalar_one())
+                metrics.DB_REPLICA_LAG_SECONDS.set(self.lag)
+            except (SQLAlchemyError, OSError) as exc:
+                if self.lag is not None:
+                    logger.warning(f"Read replica unavailable, reading from the primary: {exc}")
+                self.lag = None
+                metrics.DB_REPLICA_LAG_SECONDS.set(float("nan"))
+            await asyncio.sleep(settings.READ_REPLICA_LAG_CHECK_INTERVAL_SECONDS)
+
+
+read_router = ReadReplicaRouter(
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    max_lag=settings.READ_REPLICA_MAX_LAG_SECONDS,
+)
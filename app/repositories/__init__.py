@@ -7,6 +7,7 @@ from .type_prise_charge import type_prise_charge
 from .tarif import tarif
 from .acte_medical import acte_medical
 from .audit_log import audit_log
+from .refresh_token import refresh_token
 
 __all__ = [
     "BaseRepository",
@@ -19,4 +20,5 @@ __all__ = [
     "tarif",
     "acte_medical",
     "audit_log",
+    "refresh_token",
 ]
@@ -1,33 +1,97 @@
-from typing import List, Any, Optional, Union
-from sqlalchemy import select
+from typing import List, Any, Optional, Sequence, Union
+from sqlalchemy import ColumnElement, Row, Select, bindparam, select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.acte_medical import ActeMedical
+from app.db.models.acte_type import ActeType
+from app.db.models.type_prise_charge import TypePriseCharge
 from app.schemas.acte_medical import ActeMedicalCreate, ActeMedicalUpdate
 from app.repositories.base import BaseRepository
+from app.repositories.filters import EQUALITY, RANGE, FilterSpec, ListParams
+
+# Eager loads of the relations, shared by the pre-built and per-call queries
+_LOAD_OPTIONS = (
+    selectinload(ActeMedical.acte_type),
+    selectinload(ActeMedical.type_prise_charge),
+)
 
 class ActeMedicalRepository(BaseRepository[ActeMedical, ActeMedicalCreate, ActeMedicalUpdate]):
-    
+    filter_spec = FilterSpec(
+        ActeMedical.__table__,
+        filters={
+            "id": RANGE,
+            "date_acte": RANGE,
+            "statut": EQUALITY,
+            "acte_id": EQUALITY,
+            "medecin_id": EQUALITY,
+            "created_by_id": EQUALITY,
+            "numero_bc": EQUALITY,
+            "nom_patient": EQUALITY,
+            "prenom_patient": EQUALITY,
+        },
+        sort=["date_acte", "nom_patient"],
+    )
+
+    # Built once and reused: see UserRepository._get_statement
+    _get_statement = (
+        select(ActeMedical)
+        .options(*_LOAD_OPTIONS)
+        .where(ActeMedical.id == bindparam("id"))
+    )
+
     def _get_load_options(self):
         """Options de chargement eager pour les relations"""
-        return [
-            selectinload(ActeMedical.acte_type),
-            selectinload(ActeMedical.type_prise_charge)
-        ]
+        return _LOAD_OPTIONS
 
     async def get(self, db: AsyncSession, id: Any) -> Optional[ActeMedical]:
-        query = select(ActeMedical).options(*self._get_load_options()).where(ActeMedical.id == id)
-        result = await db.execute(query)
+        result = await db.execute(self._get_statement, {"id": id})
         return result.scalars().first()
 
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, params: Optional[ListParams] = None
     ) -> List[ActeMedical]:
-        query = select(ActeMedical).options(*self._get_load_options()).offset(skip).limit(limit)
+        query = select(ActeMedical).options(*self._get_load_options())
+        query = self.filter_spec.apply(query, params).offset(skip).limit(limit)
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    def _rows_query(self, columns: Sequence[ColumnElement[Any]]) -> Select:
+        """
+        select() of `columns` (of actes_medicaux, actes_types and
+        types_prise_charge), joining only the tables they belong to.
+        """
+        tables = {column.table for column in columns}
+        query = select(*columns).select_from(ActeMedical)
+        if ActeType.__table__ in tables:
+            query = query.outerjoin(ActeType, ActeType.id == ActeMedical.acte_id)
+        if TypePriseCharge.__table__ in tables:
+            query = query.outerjoin(TypePriseCharge, TypePriseCharge.id == ActeMedical.type_prise_charge_id)
+        return query
+
+    async def get_row(
+        self, db: AsyncSession, *, columns: Sequence[ColumnElement[Any]], id: int
+    ) -> Optional[Row[Any]]:
+        result = await db.execute(self._rows_query(columns).where(ActeMedical.id == id))
+        return result.first()
+
+    async def get_multi_rows(
+        self,
+        db: AsyncSession,
+        *,
+        columns: Sequence[ColumnElement[Any]],
+        skip: int = 0,
+        limit: int = 100,
+        params: Optional[ListParams] = None,
+    ) -> Sequence[Row[Any]]:
+        """
+        Same listing as get_multi, as plain rows of `columns` read in one
+        query with explicit joins (see _rows_query).
+        """
+        query = self.filter_spec.apply(self._rows_query(columns), params).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.all()
+
     async def create(self, db: AsyncSession, *, obj_in: ActeMedicalCreate) -> ActeMedical:
         # Création standard
         db_obj = await super().create(db, obj_in=obj_in)
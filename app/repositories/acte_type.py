@@ -1,8 +1,14 @@
 from app.db.models.acte_type import ActeType
 from app.schemas.acte_type import ActeTypeCreate, ActeTypeUpdate
 from app.repositories.base import BaseRepository
+from app.repositories.filters import EQUALITY, RANGE, FilterSpec
 
 class ActeTypeRepository(BaseRepository[ActeType, ActeTypeCreate, ActeTypeUpdate]):
-    pass
+    # service_id only comes second in uq_acte_type_code_service
+    filter_spec = FilterSpec(
+        ActeType.__table__,
+        filters={"id": RANGE, "code": EQUALITY},
+        sort=["code"],
+    )
 
 acte_type = ActeTypeRepository(ActeType)
@@ -1,9 +1,114 @@
+import re
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import RowMapping, Select, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.db.models.audit_log import AuditLog
 from app.schemas.audit_log import AuditLogCreate
 from app.repositories.base import BaseRepository
 
+# Monthly partitions are named audit_logs_y2026m10 (see the e5b9c3d7a184 migration)
+_PARTITION_NAME = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_logs_y{month.year}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """First day of the month held by a partition, None for other tables (e.g. the default partition)."""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
 # AuditLog usually doesn't need Update schema as logs are immutable
 class AuditLogRepository(BaseRepository[AuditLog, AuditLogCreate, AuditLogCreate]):
-    pass
+
+    def _filtered(
+        self,
+        query: Select,
+        *,
+        user_id: Optional[int] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        action: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> Select:
+        """
+        Newest first, keyset-paginated on (created_at, id). Equality filters
+        followed by the created_at range and order match the composite indexes
+        (user_id, created_at) and (resource_type, resource_id, created_at);
+        the time range also prunes partitions.
+        """
+        table = AuditLog.__table__
+        conditions: List[Any] = []
+        if user_id is not None:
+            conditions.append(table.c.user_id == user_id)
+        if resource_type is not None:
+            conditions.append(table.c.resource_type == resource_type)
+        if resource_id is not None:
+            conditions.append(table.c.resource_id == resource_id)
+        if action is not None:
+            conditions.append(table.c.action == action)
+        if start is not None:
+            conditions.append(table.c.created_at >= start)
+        if end is not None:
+            conditions.append(table.c.created_at < end)
+        if before is not None:
+            # The redundant bound keeps created_at usable as an index condition
+            conditions.append(table.c.created_at <= before[0])
+            conditions.append(tuple_(table.c.created_at, table.c.id) < tuple_(*before))
+        return query.where(*conditions).order_by(table.c.created_at.desc(), table.c.id.desc())
+
+    async def get_page(self, db: AsyncSession, *, limit: int, **filters: Any) -> List[AuditLog]:
+        query = self._filtered(select(AuditLog), **filters).limit(limit)
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    async def get_rows(self, db: AsyncSession, *, limit: int, **filters: Any) -> Sequence[RowMapping]:
+        """Same as get_page, as plain rows (no ORM objects), for exports."""
+        query = self._filtered(select(AuditLog.__table__), **filters).limit(limit)
+        result = await db.execute(query)
+        return result.mappings().all()
+
+    async def list_partitions(self, db: AsyncSession) -> List[str]:
+        query = text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'audit_logs'::regclass ORDER BY c.relname"
+        )
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    async def create_partition(self, db: AsyncSession, *, month: date) -> None:
+        """Creates the partition of a month if missing. Does not commit."""
+        # DDL takes no bind parameters; names and bounds are built from dates only
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        ))
+
+    async def detach_partition(self, db: AsyncSession, *, name: str, archive_schema: Optional[str]) -> None:
+        """
+        Detaches a partition, then drops it or moves it to archive_schema.
+        Metadata-only operations: the cost does not depend on the row count.
+        Does not commit.
+        """
+        if partition_month(name) is None:
+            raise ValueError(f"Not a monthly audit partition: {name}")
+        await db.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {name}"))
+        if archive_schema:
+            await db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+            await db.execute(text(f'ALTER TABLE {name} SET SCHEMA "{archive_schema}"'))
+        else:
+            await db.execute(text(f"DROP TABLE {name}"))
 
 audit_log = AuditLogRepository(AuditLog)
@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import Base
+from app.repositories.filters import RANGE, FilterSpec, ListParams, TotalCount
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -15,9 +16,17 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Base Repository with default CRUD operations.
+    Writes are flushed, never committed: the caller's unit of work commits
+    (see app/services/base.py).
+    Listings accept the filters and sort keys of `filter_spec` (by default,
+    the primary key only).
     """
+    filter_spec: Optional[FilterSpec] = None
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
+        if self.filter_spec is None:
+            self.filter_spec = FilterSpec(cast(Any, model).__table__, filters={"id": RANGE})
 
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         return await db.get(self.model, id)
@@ -29,17 +38,20 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return result.scalars().first()
 
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, params: Optional[ListParams] = None
     ) -> List[ModelType]:
-        query = select(self.model).offset(skip).limit(limit)
+        query = self.filter_spec.apply(select(self.model), params).offset(skip).limit(limit)
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    async def count(self, db: AsyncSession, *, params: Optional[ListParams] = None) -> TotalCount:
+        return await self.filter_spec.count(db, params)
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = obj_in.model_dump()
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_obj)
         return db_obj
 
@@ -61,7 +73,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, update_data[field])
         
         db.add(db_obj)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_obj)
         return db_obj
 
@@ -69,5 +81,5 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = await db.get(self.model, id)
         if obj:
             await db.delete(obj)
-            await db.commit()
+            await db.flush()
         return obj
@@ -0,0 +1,182 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Column, ColumnElement, DateTime, Select, Table, UniqueConstraint, func, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+from app.db.base import naive_utc
+
+# Operators usable on a btree index (no "ne": a btree cannot serve <>)
+EQUALITY: FrozenSet[str] = frozenset({"eq", "in", "isnull"})
+RANGE: FrozenSet[str] = EQUALITY | {"lt", "lte", "gt", "gte"}
+
+_OPERATORS: Dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "eq": lambda column, value: column == value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "in": lambda column, values: column.in_(values),
+    "isnull": lambda column, value: column.is_(None) if value else column.is_not(None),
+}
+
+MAX_IN_VALUES = 100
+
+
+@dataclass(frozen=True, slots=True)
+class ListParams:
+    """Filters, sort and count requested on a list endpoint (see deps.list_params)."""
+    filters: Tuple[str, ...] = ()  # "field:operator:value"
+    sort: Optional[str] = None  # "field,-other"
+    count: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class TotalCount:
+    value: int
+    estimated: bool  # Planner estimate rather than an exact count
+
+
+def indexed_columns(table: Table) -> Set[str]:
+    """Columns leading a btree index, primary key or unique constraint of `table`."""
+    columns: Set[str] = set()
+    primary_key = list(table.primary_key.columns)
+    if primary_key:
+        columns.add(primary_key[0].name)
+    for index in table.indexes:
+        # Expression indexes such as lower(email) do not serve plain comparisons
+        first = index.expressions[0] if index.expressions else None
+        if isinstance(first, Column) and index.dialect_options["postgresql"].get("using") in (None, "btree"):
+            columns.add(first.name)
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and len(constraint.columns):
+            columns.add(list(constraint.columns)[0].name)
+    columns.update(column.name for column in table.columns if column.index or column.unique)
+    return columns
+
+
+@dataclass
+class FilterSpec:
+    """
+    Whitelist of the filters (field -> operators) and sort keys accepted by
+    a repository's get_multi. Every field must lead an index of the table,
+    so that a client cannot request a sequential scan: this is checked when
+    the spec is declared and fails at import time.
+    """
+    table: Table
+    filters: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    sort: Sequence[str] = ()
+    default_sort: str = "id"
+
+    def __post_init__(self) -> None:
+        indexed = indexed_columns(self.table)
+        unindexed = (set(self.filters) | set(self.sort) | {self.default_sort.lstrip("-")}) - indexed
+        if unindexed:
+            raise ValueError(f"{self.table.name}: no index leads on {', '.join(sorted(unindexed))}")
+        self._adapters = {
+            name: TypeAdapter(self.table.c[name].type.python_type) for name in self.filters
+        }
+        # Naive DateTime columns store UTC: aware filter values are converted
+        self._naive_datetimes = {
+            name for name in self.filters
+            if isinstance(self.table.c[name].type, DateTime) and not self.table.c[name].type.timezone
+        }
+
+    def conditions(self, params: Optional[ListParams]) -> List[ColumnElement[bool]]:
+        if params is None:
+            return []
+        return [self._condition(expression) for expression in params.filters]
+
+    def _condition(self, expression: str) -> ColumnElement[bool]:
+        name, _, rest = expression.partition(":")
+        operator, _, raw = rest.partition(":")
+        if name not in self.filters:
+            allowed = ", ".join(sorted(self.filters)) or "aucun"
+            raise BadRequestException(f"Filtre non autorisé sur '{name}' (champs filtrables : {allowed}).")
+        if operator not in self.filters[name]:
+            allowed = ", ".join(sorted(self.filters[name]))
+            raise BadRequestException(f"Opérateur '{operator}' non autorisé sur '{name}' ({allowed}).")
+        column = self.table.c[name]
+        try:
+            if operator == "isnull":
+                value: Any = TypeAdapter(bool).validate_python(raw)
+            elif operator == "in":
+                values = raw.split(",")
+                if len(values) > MAX_IN_VALUES:
+                    raise BadRequestException(f"Au plus {MAX_IN_VALUES} valeurs pour l'opérateur 'in'.")
+                value = [self._adapters[name].validate_python(item) for item in values]
+            else:
+                value = self._adapters[name].validate_python(raw)
+        except ValidationError:
+            raise BadRequestException(f"Valeur invalide pour le filtre '{name}' : '{raw}'.")
+        if name in self._naive_datetimes and operator != "isnull":
+            value = [naive_utc(item) for item in value] if operator == "in" else naive_utc(value)
+        return _OPERATORS[operator](column, value)
+
+    def order_by(self, params: Optional[ListParams]) -> List[ColumnElement[Any]]:
+        keys = params.sort.split(",") if params is not None and params.sort else [self.default_sort]
+        clauses: List[ColumnElement[Any]] = []
+        seen: Set[str] = set()
+        for key in keys:
+            name = key.strip().lstrip("-")
+            if name not in self.sort and name != self.default_sort.lstrip("-"):
+                allowed = ", ".join(sorted(set(self.sort) | {self.default_sort.lstrip("-")}))
+                raise BadRequestException(f"Tri non autorisé sur '{name}' (clés de tri : {allowed}).")
+            column = self.table.c[name]
+            clauses.append(column.desc() if key.strip().startswith("-") else column.asc())
+            seen.add(name)
+        # Primary key as tie-breaker: stable pages with skip/limit
+        for column in self.table.primary_key.columns:
+            if column.name not in seen:
+                clauses.append(column.asc())
+        return clauses
+
+    def apply(self, query: Select, params: Optional[ListParams]) -> Select:
+        return query.where(*self.conditions(params)).order_by(*self.order_by(params))
+
+    async def count(self, db: AsyncSession, params: Optional[ListParams]) -> TotalCount:
+        """
+        Total of a listing. Without filters, a table larger than
+        LIST_COUNT_EXACT_MAX rows (pg_class.reltuples) gets the statistics
+        estimate instead of a full count. Selective filters get an exact
+        count, bounded to LIST_COUNT_EXACT_MAX + 1 rows; past that, the
+        planner's row estimate is returned.
+        """
+        conditions = self.conditions(params)
+        exact_max = settings.LIST_COUNT_EXACT_MAX
+        if not conditions:
+            estimate = (
+                await db.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:name AS regclass)"),
+                    {"name": self.table.name},
+                )
+            ).scalar_one()
+            # -1: never analyzed
+            if estimate >= exact_max:
+                return TotalCount(int(estimate), estimated=True)
+            total = (await db.execute(select(func.count()).select_from(self.table))).scalar_one()
+            return TotalCount(total, estimated=False)
+
+        matching = select(literal(1)).select_from(self.table).where(*conditions)
+        bounded = (
+            await db.execute(select(func.count()).select_from(matching.limit(exact_max + 1).subquery()))
+        ).scalar_one()
+        if bounded <= exact_max:
+            return TotalCount(bounded, estimated=False)
+        return TotalCount(max(await _planner_rows(db, matching), bounded), estimated=True)
+
+
+async def _planner_rows(db: AsyncSession, query: Select) -> int:
+    # Sent as is with its bound values: neither inlined nor re-parsed by text()
+    connection = await db.connection()
+    compiled = query.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    values = compiled.construct_params()
+    parameters = tuple(values[name] for name in compiled.positiontup)
+    plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", parameters)).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.refresh_token import RefreshToken
+from app.schemas.refresh_token import RefreshTokenCreate
+from app.repositories.base import BaseRepository
+
+# Refresh tokens are never updated through a schema, only revoked
+class RefreshTokenRepository(BaseRepository[RefreshToken, RefreshTokenCreate, RefreshTokenCreate]):
+
+    async def get_by_hash_for_update(self, db: AsyncSession, *, token_hash: str) -> Optional[RefreshToken]:
+        """
+        Locks the row so that two concurrent refreshes of the same token
+        cannot both rotate it.
+        """
+        query = select(RefreshToken).where(RefreshToken.token == token_hash).with_for_update()
+        result = await db.execute(query)
+        return result.scalars().first()
+
+    async def revoke_family(self, db: AsyncSession, *, family_id: UUID, now: datetime) -> list[UUID]:
+        """Revokes every live token of a rotation family. Returns their jti. Does not commit."""
+        query = (
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .returning(RefreshToken.uuid)
+        )
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    async def revoke_for_user(self, db: AsyncSession, *, user_id: int, now: datetime) -> list[UUID]:
+        """Revokes every live token of a user. Returns their jti. Does not commit."""
+        query = (
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .returning(RefreshToken.uuid)
+        )
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    async def delete_expired_batch(self, db: AsyncSession, *, now: datetime, batch_size: int) -> int:
+        """
+        Deletes at most batch_size expired tokens (served by the expires_at
+        index). Does not commit. Returns the number of deleted rows.
+        """
+        expired_ids = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < now)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(delete(RefreshToken).where(RefreshToken.id.in_(expired_ids)))
+        return result.rowcount or 0
+
+refresh_token = RefreshTokenRepository(RefreshToken)
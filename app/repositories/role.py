@@ -1,16 +1,21 @@
-from typing import Any, Optional, Union
+from typing import Any, List, Optional, Union
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.role import Role, Permission
 from app.schemas.role import RoleCreate, RoleUpdate, PermissionCreate, PermissionUpdate
 from app.repositories.base import BaseRepository
+from app.repositories.filters import EQUALITY, RANGE, FilterSpec
 
 class PermissionRepository(BaseRepository[Permission, PermissionCreate, PermissionUpdate]):
-    pass
+
+    async def get_slugs(self, db: AsyncSession) -> List[str]:
+        result = await db.execute(select(Permission.slug).order_by(Permission.id))
+        return list(result.scalars().all())
 
 class RoleRepository(BaseRepository[Role, RoleCreate, RoleUpdate]):
-    
+    filter_spec = FilterSpec(Role.__table__, filters={"id": RANGE, "name": EQUALITY}, sort=["name"])
+
     async def create(self, db: AsyncSession, *, obj_in: RoleCreate) -> Role:
         # Extract permissions IDs
         permissions_ids = obj_in.permissions
@@ -25,7 +30,7 @@ class RoleRepository(BaseRepository[Role, RoleCreate, RoleUpdate]):
             db_obj.permissions = list(permissions)
             
         db.add(db_obj)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_obj)
         return db_obj
 
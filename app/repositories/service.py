@@ -1,8 +1,13 @@
 from app.db.models.service import Service
 from app.schemas.service import ServiceCreate, ServiceUpdate
 from app.repositories.base import BaseRepository
+from app.repositories.filters import EQUALITY, RANGE, FilterSpec
 
 class ServiceRepository(BaseRepository[Service, ServiceCreate, ServiceUpdate]):
-    pass
+    filter_spec = FilterSpec(
+        Service.__table__,
+        filters={"id": RANGE, "code": EQUALITY},
+        sort=["code"],
+    )
 
 service = ServiceRepository(Service)
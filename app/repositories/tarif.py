@@ -1,14 +1,40 @@
 from typing import Optional
 from datetime import date
-from sqlalchemy import select, and_, or_
+from sqlalchemy import bindparam, select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.tarif import Tarif
 from app.schemas.tarif import TarifCreate, TarifUpdate
 from app.repositories.base import BaseRepository
+from app.repositories.filters import EQUALITY, RANGE, FilterSpec
 
 class TarifRepository(BaseRepository[Tarif, TarifCreate, TarifUpdate]):
-    
+    filter_spec = FilterSpec(
+        Tarif.__table__,
+        filters={
+            "id": RANGE,
+            "service_id": EQUALITY,
+            "acte_id": EQUALITY,
+            "type_prise_charge_id": EQUALITY,
+            "date_debut": RANGE,
+        },
+        sort=["date_debut"],
+    )
+
+    # Built once and reused: see UserRepository._get_statement
+    _active_tarif_statement = select(Tarif).where(
+        and_(
+            Tarif.service_id == bindparam("service_id"),
+            Tarif.acte_id == bindparam("acte_id"),
+            Tarif.type_prise_charge_id == bindparam("type_prise_charge_id"),
+            Tarif.date_debut <= bindparam("date_ref"),
+            or_(
+                Tarif.date_fin.is_(None),
+                Tarif.date_fin >= bindparam("date_ref")
+            )
+        )
+    ).order_by(Tarif.date_debut.desc()).limit(1)
+
     async def get_active_tarif(
         self, 
         db: AsyncSession, 
@@ -16,25 +42,21 @@ class TarifRepository(BaseRepository[Tarif, TarifCreate, TarifUpdate]):
         service_id: int, 
         acte_id: int, 
         type_prise_charge_id: int,
-        date_ref: date = date.today()
+        date_ref: Optional[date] = None
     ) -> Optional[Tarif]:
         """
-        Get the active tariff for a specific combination on a given date.
+        Get the active tariff for a specific combination on a given date
+        (today by default).
         """
-        query = select(Tarif).where(
-            and_(
-                Tarif.service_id == service_id,
-                Tarif.acte_id == acte_id,
-                Tarif.type_prise_charge_id == type_prise_charge_id,
-                Tarif.date_debut <= date_ref,
-                or_(
-                    Tarif.date_fin.is_(None),
-                    Tarif.date_fin >= date_ref
-                )
-            )
-        ).order_by(Tarif.date_debut.desc())
-        
-        result = await db.execute(query)
+        result = await db.execute(
+            self._active_tarif_statement,
+            {
+                "service_id": service_id,
+                "acte_id": acte_id,
+                "type_prise_charge_id": type_prise_charge_id,
+                "date_ref": date_ref or date.today(),
+            },
+        )
         return result.scalars().first()
 
 tarif = TarifRepository(Tarif)
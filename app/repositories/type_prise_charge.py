@@ -1,8 +1,13 @@
 from app.db.models.type_prise_charge import TypePriseCharge
 from app.schemas.type_prise_charge import TypePriseChargeCreate, TypePriseChargeUpdate
 from app.repositories.base import BaseRepository
+from app.repositories.filters import EQUALITY, RANGE, FilterSpec
 
 class TypePriseChargeRepository(BaseRepository[TypePriseCharge, TypePriseChargeCreate, TypePriseChargeUpdate]):
-    pass
+    filter_spec = FilterSpec(
+        TypePriseCharge.__table__,
+        filters={"id": RANGE, "code": EQUALITY},
+        sort=["code"],
+    )
 
 type_prise_charge = TypePriseChargeRepository(TypePriseCharge)
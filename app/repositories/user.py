@@ -1,30 +1,56 @@
-from typing import Optional, List, Any
+from typing import Dict, Optional, List, Any
 
-from sqlalchemy import select
+from sqlalchemy import Row, bindparam, case, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectin_polymorphic
 
+from app.core.token_revocation import TOKEN_VERSION_CHANNEL
+from app.db.models.role import role_permissions, user_roles
 from app.db.models.user import User, Medecin, Secretaire, Visualiseur, Administrateur
 from app.repositories.base import BaseRepository, CreateSchemaType, UpdateSchemaType
+from app.repositories.filters import EQUALITY, RANGE, FilterSpec, ListParams
+
+
+# Loads the subclass columns, shared by the pre-built and per-call queries
+_POLYMORPHIC_OPTIONS = selectin_polymorphic(User, [Medecin, Secretaire, Visualiseur, Administrateur])
 
 
 class UserRepository(BaseRepository[User, CreateSchemaType, UpdateSchemaType]):
     """
     User specific repository operations.
     """
+    filter_spec = FilterSpec(
+        User.__table__,
+        filters={
+            "id": RANGE,
+            "type": EQUALITY,
+            "is_active": EQUALITY,
+            "username": EQUALITY,
+            "email": EQUALITY,
+        },
+        sort=["username", "email"],
+    )
+
+    # Built once: the statement memoizes its compiled-cache key, so calls
+    # only bind `id` (hot path of the principal cache misses)
+    _get_statement = (
+        select(User)
+        .options(_POLYMORPHIC_OPTIONS)
+        .where(User.id == bindparam("id"))
+    )
 
     def _get_polymorphic_options(self):
-        return selectin_polymorphic(User, [Medecin, Secretaire, Visualiseur, Administrateur])
+        return _POLYMORPHIC_OPTIONS
 
     async def get(self, db: AsyncSession, id: Any) -> Optional[User]:
-        query = select(User).options(self._get_polymorphic_options()).where(User.id == id)
-        result = await db.execute(query)
+        result = await db.execute(self._get_statement, {"id": id})
         return result.scalars().first()
 
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, params: Optional[ListParams] = None
     ) -> List[User]:
-        query = select(User).options(self._get_polymorphic_options()).offset(skip).limit(limit)
+        query = select(User).options(self._get_polymorphic_options())
+        query = self.filter_spec.apply(query, params).offset(skip).limit(limit)
         result = await db.execute(query)
         return list(result.scalars().all())
     
@@ -38,6 +64,26 @@ class UserRepository(BaseRepository[User, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(query)
         return result.scalars().first()
 
+    async def get_credentials(
+        self, db: AsyncSession, *, identifier: str
+    ) -> Optional[Row[Any]]:
+        """
+        Find the (id, password_hash, is_active) of a user by email OR username,
+        case-insensitively, in a single query served by the lower() indexes.
+        An email match wins over a username match.
+        Does not load the polymorphic user nor its roles.
+        """
+        identifier = identifier.lower()
+        email_match = func.lower(User.email) == identifier
+        query = (
+            select(User.id, User.password_hash, User.is_active)
+            .where(or_(email_match, func.lower(User.username) == identifier))
+            .order_by(case((email_match, 0), else_=1), User.id)
+            .limit(1)
+        )
+        result = await db.execute(query)
+        return result.first()
+
     async def authenticate(
         self, db: AsyncSession, *, identifier: str
     ) -> Optional[User]:
@@ -45,13 +91,53 @@ class UserRepository(BaseRepository[User, CreateSchemaType, UpdateSchemaType]):
         Find user by email OR username.
         Does not verify password here (done in Service layer).
         """
-        # Try by email first
-        user = await self.get_by_email(db, email=identifier)
-        if user:
-            return user
-            
-        # Try by username
-        return await self.get_by_username(db, username=identifier)
+        credentials = await self.get_credentials(db, identifier=identifier)
+        if credentials is None:
+            return None
+        return await self.get(db, credentials.id)
+
+    async def bump_token_versions(
+        self,
+        db: AsyncSession,
+        *,
+        user_ids: Optional[List[int]] = None,
+        role_id: Optional[int] = None,
+        permission_id: Optional[int] = None,
+    ) -> Dict[int, int]:
+        """
+        Increments token_version of the given users (or of every user holding
+        role_id, or a role granting permission_id) and publishes the new
+        versions on TOKEN_VERSION_CHANNEL.
+        Does not commit: the notifications are delivered when the caller commits.
+        """
+        query = update(User).values(token_version=User.token_version + 1)
+        if user_ids is not None:
+            query = query.where(User.id.in_(user_ids))
+        if role_id is not None:
+            query = query.where(
+                User.id.in_(select(user_roles.c.user_id).where(user_roles.c.role_id == role_id))
+            )
+        if permission_id is not None:
+            query = query.where(
+                User.id.in_(
+                    select(user_roles.c.user_id)
+                    .join(role_permissions, role_permissions.c.role_id == user_roles.c.role_id)
+                    .where(role_permissions.c.permission_id == permission_id)
+                )
+            )
+        # No in-session synchronization: it would expire updated_at (onupdate)
+        # on loaded users, whose next attribute access then needs a lazy load
+        query = query.returning(User.id, User.token_version).execution_options(synchronize_session=False)
+        result = await db.execute(query)
+        versions = {row.id: row.token_version for row in result.all()}
+
+        # NOTIFY payloads are limited to 8000 bytes: publish in chunks
+        entries = [f"{user_id}:{version}" for user_id, version in versions.items()]
+        for start in range(0, len(entries), 500):
+            await db.execute(
+                select(func.pg_notify(TOKEN_VERSION_CHANNEL, ",".join(entries[start:start + 500])))
+            )
+        return versions
 
 
 user: UserRepository = UserRepository(User)
@@ -6,8 +6,10 @@ from .acte_type import ActeTypeBase, ActeTypeCreate, ActeTypeUpdate, ActeTypeRes
 from .type_prise_charge import TypePriseChargeBase, TypePriseChargeCreate, TypePriseChargeUpdate, TypePriseChargeResponse
 from .tarif import TarifBase, TarifCreate, TarifUpdate, TarifResponse
 from .acte_medical import ActeMedicalBase, ActeMedicalCreate, ActeMedicalUpdate, ActeMedicalResponse
-from .audit_log import AuditLogBase, AuditLogCreate, AuditLogResponse
+from .audit_log import AuditLogBase, AuditLogCreate, AuditLogResponse, AuditLogPage
 from .report import FinancialSummaryResponse
+from .refresh_token import RefreshTokenCreate
+from .monitoring import SlowQueryStat
 
 __all__ = [
     "UserBase",
@@ -47,5 +49,8 @@ __all__ = [
     "AuditLogBase",
     "AuditLogCreate",
     "AuditLogResponse",
+    "AuditLogPage",
     "FinancialSummaryResponse",
+    "RefreshTokenCreate",
+    "SlowQueryStat",
 ]
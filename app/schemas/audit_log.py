@@ -1,4 +1,4 @@
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 from pydantic import BaseModel, ConfigDict
 import uuid as uuid_pkg
 from datetime import datetime
@@ -21,3 +21,7 @@ class AuditLogResponse(AuditLogBase):
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+class AuditLogPage(BaseModel):
+    items: List[AuditLogResponse]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to get the next (older) page
@@ -0,0 +1,13 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class SlowQueryStat(BaseModel):
+    fingerprint: str
+    statement: str  # Literals replaced by "?", never parameter values
+    count: int
+    total_ms: float
+    p50_ms: float  # Percentiles over the most recent executions
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    last_route: Optional[str] = None
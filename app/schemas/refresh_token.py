@@ -0,0 +1,10 @@
+from datetime import datetime
+from pydantic import BaseModel
+import uuid as uuid_pkg
+
+class RefreshTokenCreate(BaseModel):
+    uuid: uuid_pkg.UUID  # jti claim of the token
+    token: str  # SHA-256 of the token, never the token itself
+    family_id: uuid_pkg.UUID
+    user_id: int
+    expires_at: datetime
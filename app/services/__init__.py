@@ -10,6 +10,7 @@ from .acte_medical import acte_medical_service as acte_medical_service
 from .audit_log import audit_log_service as audit_log_service
 from .report import report_service as report_service
 from .export import export_service as export_service
+from .refresh_token import refresh_token_service as refresh_token_service
 
 __all__ = [
     "BaseService",
@@ -25,4 +26,5 @@ __all__ = [
     "audit_log_service",
     "report_service",
     "export_service",
+    "refresh_token_service",
 ]
@@ -1,14 +1,135 @@
-from typing import List
+from functools import lru_cache
+from typing import Any, List, Optional, Union
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.compression import PAYLOAD_CACHE_CHANNEL, payload_cache
+from app.core.exceptions import BadRequestException
+from app.core.json_rows import JsonRowTemplate
 from app.db.models.acte_medical import ActeMedical
-from app.schemas.acte_medical import ActeMedicalCreate, ActeMedicalUpdate
+from app.db.models.acte_type import ActeType
+from app.db.models.type_prise_charge import TypePriseCharge
+from app.schemas.acte_medical import ActeMedicalCreate, ActeMedicalUpdate, ActeMedicalResponse
+from app.schemas.acte_type import ActeTypeResponse
+from app.schemas.type_prise_charge import TypePriseChargeResponse
+from app.repositories.filters import ListParams
 from app.repositories.acte_medical import ActeMedicalRepository
-from app.services.base import BaseService
+from app.services.base import BaseService, UnitOfWork, after_commit
 from app.repositories import acte_medical as acte_medical_repo
 
+# Relationships of ActeMedicalResponse that ?embed= may request
+EMBEDDABLE = {
+    "acte_type": JsonRowTemplate(ActeTypeResponse, ActeType.__table__),
+    "type_prise_charge": JsonRowTemplate(TypePriseChargeResponse, TypePriseCharge.__table__),
+}
+
+# ActeMedicalResponse with its nested acte type and coverage type
+RESPONSE_TEMPLATE = JsonRowTemplate(ActeMedicalResponse, ActeMedical.__table__, nested=EMBEDDABLE)
+
+
+def _names(value: str, allowed: List[str], label: str) -> List[str]:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(allowed))
+    if unknown:
+        raise BadRequestException(
+            f"{label} inconnu(s) : {', '.join(unknown)} (valeurs possibles : {', '.join(allowed)})."
+        )
+    return names
+
+
+@lru_cache(maxsize=256)
+def response_template(fields: Optional[str] = None, embed: Optional[str] = None) -> JsonRowTemplate:
+    """
+    Template of the ActeMedicalResponse subset requested by ?fields= (scalar
+    fields, comma separated) and ?embed= (relationships). Without either,
+    the full response. Once fields are chosen, relationships are only
+    included if embedded explicitly; embed="" drops them all.
+    """
+    if fields is None and embed is None:
+        return RESPONSE_TEMPLATE
+    scalars = [name for name in ActeMedicalResponse.model_fields if name not in EMBEDDABLE]
+    selected = _names(fields, scalars, "Champ(s)") if fields is not None else None
+    if selected is not None and not selected:
+        raise BadRequestException("Le paramètre fields doit nommer au moins un champ.")
+    if embed is None:
+        embedded: List[str] = list(EMBEDDABLE) if fields is None else []
+    else:
+        embedded = _names(embed, list(EMBEDDABLE), "Relation(s)")
+    return JsonRowTemplate(
+        ActeMedicalResponse,
+        ActeMedical.__table__,
+        nested={name: EMBEDDABLE[name] for name in embedded},
+        fields=selected if selected is not None else scalars,
+    )
+
+
+async def _invalidate_reports(db: AsyncSession) -> None:
+    """
+    Drops the cached financial summaries once the transaction of `db`
+    commits: at once on this worker, through PAYLOAD_CACHE_CHANNEL on the
+    others (NOTIFY is delivered on commit only).
+    """
+    await db.execute(select(func.pg_notify(PAYLOAD_CACHE_CHANNEL, "financial-summary:")))
+    after_commit(db, lambda: payload_cache.invalidate_prefix("financial-summary:"))
+
+
 class ActeMedicalService(BaseService[ActeMedical, ActeMedicalCreate, ActeMedicalUpdate, ActeMedicalRepository]):
-    
+
+    # An acte may be dated in a closed period: its cached reports are stale
+    async def create(self, db: AsyncSession, *, obj_in: ActeMedicalCreate) -> ActeMedical:
+        async with UnitOfWork(db):
+            acte = await super().create(db, obj_in=obj_in)
+            await _invalidate_reports(db)
+        return acte
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ActeMedical,
+        obj_in: Union[ActeMedicalUpdate, dict[str, Any]]
+    ) -> ActeMedical:
+        async with UnitOfWork(db):
+            acte = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+            await _invalidate_reports(db)
+        return acte
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[ActeMedical]:
+        async with UnitOfWork(db):
+            acte = await super().remove(db, id=id)
+            await _invalidate_reports(db)
+        return acte
+
+    async def get_multi_json(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        params: Optional[ListParams] = None,
+        fields: Optional[str] = None,
+        embed: Optional[str] = None,
+    ) -> bytes:
+        """
+        get_multi serialized as List[ActeMedicalResponse] JSON, read as plain
+        rows: no identity map, no selectinload round trips, no validation.
+        fields/embed select a subset (see response_template): only its
+        columns are read and only the embedded tables are joined.
+        """
+        template = response_template(fields, embed)
+        rows = await self.repository.get_multi_rows(
+            db, columns=template.columns, skip=skip, limit=limit, params=params
+        )
+        return template.dumps(rows)
+
+    async def get_json(
+        self, db: AsyncSession, *, id: int, fields: Optional[str] = None, embed: Optional[str] = None
+    ) -> Optional[bytes]:
+        """Single acte as get_multi_json would serialize it, None if not found."""
+        template = response_template(fields, embed)
+        row = await self.repository.get_row(db, columns=template.columns, id=id)
+        return template.dumps_row(row) if row is not None else None
+
     async def get_by_patient(self, db: AsyncSession, *, nom: str, prenom: str) -> List[ActeMedical]:
         return await self.repository.get_by_patient(db, nom=nom, prenom=prenom)
         
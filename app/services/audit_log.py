@@ -1,12 +1,41 @@
-from typing import Any, Dict, Optional
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.audit_writer import audit_log_writer
+from app.core.exceptions import BadRequestException
+from app.db.base import naive_utc
 from app.db.models.audit_log import AuditLog
-from app.schemas.audit_log import AuditLogCreate
-from app.repositories.audit_log import AuditLogRepository
+from app.schemas.audit_log import AuditLogCreate, AuditLogPage
+from app.db.database import AsyncSessionLocal, engine
+from app.repositories.audit_log import AuditLogRepository, add_months, partition_month
 from app.services.base import BaseService
 from app.repositories import audit_log as audit_log_repo
 
+# Key of the session-level advisory lock held while partitions are maintained
+MAINTENANCE_LOCK_KEY = 7_301_840_291
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, _, id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        return naive_utc(datetime.fromisoformat(created_at)), int(id)
+    except ValueError:
+        raise BadRequestException(detail="Curseur de pagination invalide.")
+
+
 class AuditLogService(BaseService[AuditLog, AuditLogCreate, AuditLogCreate, AuditLogRepository]):
     
     async def log_action(
@@ -33,4 +62,138 @@ class AuditLogService(BaseService[AuditLog, AuditLogCreate, AuditLogCreate, Audi
         )
         return await self.create(db, obj_in=log_in)
 
+    async def enqueue_action(
+        self,
+        *,
+        action: str,
+        resource_type: str,
+        user_id: Optional[int] = None,
+        ip_address: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        changes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Queues an audit log entry for the background writer (batched INSERT).
+        Returns without waiting for the database.
+        """
+        await audit_log_writer.submit(
+            audit_log_writer.build_row(
+                action=action,
+                resource_type=resource_type,
+                user_id=user_id,
+                ip_address=ip_address,
+                resource_id=resource_id,
+                changes=changes,
+            )
+        )
+
+    async def search(
+        self, db: AsyncSession, *, limit: int, cursor: Optional[str] = None, **filters: Any
+    ) -> AuditLogPage:
+        """One page of audit logs, newest first (see AuditLogRepository._filtered)."""
+        before = decode_cursor(cursor) if cursor else None
+        items = await self.repository.get_page(db, limit=limit + 1, before=before, **filters)
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return AuditLogPage(items=items, next_cursor=next_cursor)
+
+    async def export_ndjson(
+        self,
+        *,
+        batch_size: int,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        **filters: Any
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams every matching log as NDJSON. Pages are fetched by keyset in
+        short transactions, so long exports neither hold a snapshot open nor
+        slow down as they go.
+        """
+        before = None
+        while True:
+            async with session_factory() as db:
+                rows = await self.repository.get_rows(db, limit=batch_size, before=before, **filters)
+            if not rows:
+                return
+            yield "".join(json.dumps(dict(row), default=str) + "\n" for row in rows).encode()
+            if len(rows) < batch_size:
+                return
+            before = (rows[-1]["created_at"], rows[-1]["id"])
+
+    async def maintain_partitions(self, db: AsyncSession) -> List[str]:
+        """
+        Creates the partitions of the coming months and retires those older
+        than AUDIT_RETENTION_MONTHS (dropped, or moved to AUDIT_ARCHIVE_SCHEMA).
+        Each partition is handled in its own transaction. Returns the names
+        of the retired partitions.
+        """
+        today = datetime.now(timezone.utc).date()
+        current_month = today.replace(day=1)
+        for offset in range(settings.AUDIT_PARTITIONS_AHEAD + 1):
+            try:
+                await self.repository.create_partition(db, month=add_months(current_month, offset))
+                await db.commit()
+            except SQLAlchemyError as exc:
+                # e.g. rows of that month already sit in the default partition
+                await db.rollback()
+                logger.warning(f"Could not create audit partition: {exc}")
+
+        retired: List[str] = []
+        if settings.AUDIT_RETENTION_MONTHS <= 0:
+            return retired
+        horizon = add_months(current_month, -settings.AUDIT_RETENTION_MONTHS)
+        for name in await self.repository.list_partitions(db):
+            month = partition_month(name)
+            if month is None or month >= horizon:
+                continue
+            try:
+                await self.repository.detach_partition(
+                    db, name=name, archive_schema=settings.AUDIT_ARCHIVE_SCHEMA
+                )
+                await db.commit()
+            except SQLAlchemyError as exc:
+                await db.rollback()
+                logger.warning(f"Could not retire audit partition {name}: {exc}")
+                continue
+            retired.append(name)
+        return retired
+
+    async def maintain_partitions_locked(self) -> Optional[List[str]]:
+        """
+        maintain_partitions under a cluster-wide advisory lock, so that
+        workers never run CREATE or DETACH PARTITION concurrently. Returns
+        None when another worker holds the lock.
+        """
+        async with engine.connect() as lock_connection:
+            locked = (
+                await lock_connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+                )
+            ).scalar_one()
+            # The lock belongs to the connection, not to this transaction
+            await lock_connection.commit()
+            if not locked:
+                return None
+            try:
+                async with AsyncSessionLocal() as db:
+                    return await self.maintain_partitions(db)
+            finally:
+                await lock_connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+                )
+                await lock_connection.commit()
+
+    async def run_periodic_maintenance(self) -> None:
+        """Background task started in the application lifespan."""
+        while True:
+            try:
+                retired = await self.maintain_partitions_locked()
+                if retired:
+                    logger.info(f"Retired audit partitions: {', '.join(retired)}")
+            except (SQLAlchemyError, OSError) as exc:
+                logger.warning(f"Audit partition maintenance failed: {exc}")
+            await asyncio.sleep(settings.AUDIT_MAINTENANCE_INTERVAL_SECONDS)
+
 audit_log_service = AuditLogService(audit_log_repo)
@@ -4,37 +4,58 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.core.security import verify_password, create_access_token, create_refresh_token
+from app.core.security import verify_and_update_password_async, create_access_token
 from app.core.config import settings
+from app.core.principal import token_claims
 from app.schemas.token import Token
 from app.db.models.user import User
+from app.services.base import UnitOfWork
 from app.services.user import user_service
+from app.services.refresh_token import refresh_token_service
 
 class AuthService:
+    def create_user_access_token(self, user: User) -> str:
+        """
+        Creates the access token of a user. It always carries the user's
+        token_version, so that a bump revokes it in either mode, and embeds
+        its authorization claims when STATELESS_ACCESS_TOKENS is enabled.
+        """
+        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        return create_access_token(
+            subject=user.id,
+            expires_delta=access_token_expires,
+            claims=token_claims(user) if settings.STATELESS_ACCESS_TOKENS else {"ver": user.token_version},
+        )
+
     async def authenticate_user(
         self, db: AsyncSession, username_or_email: str, password: str
     ) -> Optional[User]:
         """
         Authenticate a user by username or email and password.
         """
-        # Try to find by email first
-        user = await user_service.get_by_email(db, email=username_or_email)
-        
-        # If not found, try by username
-        if not user:
-            user = await user_service.get_by_username(db, username=username_or_email)
-            
-        if not user:
+        # Single lightweight lookup (email OR username, case-insensitive)
+        credentials = await user_service.get_credentials(db, identifier=username_or_email)
+        if not credentials:
             return None
             
-        if not verify_password(password, user.password_hash):
+        is_valid, new_hash = await verify_and_update_password_async(password, credentials.password_hash)
+        if not is_valid:
             return None
             
-        if not user.is_active:
+        if not credentials.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Inactive user"
             )
+
+        # Full polymorphic load only once the password is known to be valid
+        user = await user_service.get(db, id=credentials.id)
+        if not user:
+            return None
+
+        # Transparent rehash when the bcrypt cost changed since the hash was stored
+        if new_hash:
+            user = await user_service.update(db, db_obj=user, obj_in={"password_hash": new_hash})
             
         return user
 
@@ -42,30 +63,42 @@ class AuthService:
         """
         Login user and return access token.
         """
-        user = await self.authenticate_user(db, username_or_email, password)
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect username/email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-            
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            subject=user.id, expires_delta=access_token_expires
-        )
-        
-        refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        refresh_token = create_refresh_token(
-            subject=user.id, expires_delta=refresh_token_expires
-        )
-        
-        # TODO: Store refresh token in database (RefreshToken table) for revocation support
-        
+        # The transparent rehash and the refresh token are committed together
+        async with UnitOfWork(db):
+            user = await self.authenticate_user(db, username_or_email, password)
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Incorrect username/email or password",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+
+            access_token = self.create_user_access_token(user)
+
+            refresh_token = await refresh_token_service.issue(db, user_id=user.id)
+
         return Token(
             access_token=access_token, 
             token_type="bearer",
             refresh_token=refresh_token
         )
 
+    async def refresh(self, db: AsyncSession, refresh_token: str) -> Token:
+        """
+        Rotate a refresh token and return a new access/refresh token pair.
+        """
+        user_id, new_refresh_token = await refresh_token_service.rotate(db, token=refresh_token)
+        user = await user_service.get(db, id=user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+            
+        if not user.is_active:
+            raise HTTPException(status_code=400, detail="Inactive user")
+
+        return Token(
+            access_token=self.create_user_access_token(user),
+            token_type="bearer",
+            refresh_token=new_refresh_token
+        )
+
 auth_service = AuthService()
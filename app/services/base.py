@@ -1,16 +1,96 @@
-from typing import Any, Generic, List, Optional, TypeVar, Union
+from types import TracebackType
+from typing import Any, Callable, Generic, List, Optional, Type, TypeVar, Union
 from uuid import UUID
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
+from app.core import metrics
 from app.db.base import Base
 from app.repositories.base import BaseRepository
+from app.repositories.filters import ListParams, TotalCount
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 RepositoryType = TypeVar("RepositoryType", bound=BaseRepository)
 
+_DEPTH_KEY = "unit_of_work_depth"
+_AFTER_COMMIT_KEY = "unit_of_work_after_commit"
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Runs `callback` once the current transaction of `db` is committed, e.g.
+    to update an in-process cache. Dropped if the transaction rolls back.
+    """
+    db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT_KEY, None)
+
+
+class UnitOfWork:
+    """
+    Transaction of one business operation. Repositories only flush; the
+    outermost unit of work of a session commits once when its block exits,
+    or rolls back if it raised.
+
+    A unit of work opened inside another one joins it: nothing is committed
+    until the outer block exits. With savepoint=True, the nested block runs
+    in a SAVEPOINT, so its failure rolls back only its own writes and the
+    outer operation may carry on.
+
+        async with UnitOfWork(db):
+            role = await role_service.create(db, obj_in=role_in)
+            await audit_log_service.log_action(db, ...)
+    """
+    def __init__(self, db: AsyncSession, *, savepoint: bool = False):
+        self.db = db
+        self.savepoint = savepoint
+        self._nested: Optional[AsyncSessionTransaction] = None
+        self._outermost = False
+
+    async def __aenter__(self) -> AsyncSession:
+        depth = self.db.info.get(_DEPTH_KEY, 0)
+        self._outermost = depth == 0
+        if not self._outermost and self.savepoint:
+            self._nested = await self.db.begin_nested()
+        self.db.info[_DEPTH_KEY] = depth + 1
+        return self.db
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.db.info[_DEPTH_KEY] -= 1
+        if self._nested is not None:
+            if exc_type is None:
+                await self._nested.commit()  # RELEASE SAVEPOINT
+            else:
+                await self._nested.rollback()
+            return
+        if not self._outermost:
+            return
+        if exc_type is None:
+            await self.db.commit()
+            metrics.DB_UNITS_OF_WORK.labels(outcome="commit").inc()
+        else:
+            await self.db.rollback()
+            metrics.DB_UNITS_OF_WORK.labels(outcome="rollback").inc()
+
+
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, RepositoryType]):
     def __init__(self, repository: RepositoryType):
         self.repository = repository
@@ -22,12 +102,16 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, Reposit
         return await self.repository.get_by_uuid(db, uuid)
 
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, params: Optional[ListParams] = None
     ) -> List[ModelType]:
-        return await self.repository.get_multi(db, skip=skip, limit=limit)
+        return await self.repository.get_multi(db, skip=skip, limit=limit, params=params)
+
+    async def count(self, db: AsyncSession, *, params: Optional[ListParams] = None) -> TotalCount:
+        return await self.repository.count(db, params=params)
 
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
-        return await self.repository.create(db, obj_in=obj_in)
+        async with UnitOfWork(db):
+            return await self.repository.create(db, obj_in=obj_in)
 
     async def update(
         self,
@@ -36,7 +120,9 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, Reposit
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, dict[str, Any]]
     ) -> ModelType:
-        return await self.repository.update(db, db_obj=db_obj, obj_in=obj_in)
+        async with UnitOfWork(db):
+            return await self.repository.update(db, db_obj=db_obj, obj_in=obj_in)
 
     async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
-        return await self.repository.remove(db, id=id)
+        async with UnitOfWork(db):
+            return await self.repository.remove(db, id=id)
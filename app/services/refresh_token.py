@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from importlib import import_module
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import create_refresh_token, hash_token
+from app.core.token_revocation import revoked_refresh_tokens
+from app.db.database import AsyncSessionLocal
+from app.db.models.refresh_token import RefreshToken
+from app.schemas.refresh_token import RefreshTokenCreate
+from app.repositories.refresh_token import RefreshTokenRepository
+from app.services.base import BaseService, UnitOfWork, after_commit
+from app.repositories import refresh_token as refresh_token_repo
+
+jose = import_module("jose")
+jwt = import_module("jose.jwt")
+JWTError = jose.JWTError
+
+
+def _utcnow() -> datetime:
+    # refresh_tokens uses naive DateTime columns, stored in UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _max_expiry(now: datetime) -> float:
+    # Upper bound of the expiry of any token still alive at `now`
+    return _timestamp(now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+
+
+def _invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Could not validate credentials",
+    )
+
+
+class RefreshTokenService(BaseService[RefreshToken, RefreshTokenCreate, RefreshTokenCreate, RefreshTokenRepository]):
+
+    async def issue(self, db: AsyncSession, *, user_id: int, family_id: Optional[UUID] = None) -> str:
+        """
+        Creates and stores (hashed) a refresh token. A new rotation family is
+        started unless family_id is given. Commits, unless called inside
+        an enclosing unit of work.
+        """
+        token_id = uuid4()
+        expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        token = create_refresh_token(
+            subject=user_id, expires_delta=expires_delta, token_id=str(token_id)
+        )
+        async with UnitOfWork(db):
+            await self.repository.create(
+                db,
+                obj_in=RefreshTokenCreate(
+                    uuid=token_id,
+                    token=hash_token(token),
+                    family_id=family_id or uuid4(),
+                    user_id=user_id,
+                    expires_at=_utcnow() + expires_delta,
+                ),
+            )
+        return token
+
+    async def rotate(self, db: AsyncSession, *, token: str) -> Tuple[int, str]:
+        """
+        Exchanges a refresh token for a new one of the same family and
+        returns (user_id, new_token). Presenting a token that was already
+        rotated is treated as theft: the whole family is revoked.
+        """
+        try:
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            raise _invalid_token()
+        token_id = claims.get("jti")
+        if claims.get("type") != "refresh" or not token_id:
+            raise _invalid_token()
+
+        # Known revoked id: no lookup needed. Only ids whose family is already
+        # revoked are cached (see rotate), never merely rotated ones.
+        if token_id in revoked_refresh_tokens:
+            raise _invalid_token()
+
+        db_obj = await self.repository.get_by_hash_for_update(db, token_hash=hash_token(token))
+        if db_obj is None:
+            raise _invalid_token()
+
+        now = _utcnow()
+        if db_obj.revoked_at is not None:
+            revoked_ids = await self.repository.revoke_family(db, family_id=db_obj.family_id, now=now)
+            await db.commit()
+            revoked_refresh_tokens.add(token_id, _timestamp(db_obj.expires_at))
+            for revoked_id in revoked_ids:
+                revoked_refresh_tokens.add(str(revoked_id), _max_expiry(now))
+            logger.warning(
+                f"Refresh token reuse detected for user {db_obj.user_id}: "
+                f"family {db_obj.family_id} revoked"
+            )
+            raise _invalid_token()
+
+        if db_obj.expires_at <= now:
+            raise _invalid_token()
+
+        db_obj.revoked_at = now
+        # Committed together with the revocation above
+        new_token = await self.issue(db, user_id=db_obj.user_id, family_id=db_obj.family_id)
+        # Not cached: a replay of this token must reach the reuse detection above
+        return db_obj.user_id, new_token
+
+    async def revoke_for_user(self, db: AsyncSession, *, user_id: int) -> None:
+        """
+        Revokes every live refresh token of a user. Does not commit; the ids
+        are cached as revoked once the enclosing transaction commits.
+        """
+        now = _utcnow()
+        revoked_ids = await self.repository.revoke_for_user(db, user_id=user_id, now=now)
+
+        def cache_revoked() -> None:
+            for revoked_id in revoked_ids:
+                revoked_refresh_tokens.add(str(revoked_id), _max_expiry(now))
+
+        after_commit(db, cache_revoked)
+
+    async def delete_expired(self, db: AsyncSession) -> int:
+        """
+        Deletes expired tokens in bounded chunks (one commit per chunk) so
+        that the cleanup never holds long locks. Returns the number of rows.
+        """
+        batch_size = settings.REFRESH_TOKEN_CLEANUP_BATCH_SIZE
+        now = _utcnow()
+        total = 0
+        while True:
+            async with UnitOfWork(db):
+                deleted = await self.repository.delete_expired_batch(db, now=now, batch_size=batch_size)
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+    async def run_periodic_cleanup(self) -> None:
+        """Background task started in the application lifespan."""
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    deleted = await self.delete_expired(db)
+                if deleted:
+                    logger.info(f"Deleted {deleted} expired refresh tokens")
+            except (SQLAlchemyError, OSError) as exc:
+                logger.warning(f"Refresh token cleanup failed: {exc}")
+            await asyncio.sleep(settings.REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS)
+
+
+refresh_token_service = RefreshTokenService(refresh_token_repo)
@@ -7,6 +7,7 @@ from app.db.models.acte_medical import ActeMedical
 from app.db.models.acte_type import ActeType
 from app.db.models.service import Service
 from app.db.models.user import Medecin
+from app.schemas.report import FinancialSummaryResponse
 
 class ReportService:
     async def get_financial_summary(
@@ -50,6 +51,13 @@ class ReportService:
             "by_medecin": by_medecin
         }
 
+    async def get_financial_summary_json(self, db: AsyncSession, start_date: date, end_date: date) -> bytes:
+        """
+        get_financial_summary serialized as the endpoint's FinancialSummaryResponse JSON.
+        """
+        summary = await self.get_financial_summary(db, start_date, end_date)
+        return FinancialSummaryResponse.model_validate(summary).model_dump_json().encode()
+
     async def _get_revenue_by_service(self, db: AsyncSession, start_date: date, end_date: date) -> List[Dict[str, Any]]:
         query = select(
             Service.nom,
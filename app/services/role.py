@@ -1,19 +1,75 @@
-from typing import Optional
+from typing import Any, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.role import Role, Permission
 from app.schemas.role import RoleCreate, RoleUpdate, PermissionCreate, PermissionUpdate
 from app.repositories.role import RoleRepository, PermissionRepository
-from app.services.base import BaseService
-from app.repositories import role as role_repo, permission as permission_repo
+from app.services.base import BaseService, UnitOfWork, after_commit
+from app.core.principal import principal_cache, publish_invalidation
+from app.core.permissions import permission_registry
+from app.repositories import role as role_repo, permission as permission_repo, user as user_repo
 
 class RoleService(BaseService[Role, RoleCreate, RoleUpdate, RoleRepository]):
     
     async def get_by_name(self, db: AsyncSession, name: str) -> Optional[Role]:
         return await self.repository.get_by_name(db, name=name)
 
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Role,
+        obj_in: Union[RoleUpdate, dict[str, Any]]
+    ) -> Role:
+        async with UnitOfWork(db):
+            await user_repo.bump_token_versions(db, role_id=db_obj.id)
+            role = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+            await publish_invalidation(db, f"role:{role.id}")
+            after_commit(db, lambda: principal_cache.invalidate_role(role.id))
+        return role
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Role]:
+        async with UnitOfWork(db):
+            await user_repo.bump_token_versions(db, role_id=id)
+            role = await super().remove(db, id=id)
+            await publish_invalidation(db, f"role:{id}")
+            after_commit(db, lambda: principal_cache.invalidate_role(id))
+        return role
+
 class PermissionService(BaseService[Permission, PermissionCreate, PermissionUpdate, PermissionRepository]):
-    pass
+
+    async def load_registry(self, db: AsyncSession) -> int:
+        """
+        Registers every known permission slug so that bit positions are
+        assigned once at startup. Returns the number of registered slugs.
+        """
+        for slug in await self.repository.get_slugs(db):
+            permission_registry.register(slug)
+        return len(permission_registry)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Permission,
+        obj_in: Union[PermissionUpdate, dict[str, Any]]
+    ) -> Permission:
+        async with UnitOfWork(db):
+            # Stateless tokens embed the slug: revoke those of its holders
+            await user_repo.bump_token_versions(db, permission_id=db_obj.id)
+            permission = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+            # Permissions are shared across roles: drop every cached snapshot
+            await publish_invalidation(db, "all")
+            after_commit(db, principal_cache.clear)
+        return permission
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Permission]:
+        async with UnitOfWork(db):
+            await user_repo.bump_token_versions(db, permission_id=id)
+            permission = await super().remove(db, id=id)
+            await publish_invalidation(db, "all")
+            after_commit(db, principal_cache.clear)
+        return permission
 
 role_service = RoleService(role_repo)
 permission_service = PermissionService(permission_repo)
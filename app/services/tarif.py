@@ -17,10 +17,10 @@ class TarifService(BaseService[Tarif, TarifCreate, TarifUpdate, TarifRepository]
         service_id: int, 
         acte_id: int, 
         type_prise_charge_id: int,
-        date_ref: date = date.today()
+        date_ref: Optional[date] = None
     ) -> Optional[Tarif]:
         """
-        Get the active tariff for a specific combination.
+        Get the active tariff for a specific combination (today by default).
         """
         return await self.repository.get_active_tarif(
             db, 
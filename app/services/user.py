@@ -1,11 +1,14 @@
-from typing import Optional
+from typing import Any, Optional, Union
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.repositories.user import UserRepository
-from app.services.base import BaseService
-from app.core.security import get_password_hash
+from app.services.base import BaseService, UnitOfWork, after_commit
+from app.core.security import get_password_hash_async
+from app.core.principal import principal_cache, publish_invalidation
+from app.services.refresh_token import refresh_token_service
 from app.repositories import user as user_repo
 
 class UserService(BaseService[User, UserCreate, UserUpdate, UserRepository]):
@@ -15,8 +18,46 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserRepository]):
         Create a new user with hashed password.
         """
         # Hash the password
-        obj_in.password = get_password_hash(obj_in.password)
-        return await self.repository.create(db, obj_in=obj_in)
+        obj_in.password = await get_password_hash_async(obj_in.password)
+        return await super().create(db, obj_in=obj_in)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, dict[str, Any]]
+    ) -> User:
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        # Password change and deactivation revoke the tokens already issued
+        revoke_tokens = False
+        password = update_data.pop("password", None)
+        if password:
+            update_data["password_hash"] = await get_password_hash_async(password)
+            revoke_tokens = True
+        if update_data.get("is_active") is False and db_obj.is_active:
+            revoke_tokens = True
+        async with UnitOfWork(db):
+            if revoke_tokens:
+                await self.repository.bump_token_versions(db, user_ids=[db_obj.id])
+                await refresh_token_service.revoke_for_user(db, user_id=db_obj.id)
+            user = await super().update(db, db_obj=db_obj, obj_in=update_data)
+            await publish_invalidation(db, f"user:{user.id}")
+            after_commit(db, lambda: principal_cache.invalidate(user.id))
+        return user
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[User]:
+        async with UnitOfWork(db):
+            # Published before the row disappears so stateless tokens are rejected
+            await self.repository.bump_token_versions(db, user_ids=[id])
+            user = await super().remove(db, id=id)
+            await publish_invalidation(db, f"user:{id}")
+            after_commit(db, lambda: principal_cache.invalidate(id))
+        return user
         
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
         return await self.repository.get_by_email(db, email=email)
@@ -24,4 +65,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserRepository]):
     async def get_by_username(self, db: AsyncSession, username: str) -> Optional[User]:
         return await self.repository.get_by_username(db, username=username)
 
+    async def get_credentials(self, db: AsyncSession, identifier: str) -> Optional[Row[Any]]:
+        return await self.repository.get_credentials(db, identifier=identifier)
+
 user_service = UserService(user_repo)
@@ -0,0 +1,108 @@
+"""
+Audit middleware benchmark: BaseHTTPMiddleware vs pure ASGI.
+
+Usage:
+    python -m app.utils.audit_middleware_benchmark [--requests 5000] [--concurrency 50]
+
+Serves a POST endpoint in-process (httpx ASGITransport, no network, no
+database: queued audit rows are discarded) behind the previous
+`@app.middleware("http")` implementation, then behind AuditMiddleware,
+and reports requests per second and latency percentiles.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.core.audit import AUDITED_METHODS, AuditMiddleware, parse_resource
+from app.core.audit_writer import audit_log_writer
+from app.core.config import settings
+from app.services.audit_log import audit_log_service
+
+
+async def _discard(row) -> None:
+    return None
+
+
+def _base_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post(f"{settings.API_V1_STR}/actes")
+    async def create_acte() -> dict:
+        return {"id": 1, "libelle": "Consultation"}
+
+    return app
+
+
+def before_app() -> FastAPI:
+    """The audit middleware as it was: a BaseHTTPMiddleware function."""
+    app = _base_app()
+
+    @app.middleware("http")
+    async def audit_log_middleware(request: Request, call_next):
+        response = await call_next(request)
+        resource = parse_resource(request.url.path)
+        if request.method in AUDITED_METHODS and resource and response.status_code < 400:
+            await audit_log_service.enqueue_action(
+                action=AUDITED_METHODS[request.method],
+                resource_type=resource[0],
+                resource_id=resource[1],
+                ip_address=request.client.host if request.client else None,
+            )
+        return response
+
+    return app
+
+
+def after_app() -> FastAPI:
+    app = _base_app()
+    app.add_middleware(AuditMiddleware)
+    return app
+
+
+async def run(app: FastAPI, total: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(total))
+
+        async def worker() -> None:
+            for _ in remaining:
+                started_at = time.perf_counter()
+                response = await client.post(f"{settings.API_V1_STR}/actes", json={})
+                latencies.append(time.perf_counter() - started_at)
+                response.raise_for_status()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def main_async(total: int, concurrency: int) -> None:
+    audit_log_writer.submit = _discard
+    for name, factory in (("BaseHTTPMiddleware", before_app), ("pure ASGI", after_app)):
+        app = factory()
+        await run(app, min(total, 200), concurrency)  # warm-up
+        started_at = time.perf_counter()
+        latencies = sorted(await run(app, total, concurrency))
+        elapsed = time.perf_counter() - started_at
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"{name:<20} {total / elapsed:8.0f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:6.2f} ms  p99 {p99 * 1000:6.2f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Audit middleware overhead")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Bulk-loads audit segment files into audit_logs.
+
+Usage:
+    python -m app.utils.audit_segment_indexer [--directory audit_segments] [--delete] [files ...]
+
+Loads every completed segment written by SegmentFileAuditSink (AUDIT_SINK=
+segments), or the given files (including `.part` segments left by a crashed
+process). Each segment is loaded in one transaction:
+COPY into a temporary table, then INSERT into audit_logs of the rows not
+already there (same uuid and created_at), so loading a segment twice is
+harmless. Loaded segments are moved to `<directory>/loaded` (or deleted).
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+from typing import List
+
+import asyncpg
+
+from app.core.audit_sinks import PARTIAL_SUFFIX, read_segment
+from app.core.config import settings
+
+COLUMNS = [
+    "uuid", "user_id", "ip_address", "action", "resource_type",
+    "resource_id", "changes", "created_at", "updated_at",
+]
+
+_CREATE_STAGING = """
+    CREATE TEMP TABLE audit_staging (
+        uuid UUID NOT NULL,
+        user_id INTEGER,
+        ip_address VARCHAR(45),
+        action VARCHAR(50) NOT NULL,
+        resource_type VARCHAR(50) NOT NULL,
+        resource_id VARCHAR(50),
+        changes JSONB,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+    ) ON COMMIT DROP
+"""
+
+_MERGE_STAGING = f"""
+    INSERT INTO audit_logs ({", ".join(COLUMNS)})
+    SELECT {", ".join(f"s.{column}" for column in COLUMNS)}
+    FROM audit_staging s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM audit_logs a WHERE a.uuid = s.uuid AND a.created_at = s.created_at
+    )
+"""
+
+
+async def load_segment(connection: asyncpg.Connection, path: str) -> int:
+    """Loads one segment and returns the number of inserted rows."""
+    records = [
+        (
+            row["uuid"], row["user_id"], row["ip_address"], row["action"], row["resource_type"],
+            row["resource_id"], json.dumps(row["changes"]) if row["changes"] is not None else None,
+            row["created_at"], row["updated_at"],
+        )
+        for row in read_segment(path)
+    ]
+    async with connection.transaction():
+        await connection.execute(_CREATE_STAGING)
+        await connection.copy_records_to_table("audit_staging", records=records, columns=COLUMNS)
+        status = await connection.execute(_MERGE_STAGING)
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def main_async(directory: str, files: List[str], delete: bool) -> None:
+    paths = files or sorted(
+        path for path in glob.glob(os.path.join(directory, "audit-*"))
+        if not path.endswith(PARTIAL_SUFFIX)
+    )
+    if not paths:
+        print("No audit segment to load")
+        return
+
+    loaded_dir = os.path.join(directory, "loaded")
+    dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+    connection = await asyncpg.connect(dsn)
+    try:
+        for path in paths:
+            inserted = await load_segment(connection, path)
+            if delete:
+                os.remove(path)
+            else:
+                os.makedirs(loaded_dir, exist_ok=True)
+                name = os.path.basename(path)
+                if name.endswith(PARTIAL_SUFFIX):
+                    name = name[:-len(PARTIAL_SUFFIX)]
+                os.replace(path, os.path.join(loaded_dir, name))
+            print(f"{path}: {inserted} rows inserted")
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load audit segment files into audit_logs")
+    parser.add_argument("--directory", default=settings.AUDIT_SEGMENT_DIR)
+    parser.add_argument("--delete", action="store_true", help="delete segments once loaded")
+    parser.add_argument("files", nargs="*", help="segments to load (default: every completed one)")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.directory, args.files, args.delete))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+bcrypt capacity planning benchmark.
+
+Usage:
+    python -m app.utils.bcrypt_benchmark [--rounds 10 11 12] [--seconds 2]
+
+Reports, for each cost, the time of one hash and the number of hashes
+(i.e. logins) one core can sustain per second, plus the whole-machine
+estimate based on os.cpu_count().
+"""
+import argparse
+import os
+import time
+
+from app.core.config import settings
+from app.core.security import calibrate_bcrypt_rounds, pwd_context
+
+
+def hashes_per_second(rounds: int, seconds: float) -> float:
+    handler = pwd_context.handler("bcrypt").using(rounds=rounds)
+    count = 0
+    started_at = time.perf_counter()
+    while True:
+        handler.hash("benchmark-password")
+        count += 1
+        elapsed = time.perf_counter() - started_at
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="bcrypt hashes/sec per core")
+    parser.add_argument("--rounds", type=int, nargs="*", help="bcrypt costs to measure")
+    parser.add_argument("--seconds", type=float, default=2.0, help="measurement time per cost")
+    args = parser.parse_args()
+
+    calibrated = calibrate_bcrypt_rounds(
+        settings.PASSWORD_HASH_TARGET_MS,
+        settings.PASSWORD_HASH_MIN_ROUNDS,
+        settings.PASSWORD_HASH_MAX_ROUNDS,
+    )
+    cores = os.cpu_count() or 1
+    print(f"Calibrated cost for {settings.PASSWORD_HASH_TARGET_MS:.0f} ms target: {calibrated} rounds")
+    print(f"CPU cores: {cores}")
+    print(f"{'rounds':>6} | {'ms/hash':>8} | {'hash/s/core':>11} | {'hash/s (all cores)':>18}")
+
+    for rounds in args.rounds or [calibrated - 1, calibrated, calibrated + 1]:
+        rate = hashes_per_second(rounds, args.seconds)
+        print(f"{rounds:>6} | {1000 / rate:>8.1f} | {rate:>11.2f} | {rate * cores:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Connection pool benchmark: pre-ping policy and prepared statement cache.
+
+Usage:
+    python -m app.utils.db_pool_benchmark [--queries 2000]
+
+Needs the database from Settings. For each combination of pre-ping
+(on every checkout or never) and statement cache size (0 or 100), runs
+`--queries` short requests, each checking a connection out of the pool and
+running one parameterized SELECT, and reports latency percentiles.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+
+QUERY = text("SELECT id, email, is_active FROM users WHERE id = :id")
+
+
+async def run(pre_ping: bool, cache_size: int, queries: int) -> List[float]:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=pre_ping,
+        connect_args={
+            "prepared_statement_cache_size": cache_size,
+            "statement_cache_size": cache_size,
+        },
+    )
+    latencies: List[float] = []
+    try:
+        for i in range(queries + 50):
+            started_at = time.perf_counter()
+            async with engine.connect() as connection:
+                await connection.execute(QUERY, {"id": i % 100})
+            if i >= 50:  # The first checkouts open the connection and warm the cache
+                latencies.append(time.perf_counter() - started_at)
+    finally:
+        await engine.dispose()
+    return sorted(latencies)
+
+
+async def main_async(queries: int) -> None:
+    for pre_ping in (True, False):
+        for cache_size in (0, 100):
+            latencies = await run(pre_ping, cache_size, queries)
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            print(
+                f"pre_ping={str(pre_ping):<5} statement_cache={cache_size:<4} "
+                f"p50 {statistics.median(latencies) * 1000:6.3f} ms  p99 {p99 * 1000:6.3f} ms"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pool pre-ping and statement cache latency")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+GET /actes serialization: ORM objects through the response_model vs plain
+rows through JsonRowTemplate.
+
+Usage:
+    python -m app.utils.fast_read_benchmark [--rows 100] [--rounds 200]
+
+No database needed. Builds `--rows` synthetic actes (with their acte type
+and coverage type), then times, per page:
+- "response_model": FastAPI's own serialization of the route's response
+  field from ORM objects (validation, then JSON);
+- "rows": JsonRowTemplate.dumps of the same values as plain tuples.
+Both outputs are compared byte for byte first. The ORM path also pays for
+identity-map hydration and two selectinload round trips, not measured here.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, List, Tuple
+
+from fastapi.routing import APIRoute, serialize_response
+
+from app.api.v1.endpoints.actes import router
+from app.db.models.acte_medical import ActeMedical
+from app.db.models.acte_type import ActeType
+from app.db.models.type_prise_charge import TypePriseCharge
+from app.services.acte_medical import RESPONSE_TEMPLATE
+
+NAMES = ["Diop", "Ndiaye", "Fall", "Sène", "Ba", "Gueye", "Faye", "N'Diaye"]
+
+
+def sample(count: int) -> Tuple[List[ActeMedical], List[Tuple[Any, ...]]]:
+    random.seed(0)
+    now = datetime(2026, 3, 1, 8, 30)
+    actes_types = [
+        ActeType(
+            id=i, uuid=uuid.uuid4(), code=f"CS-{i}", nom=f"Consultation {i}", description=None,
+            is_active=True, service_id=1 + i % 3, created_at=now, updated_at=now,
+        )
+        for i in range(1, 11)
+    ]
+    types_prise_charge = [
+        TypePriseCharge(
+            id=i, uuid=uuid.uuid4(), code=code, libelle=f"Prise en charge {code}",
+            description="Taux de couverture à 80 %", is_active=True, created_at=now, updated_at=now,
+        )
+        for i, code in enumerate(["ESP", "ASS", "IPM"], start=1)
+    ]
+    actes: List[ActeMedical] = []
+    for i in range(1, count + 1):
+        acte_type = random.choice(actes_types)
+        type_prise_charge = random.choice(types_prise_charge)
+        actes.append(ActeMedical(
+            id=i, uuid=uuid.uuid4(), nom_patient=random.choice(NAMES), prenom_patient="Aïssatou",
+            numero_bc=f"BC-{i:06d}" if i % 2 else None,
+            date_acte=now + timedelta(minutes=i, microseconds=i * 137),
+            cotation="K20", observations="RAS\nContrôle dans 15 jours" if i % 3 else None,
+            montant=Decimal(random.randint(500, 500000)) / 100, statut="PAYE",
+            acte_id=acte_type.id, type_prise_charge_id=type_prise_charge.id,
+            medecin_id=7, created_by_id=3, created_at=now, updated_at=now,
+            acte_type=acte_type, type_prise_charge=type_prise_charge,
+        ))
+
+    def values(obj: Any, template: Any) -> List[Any]:
+        row = [getattr(obj, column.name) for column in template.table_columns]
+        for name, nested in template.nested.items():
+            row.extend(values(getattr(obj, name), nested))
+        return row
+
+    return actes, [tuple(values(acte, RESPONSE_TEMPLATE)) for acte in actes]
+
+
+async def main_async(rows: int, rounds: int) -> None:
+    route = next(r for r in router.routes if isinstance(r, APIRoute) and r.name == "read_actes")
+    actes, tuples = sample(rows)
+
+    async def response_model() -> bytes:
+        return await serialize_response(field=route.response_field, response_content=actes, dump_json=True)
+
+    expected = await response_model()
+    if RESPONSE_TEMPLATE.dumps(tuples) != expected:
+        raise SystemExit("JsonRowTemplate output differs from the response_model serialization")
+    print(f"Outputs identical ({len(expected)} bytes per page of {rows} rows)")
+
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        await response_model()
+    orm_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        RESPONSE_TEMPLATE.dumps(tuples)
+    rows_seconds = time.perf_counter() - started_at
+
+    total = rows * rounds
+    print(f"response_model {total / orm_seconds:>12,.0f} rows/s")
+    print(f"rows           {total / rows_seconds:>12,.0f} rows/s  (x{orm_seconds / rows_seconds:.1f})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GET /actes serialization throughput")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.rows, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Login load benchmark: GET latency during a login burst, with bcrypt run
+inline on the event loop vs on the bounded password hashing executor.
+
+Usage:
+    python -m app.utils.login_load_benchmark [--rounds 12] [--gets 500] [--logins 4] [--concurrency 20]
+
+Serves a login endpoint and a GET endpoint in-process (httpx
+ASGITransport, no network, no database: the password is checked against
+one precomputed hash and the GET sleeps for one simulated query). While `--logins` clients log in back to back,
+`--concurrency` clients send `--gets` GETs; reports the GET latency
+percentiles and the logins completed per second for each variant.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.core.config import settings
+from app.core.security import pwd_context, verify_password, verify_password_async
+
+PASSWORD = "benchmark-password"
+DB_ROUND_TRIP_SECONDS = 0.001  # Stands in for the query of a real GET
+
+
+def _app(hashed_password: str, inline: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.post(f"{settings.API_V1_STR}/auth/login")
+    async def login() -> dict:
+        if inline:
+            is_valid = verify_password(PASSWORD, hashed_password)
+        else:
+            is_valid = await verify_password_async(PASSWORD, hashed_password)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail="Incorrect email or password")
+        return {"access_token": "token", "token_type": "bearer"}
+
+    @app.get(f"{settings.API_V1_STR}/actes")
+    async def read_actes() -> list:
+        await asyncio.sleep(DB_ROUND_TRIP_SECONDS)
+        return []
+
+    return app
+
+
+async def run(app: FastAPI, gets: int, concurrency: int, logins: int) -> Tuple[List[float], float]:
+    """Returns the GET latencies and the logins completed per second."""
+    latencies: List[float] = []
+    login_count = 0
+    done = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(gets))
+
+        async def reader() -> None:
+            for _ in remaining:
+                started_at = time.perf_counter()
+                response = await client.get(f"{settings.API_V1_STR}/actes")
+                latencies.append(time.perf_counter() - started_at)
+                response.raise_for_status()
+
+        async def login() -> None:
+            nonlocal login_count
+            while not done.is_set():
+                response = await client.post(f"{settings.API_V1_STR}/auth/login")
+                response.raise_for_status()
+                login_count += 1
+                # An inline login never suspends: let the readers run
+                await asyncio.sleep(0)
+
+        started_at = time.perf_counter()
+        login_tasks = [asyncio.create_task(login()) for _ in range(logins)]
+        await asyncio.gather(*(reader() for _ in range(concurrency)))
+        done.set()
+        await asyncio.gather(*login_tasks)
+        elapsed = time.perf_counter() - started_at
+    return latencies, login_count / elapsed
+
+
+async def main_async(rounds: int, gets: int, concurrency: int, logins: int) -> None:
+    hashed_password = pwd_context.handler("bcrypt").using(rounds=rounds).hash(PASSWORD)
+    print(
+        f"bcrypt rounds={rounds}, executor: {settings.PASSWORD_HASH_WORKERS} workers, "
+        f"{settings.PASSWORD_HASH_MAX_CONCURRENCY} max concurrency"
+    )
+    for name, inline in (("inline bcrypt", True), ("bounded executor", False)):
+        app = _app(hashed_password, inline)
+        await run(app, min(gets, 200), concurrency, 0)  # warm-up
+        latencies, logins_per_second = await run(app, gets, concurrency, logins)
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"{name:<18} GET p50 {statistics.median(latencies) * 1000:8.2f} ms  "
+            f"p99 {p99 * 1000:8.2f} ms  logins {logins_per_second:6.1f}/s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GET latency under concurrent logins")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--gets", type=int, default=500)
+    parser.add_argument("--logins", type=int, default=4, help="concurrent login clients")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent GET clients")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.rounds, args.gets, args.concurrency, args.logins))
+
+
+if __name__ == "__main__":
+    main()
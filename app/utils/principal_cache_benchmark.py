@@ -0,0 +1,82 @@
+"""
+Principal cache benchmark: authenticated GET with the cache on vs off.
+
+Usage:
+    python -m app.utils.principal_cache_benchmark [--user-id 1] [--path /api/v1/refs/actes-types?limit=1]
+        [--requests 2000] [--concurrency 20]
+
+Needs the database from Settings and an active user with access to `--path`.
+Serves the application in-process (httpx ASGITransport, no network) with an
+access token of that user, first with the principal cache bypassed (the user
+and their roles are loaded on every request), then with it enabled, and
+reports requests per second and latency percentiles.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from app.core.principal import principal_cache
+from app.core.security import create_access_token
+from app.db.database import AsyncSessionLocal
+from app.services.user import user_service
+from main import app
+
+
+async def run(path: str, token: str, total: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        remaining = iter(range(total))
+
+        async def worker() -> None:
+            for _ in remaining:
+                started_at = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started_at)
+                response.raise_for_status()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def main_async(user_id: int, path: str, total: int, concurrency: int) -> None:
+    async with AsyncSessionLocal() as db:
+        user = await user_service.get(db, id=user_id)
+    if user is None:
+        raise SystemExit(f"No user with id {user_id}")
+    token = create_access_token(subject=user.id, claims={"ver": user.token_version})
+
+    # The lifespan (hence the invalidation listener) does not run here:
+    # toggle the cache directly, nothing else writes meanwhile
+    principal_cache.max_size = max(principal_cache.max_size, 1)
+    for name, enabled in (("cache off", False), ("cache on", True)):
+        principal_cache.clear()
+        principal_cache.ready = enabled
+        await run(path, token, min(total, 200), concurrency)  # warm-up
+        started_at = time.perf_counter()
+        latencies = sorted(await run(path, token, total, concurrency))
+        elapsed = time.perf_counter() - started_at
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"{name:<10} {total / elapsed:8.0f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:6.2f} ms  p99 {p99 * 1000:6.2f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Principal cache throughput")
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--path", default="/api/v1/refs/actes-types?limit=1")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.user_id, args.path, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
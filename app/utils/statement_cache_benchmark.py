@@ -0,0 +1,101 @@
+"""
+Python-side overhead of the hot repository statements.
+
+Usage:
+    python -m app.utils.statement_cache_benchmark [--calls 20000]
+
+No database needed. For UserRepository.get, ActeMedicalRepository.get and
+TarifRepository.get_active_tarif, measures per call:
+- "rebuilt": building the select() and its loader options as each call
+  used to, then generating its compiled-cache key;
+- "pre-built": generating the key of the statement built once on the
+  repository (memoized on the statement object).
+The key is what SQLAlchemy computes on every execute() to look the compiled
+SQL up in the engine's cache; the database round trip is not measured.
+"""
+import argparse
+import time
+from datetime import date
+from typing import Callable, Dict
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import selectin_polymorphic, selectinload
+from sqlalchemy.sql.elements import ClauseElement
+
+from app.db.models.acte_medical import ActeMedical
+from app.db.models.tarif import Tarif
+from app.db.models.user import User, Medecin, Secretaire, Visualiseur, Administrateur
+from app.repositories.acte_medical import ActeMedicalRepository
+from app.repositories.tarif import TarifRepository
+from app.repositories.user import UserRepository
+
+
+def rebuilt_user_get() -> ClauseElement:
+    return (
+        select(User)
+        .options(selectin_polymorphic(User, [Medecin, Secretaire, Visualiseur, Administrateur]))
+        .where(User.id == 42)
+    )
+
+
+def rebuilt_acte_get() -> ClauseElement:
+    return (
+        select(ActeMedical)
+        .options(selectinload(ActeMedical.acte_type), selectinload(ActeMedical.type_prise_charge))
+        .where(ActeMedical.id == 42)
+    )
+
+
+def rebuilt_active_tarif() -> ClauseElement:
+    date_ref = date.today()
+    return select(Tarif).where(
+        and_(
+            Tarif.service_id == 1,
+            Tarif.acte_id == 2,
+            Tarif.type_prise_charge_id == 3,
+            Tarif.date_debut <= date_ref,
+            or_(Tarif.date_fin.is_(None), Tarif.date_fin >= date_ref),
+        )
+    ).order_by(Tarif.date_debut.desc())
+
+
+CASES: Dict[str, Dict[str, Callable[[], ClauseElement]]] = {
+    "UserRepository.get": {
+        "rebuilt": rebuilt_user_get,
+        "pre-built": lambda: UserRepository._get_statement,
+    },
+    "ActeMedicalRepository.get": {
+        "rebuilt": rebuilt_acte_get,
+        "pre-built": lambda: ActeMedicalRepository._get_statement,
+    },
+    "TarifRepository.get_active_tarif": {
+        "rebuilt": rebuilt_active_tarif,
+        "pre-built": lambda: TarifRepository._active_tarif_statement,
+    },
+}
+
+
+def per_call(statement: Callable[[], ClauseElement], calls: int) -> float:
+    for _ in range(100):  # Warm-up (mapper configuration, memoization)
+        statement()._generate_cache_key()
+    started_at = time.perf_counter()
+    for _ in range(calls):
+        statement()._generate_cache_key()
+    return (time.perf_counter() - started_at) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Statement build and cache key overhead per call")
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    for name, variants in CASES.items():
+        timings = {label: per_call(statement, args.calls) for label, statement in variants.items()}
+        print(
+            f"{name:<34} rebuilt {timings['rebuilt'] * 1e6:7.2f} µs  "
+            f"pre-built {timings['pre-built'] * 1e6:7.2f} µs  "
+            f"x{timings['rebuilt'] / timings['pre-built']:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
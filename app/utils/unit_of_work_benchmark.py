@@ -0,0 +1,95 @@
+"""
+Unit of work benchmark: commits per business operation.
+
+Usage:
+    python -m app.utils.unit_of_work_benchmark [--operations 500] [--writes 3]
+
+Needs the database from Settings. Each operation writes `--writes` audit
+entries through audit_log_service.log_action, first one unit of work per
+call (one commit each, as when every repository call committed), then
+the whole operation in a single unit of work. Reports commits per
+operation and latency percentiles, then deletes the rows it created.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+
+from sqlalchemy import delete, event
+
+from app.db.database import AsyncSessionLocal, engine
+from app.db.models.audit_log import AuditLog
+from app.services.audit_log import audit_log_service
+from app.services.base import UnitOfWork
+
+RESOURCE_TYPE = "uow_benchmark"
+
+commits = 0
+
+
+def _count_commit(conn) -> None:
+    global commits
+    commits += 1
+
+
+async def operation(writes: int) -> None:
+    async with AsyncSessionLocal() as db:
+        for i in range(writes):
+            await audit_log_service.log_action(
+                db, action="CREATE", resource_type=RESOURCE_TYPE, resource_id=str(i)
+            )
+
+
+async def grouped_operation(writes: int) -> None:
+    async with AsyncSessionLocal() as db:
+        async with UnitOfWork(db):
+            for i in range(writes):
+                await audit_log_service.log_action(
+                    db, action="CREATE", resource_type=RESOURCE_TYPE, resource_id=str(i)
+                )
+
+
+async def run(grouped: bool, operations: int, writes: int) -> Tuple[float, List[float]]:
+    global commits
+    commits = 0
+    latencies: List[float] = []
+    for _ in range(operations):
+        started_at = time.perf_counter()
+        if grouped:
+            await grouped_operation(writes)
+        else:
+            await operation(writes)
+        latencies.append(time.perf_counter() - started_at)
+    return commits / operations, sorted(latencies)
+
+
+async def main_async(operations: int, writes: int) -> None:
+    event.listen(engine.sync_engine, "commit", _count_commit)
+    try:
+        for grouped in (False, True):
+            per_operation, latencies = await run(grouped, operations, writes)
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            label = "one unit of work" if grouped else "commit per call"
+            print(
+                f"{label:<17} commits/op {per_operation:4.1f}  "
+                f"p50 {statistics.median(latencies) * 1000:7.3f} ms  p99 {p99 * 1000:7.3f} ms"
+            )
+    finally:
+        event.remove(engine.sync_engine, "commit", _count_commit)
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(AuditLog).where(AuditLog.resource_type == RESOURCE_TYPE))
+            await db.commit()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Commits per operation with and without a unit of work")
+    parser.add_argument("--operations", type=int, default=500)
+    parser.add_argument("--writes", type=int, default=3, help="repository writes per operation")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.operations, args.writes))
+
+
+if __name__ == "__main__":
+    main()
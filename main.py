@@ -1,21 +1,64 @@
-from fastapi import FastAPI, Request
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from jose import jwt, JWTError
 
 from app.api.v1.api import api_router
+from app.core.audit import AuditMiddleware
+from app.core.audit_writer import audit_log_writer
+from app.core.authentication import AuthenticationMiddleware
+from app.core.compression import CompressionMiddleware, listen_payload_invalidations
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.metrics import make_metrics_app
+from app.core.principal import listen_principal_invalidations, principal_cache
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.security import setup_password_hashing
+from app.core.token_revocation import listen_token_versions
 from app.db.database import AsyncSessionLocal
+from app.db.replica import read_engine, read_router
 from app.services.audit_log import audit_log_service
+from app.services.refresh_token import refresh_token_service
+from app.services.role import permission_service
 
 # Setup logging
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    await setup_password_hashing()
+    async with AsyncSessionLocal() as db:
+        await permission_service.load_registry(db)
+    audit_log_writer.start()
+    background_tasks = [
+        asyncio.create_task(refresh_token_service.run_periodic_cleanup()),
+        asyncio.create_task(audit_log_service.run_periodic_maintenance()),
+    ]
+    if read_engine is not None:
+        background_tasks.append(asyncio.create_task(read_router.run_lag_monitor()))
+    if settings.STATELESS_ACCESS_TOKENS:
+        background_tasks.append(asyncio.create_task(listen_token_versions()))
+    if principal_cache.max_size > 0:
+        background_tasks.append(asyncio.create_task(listen_principal_invalidations()))
+    if settings.PAYLOAD_CACHE_MAX_SIZE > 0:
+        background_tasks.append(asyncio.create_task(listen_payload_invalidations()))
+    yield
+    # Shutdown
+    for task in background_tasks:
+        task.cancel()
+    # Pending audit events are written before the process exits
+    await audit_log_writer.stop(timeout=settings.AUDIT_DRAIN_TIMEOUT_SECONDS)
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -26,56 +69,27 @@ if settings.CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Totals of list endpoints (?count=true), readable by browser clients
+        expose_headers=["X-Total-Count", "X-Total-Count-Estimated"],
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-@app.middleware("http")
-async def audit_log_middleware(request: Request, call_next):
-    response = await call_next(request)
+# Prometheus metrics, restricted to METRICS_ALLOWED_NETWORKS (see app/core/metrics.py)
+app.mount("/metrics", make_metrics_app())
+
+# Records successful write requests (see app/core/audit.py)
+app.add_middleware(AuditMiddleware)
 
-    if request.method in {"POST", "PATCH", "PUT", "DELETE"} and request.url.path.startswith(
-        settings.API_V1_STR
-    ):
-        path = request.url.path.replace(settings.API_V1_STR, "")
-        segments = [segment for segment in path.split("/") if segment]
-        if segments:
-            resource_type = segments[0]
-            resource_id = segments[1] if len(segments) > 1 else None
-            action_map = {
-                "POST": "CREATE",
-                "PUT": "UPDATE",
-                "PATCH": "UPDATE",
-                "DELETE": "DELETE",
-            }
-            action = action_map.get(request.method, request.method)
-            user_id = None
-            auth_header = request.headers.get("Authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.replace("Bearer ", "", 1).strip()
-                try:
-                    payload = jwt.decode(
-                        token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-                    )
-                    sub = payload.get("sub")
-                    if sub is not None:
-                        user_id = int(sub)
-                except (JWTError, ValueError, TypeError):
-                    user_id = None
+# Added last so it wraps the audit middleware: the token is verified once and
+# its claims are shared through request.state
+app.add_middleware(AuthenticationMiddleware)
 
-            if response.status_code < 400:
-                async with AsyncSessionLocal() as db:
-                    await audit_log_service.log_action(
-                        db,
-                        action=action,
-                        resource_type=resource_type,
-                        user_id=user_id,
-                        ip_address=request.client.host if request.client else None,
-                        resource_id=resource_id,
-                        changes=None,
-                    )
+# Negotiated gzip/br compression of JSON and text bodies (see app/core/compression.py)
+app.add_middleware(CompressionMiddleware)
 
-    return response
+# Outermost: counts and times every SQL statement of the request
+app.add_middleware(QueryStatsMiddleware)
 
 @app.get("/")
 async def root():